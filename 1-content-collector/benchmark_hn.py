@@ -0,0 +1,110 @@
+"""
+Hacker News 수집 벤치마크
+로컬 Mock HN 서버를 띄워 순차 조회와 병렬 조회의 wall-clock 시간을 비교합니다.
+
+사용법:
+    python benchmark_hn.py
+    python benchmark_hn.py --latency 0.08 --workers 32 --sizes 30 200 500
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from hackernews_client import HackerNewsClient
+
+
+def make_handler(story_count: int, latency: float):
+    """지정한 지연 시간으로 응답하는 Mock HN 핸들러 생성"""
+
+    class MockHackerNewsHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 지원
+
+        def do_GET(self):
+            time.sleep(latency)  # 네트워크 왕복 시간 흉내
+
+            if self.path == "/v0/topstories.json":
+                body = list(range(1, story_count + 1))
+            elif self.path.startswith("/v0/item/"):
+                item_id = int(self.path.rsplit("/", 1)[-1].replace(".json", ""))
+                body = {
+                    "id": item_id,
+                    "title": f"Mock story {item_id}",
+                    "url": f"https://example.com/{item_id}",
+                    "score": 1000 - item_id,
+                    "time": int(time.time()),
+                    "type": "story"
+                }
+            else:
+                self.send_error(404)
+                return
+
+            payload = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockHackerNewsHandler
+
+
+def make_server(story_count: int, latency: float, workers: int) -> ThreadingHTTPServer:
+    """
+    Mock HN 서버 생성
+
+    listen 백로그(기본 request_queue_size=5)가 워커 수보다 작으면 동시 연결의 SYN이 버려지고
+    재전송 대기로 병렬 조회가 느려지므로, 백로그를 워커 수 이상으로 키움
+    """
+
+    class MockHackerNewsServer(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = max(128, workers * 2)
+
+    return MockHackerNewsServer(("127.0.0.1", 0), make_handler(story_count, latency))
+
+
+def run_benchmark(sizes, latency: float, workers: int):
+    """순차/병렬 조회 시간 측정 후 표로 출력"""
+    server = make_server(max(sizes), latency, workers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    api_base = f"http://127.0.0.1:{server.server_port}/v0"
+    client = HackerNewsClient(api_base=api_base, max_workers=workers, deadline=300)
+
+    print(f"Mock 지연: {latency * 1000:.0f}ms/요청, 워커: {workers}")
+    print(f"{'items':>6} | {'sequential':>11} | {'concurrent':>11} | {'speedup':>7}")
+    print("-" * 46)
+
+    try:
+        for size in sizes:
+            start = time.perf_counter()
+            sequential = client.fetch_sequential(size)
+            sequential_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            concurrent = client.get_top_stories(size)
+            concurrent_time = time.perf_counter() - start
+
+            assert len(sequential) == len(concurrent) == size
+            print(
+                f"{size:>6} | {sequential_time:>10.2f}s | {concurrent_time:>10.2f}s | "
+                f"{sequential_time / concurrent_time:>6.1f}x"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hacker News 수집 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 200, 500])
+    parser.add_argument("--latency", type=float, default=0.05, help="요청당 Mock 지연 (초)")
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.latency, args.workers)
@@ -0,0 +1,74 @@
+"""
+프로세스 전역 클라이언트 레지스트리
+- 이름별 keep-alive requests.Session 재사용 (TCP/TLS 핸드셰이크 1회)
+- PRAW 클라이언트 재사용 (OAuth 토큰을 요청마다 새로 받지 않음)
+- 웜 인스턴스에서는 첫 요청 이후 연결/토큰 비용이 사라짐
+- get_session()은 서비스별 client_registry.py 사본(1/4/5/6) 모두 같은 시그니처/재시도 규칙
+  (서비스는 독립 배포되므로 파일을 복사해 두며, 나머지 함수만 서비스별로 다름)
+"""
+
+import os
+import logging
+import threading
+from typing import Dict
+
+import praw
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_sessions: Dict[str, requests.Session] = {}
+_clients: Dict[str, object] = {}
+
+
+def get_session(name: str = "default", pool_size: int = 16, retries: int = 2) -> requests.Session:
+    """
+    이름별 공유 세션
+
+    Args:
+        name: 세션 이름 (대상 서비스별로 구분)
+        pool_size: 호스트당 유지할 keep-alive 커넥션 수
+        retries: 연결 오류/5xx GET 재시도 횟수
+    """
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            retry = Retry(
+                total=retries,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD"})
+            )
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[name] = session
+            logger.info(f"HTTP 세션 생성: {name} (pool={pool_size})")
+        return session
+
+
+def get_reddit():
+    """
+    공유 PRAW 클라이언트
+
+    PRAW는 인스턴스 안에 OAuth 토큰을 보관하고 만료 시 스스로 갱신하므로
+    인스턴스를 재사용하면 토큰 발급은 만료 주기마다 1회로 줄어듭니다.
+    (PRAW 내부 속성에 의존하지 않도록 갱신은 PRAW에 맡김)
+    """
+    with _lock:
+        reddit = _clients.get("reddit")
+        if reddit is None:
+            reddit = praw.Reddit(
+                client_id=os.getenv("REDDIT_CLIENT_ID"),
+                client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+                user_agent=os.getenv("REDDIT_USER_AGENT"),
+                requestor_kwargs={"session": get_session("reddit", pool_size=4, retries=0)}
+            )
+            _clients["reddit"] = reddit
+            logger.info("PRAW 클라이언트 생성")
+        return reddit
@@ -0,0 +1,221 @@
+"""
+소스 팬아웃 레이어
+- 모든 수집기를 동시에 실행하고 하나의 전체 데드라인 적용
+- 느리거나 실패한 소스는 건너뛰고 부분 결과 + 소스별 소요 시간 반환
+- 새 소스는 TopicCollector를 구현해 등록
+- 스트리밍 모드: 소스가 yield하는 후보를 도착 즉시 소비 (StreamingFanOut)
+"""
+
+import time
+import queue
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TopicCollector:
+    """토픽 수집기 인터페이스"""
+
+    name = "base"
+
+    def collect(self) -> List[Dict]:
+        """
+        토픽 수집
+
+        Returns:
+            [{"title": str, "url": str, "score": int, "source": str}, ...]
+        """
+        raise NotImplementedError
+
+    def stream(self) -> Iterable[Dict]:
+        """후보를 도착하는 대로 yield (기본 구현: collect() 결과를 순서대로)"""
+        yield from self.collect()
+
+
+class FunctionCollector(TopicCollector):
+    """기존 수집 함수를 TopicCollector로 감싸는 어댑터"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], List[Dict]],
+        stream_func: Callable[[], Iterable[Dict]] = None
+    ):
+        self.name = name
+        self.func = func
+        self.stream_func = stream_func
+
+    def collect(self) -> List[Dict]:
+        return self.func()
+
+    def stream(self) -> Iterable[Dict]:
+        if self.stream_func:
+            return self.stream_func()
+        return super().stream()
+
+
+@dataclass
+class SourceResult:
+    """소스별 수집 결과"""
+    name: str
+    status: str = "pending"  # ok | error | timeout | stopped
+    topics: List[Dict] = field(default_factory=list)
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    def summary(self) -> Dict:
+        """응답/로그용 요약 (토픽 본문 제외)"""
+        return {
+            "status": self.status,
+            "topics_count": len(self.topics),
+            "elapsed_seconds": round(self.elapsed, 3),
+            "error": self.error
+        }
+
+
+def fan_out(collectors: List[TopicCollector], deadline: float) -> List[SourceResult]:
+    """
+    모든 수집기를 병렬 실행
+
+    Args:
+        collectors: 수집기 리스트
+        deadline: 전체 데드라인 (초)
+
+    Returns:
+        collectors 순서대로의 SourceResult 리스트.
+        데드라인 안에 끝나지 않은 소스는 status="timeout"
+    """
+    results = {collector.name: SourceResult(name=collector.name) for collector in collectors}
+    if not collectors:
+        return []
+
+    started_at = time.monotonic()
+    deadline_at = started_at + deadline
+    executor = ThreadPoolExecutor(max_workers=len(collectors))
+
+    def run(collector: TopicCollector) -> List[Dict]:
+        result = results[collector.name]
+        start = time.monotonic()
+        try:
+            return collector.collect()
+        finally:
+            result.elapsed = time.monotonic() - start
+
+    try:
+        pending = {executor.submit(run, collector): collector for collector in collectors}
+
+        while pending:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                collector = pending.pop(future)
+                result = results[collector.name]
+                try:
+                    result.topics = future.result() or []
+                    result.status = "ok"
+                except Exception as e:
+                    logger.error(f"{collector.name} 수집 실패: {e}")
+                    result.status = "error"
+                    result.error = str(e)
+
+        for collector in pending.values():
+            result = results[collector.name]
+            result.status = "timeout"
+            result.elapsed = time.monotonic() - started_at
+            result.error = f"{deadline}초 데드라인 초과"
+            logger.warning(f"{collector.name} 수집 타임아웃 ({deadline}초)")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for result in results.values():
+        logger.info(f"[{result.name}] {result.status}: {len(result.topics)}개, {result.elapsed:.2f}초")
+
+    return [results[collector.name] for collector in collectors]
+
+
+_DONE = object()
+
+
+class StreamingFanOut:
+    """
+    모든 수집기의 stream()을 병렬 실행하고 후보를 도착 순서대로 yield
+
+    사용법:
+        fan = StreamingFanOut(collectors, deadline)
+        for topic in fan:
+            ...
+        fan.results  # 소스별 SourceResult (반복 종료 후)
+
+    반복을 중간에 멈추면(break) 남은 소스는 timeout이 아닌 "stopped"로 기록됩니다.
+    """
+
+    def __init__(self, collectors: List[TopicCollector], deadline: float):
+        self.collectors = collectors
+        self.deadline = deadline
+        self.results = [SourceResult(name=collector.name) for collector in collectors]
+
+    def _run(self, collector: TopicCollector, result: SourceResult, events: queue.Queue):
+        start = time.monotonic()
+        try:
+            for topic in collector.stream():
+                events.put((result, topic))
+            result.status = "ok"
+        except Exception as e:
+            logger.error(f"{collector.name} 수집 실패: {e}")
+            result.status = "error"
+            result.error = str(e)
+        finally:
+            result.elapsed = time.monotonic() - start
+            events.put((result, _DONE))
+
+    def __iter__(self) -> Iterator[Dict]:
+        if not self.collectors:
+            return
+
+        events = queue.Queue()
+        started_at = time.monotonic()
+        deadline_at = started_at + self.deadline
+        executor = ThreadPoolExecutor(max_workers=len(self.collectors))
+        running = len(self.collectors)
+        finished = False
+
+        try:
+            for collector, result in zip(self.collectors, self.results):
+                executor.submit(self._run, collector, result, events)
+
+            while running:
+                remaining = deadline_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    result, topic = events.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+                if topic is _DONE:
+                    running -= 1
+                    continue
+
+                result.topics.append(topic)
+                yield topic
+
+            finished = True
+        finally:
+            for result in self.results:
+                if result.status == "pending":
+                    result.status = "timeout" if finished else "stopped"
+                    result.elapsed = time.monotonic() - started_at
+                    if finished:
+                        result.error = f"{self.deadline}초 데드라인 초과"
+                        logger.warning(f"{result.name} 수집 타임아웃 ({self.deadline}초)")
+            executor.shutdown(wait=False, cancel_futures=True)
+
+            for result in self.results:
+                logger.info(f"[{result.name}] {result.status}: {len(result.topics)}개, {result.elapsed:.2f}초")
@@ -7,3 +7,9 @@ gcloud functions deploy content-collector \
   --entry-point collect_content \
   --trigger-topic content-trigger \
   --set-env-vars GCP_PROJECT_ID=$GCP_PROJECT_ID,REDDIT_CLIENT_ID=$REDDIT_CLIENT_ID,REDDIT_CLIENT_SECRET=$REDDIT_CLIENT_SECRET
+
+# 랭킹 상태 문서의 snapshots 맵은 쿼리하지 않으므로 색인 제외 (문서당 색인 항목 40,000개 한도)
+gcloud firestore indexes fields update snapshots \
+  --collection-group=collector_state \
+  --disable-indexes \
+  --quiet
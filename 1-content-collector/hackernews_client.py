@@ -0,0 +1,149 @@
+"""
+Hacker News 동시 수집 클라이언트
+- 커넥션 풀을 공유하는 requests.Session 사용
+- 제한된 워커 풀로 아이템 JSON 병렬 조회
+- 아이템별 타임아웃 + 전체 데드라인
+- 상위 30개보다 깊게 스캔 (scan_depth)
+- HttpCache 연결 시 topstories/아이템 응답 캐시
+"""
+
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HN_API_BASE = "https://hacker-news.firebaseio.com/v0"
+
+# Firebase REST API는 이 헤더가 있어야 ETag를 내려줌
+FIREBASE_ETAG_HEADER = {"X-Firebase-ETag": "true"}
+
+
+class HackerNewsClient:
+    """Hacker News API 병렬 조회 클라이언트"""
+
+    def __init__(
+        self,
+        api_base: str = None,
+        max_workers: int = None,
+        item_timeout: float = None,
+        deadline: float = None,
+        session: requests.Session = None,
+        cache=None
+    ):
+        """
+        Args:
+            api_base: API 기본 URL (로컬 Mock 서버 테스트용으로 교체 가능)
+            max_workers: 동시 요청 수
+            item_timeout: 아이템 1개당 요청 타임아웃 (초)
+            deadline: 아이템 조회 전체 데드라인 (초)
+            session: 외부에서 주입할 세션 (선택)
+            cache: HttpCache (선택, 없으면 매번 네트워크 조회)
+        """
+        self.api_base = (api_base or os.getenv("HN_API_BASE", HN_API_BASE)).rstrip("/")
+        self.max_workers = max_workers or int(os.getenv("HN_MAX_WORKERS", 16))
+        self.item_timeout = item_timeout or float(os.getenv("HN_ITEM_TIMEOUT", 5))
+        self.deadline = deadline or float(os.getenv("HN_FETCH_DEADLINE", 20))
+        self.session = session or self._build_session(self.max_workers)
+        self.cache = cache
+
+        # 캐시 TTL: 목록은 짧게, 게시 후 충분히 지난 아이템은 사실상 불변이라 길게
+        self.list_ttl = float(os.getenv("HN_LIST_TTL", 60))
+        self.item_ttl = float(os.getenv("HN_ITEM_TTL", 120))
+        self.stable_item_ttl = float(os.getenv("HN_STABLE_ITEM_TTL", 6 * 3600))
+        self.stable_age = float(os.getenv("HN_STABLE_AGE_HOURS", 48)) * 3600
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        """워커 수만큼 keep-alive 커넥션을 유지하는 세션 생성"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _item_ttl(self, item: Optional[Dict]) -> float:
+        """게시 후 stable_age가 지난 아이템은 긴 TTL"""
+        posted_at = (item or {}).get("time")
+        if posted_at and time.time() - posted_at > self.stable_age:
+            return self.stable_item_ttl
+        return self.item_ttl
+
+    def _get_json(self, url: str, ttl, timeout: float):
+        if self.cache:
+            return self.cache.get_json(self.session, url, ttl=ttl, timeout=timeout, headers=FIREBASE_ETAG_HEADER)
+
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def get_top_story_ids(self, limit: int = 30) -> List[int]:
+        """topstories.json에서 상위 스토리 ID 조회"""
+        return self._get_json(f"{self.api_base}/topstories.json", self.list_ttl, 30)[:limit]
+
+    def get_item(self, item_id: int) -> Optional[Dict]:
+        """아이템 1개 조회 (실패 시 None)"""
+        try:
+            return self._get_json(f"{self.api_base}/item/{item_id}.json", self._item_ttl, self.item_timeout)
+        except Exception as e:
+            logger.warning(f"HN 아이템 조회 실패 ({item_id}): {e}")
+            return None
+
+    def iter_items(self, item_ids: List[int]) -> Iterator[Dict]:
+        """
+        여러 아이템을 워커 풀로 병렬 조회하며 도착 순서대로 yield
+
+        전체 데드라인을 넘기면 나머지 요청은 버립니다.
+        """
+        if not item_ids:
+            return
+
+        deadline_at = time.monotonic() + self.deadline
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(item_ids)))
+
+        try:
+            pending = {executor.submit(self.get_item, item_id) for item_id in item_ids}
+
+            while pending:
+                remaining = deadline_at - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"HN 데드라인 초과: {len(pending)}개 아이템 미완료")
+                    break
+
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = future.result()
+                    if item:
+                        yield item
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_items(self, item_ids: List[int]) -> List[Dict]:
+        """여러 아이템을 병렬 조회 (반환 순서는 item_ids 순서)"""
+        items = {item.get("id"): item for item in self.iter_items(item_ids)}
+        return [items[item_id] for item_id in item_ids if item_id in items]
+
+    def get_top_stories(self, scan_depth: int = 30) -> List[Dict]:
+        """상위 scan_depth개 스토리를 병렬 조회"""
+        story_ids = self.get_top_story_ids(scan_depth)
+        return self.get_items(story_ids)
+
+    def iter_top_stories(self, scan_depth: int = 30) -> Iterator[Dict]:
+        """상위 scan_depth개 스토리를 도착 순서대로 yield"""
+        yield from self.iter_items(self.get_top_story_ids(scan_depth))
+
+    def fetch_sequential(self, scan_depth: int = 30) -> List[Dict]:
+        """기존 방식(순차 조회) - 벤치마크 비교용"""
+        story_ids = self.get_top_story_ids(scan_depth)
+        items = []
+        for story_id in story_ids:
+            item = requests.get(f"{self.api_base}/item/{story_id}.json", timeout=10).json()
+            if item:
+                items.append(item)
+        return items
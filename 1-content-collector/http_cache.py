@@ -0,0 +1,183 @@
+"""
+수집기용 HTTP 응답 캐시
+- URL 키 기반 로컬 디스크 캐시 (Cloud Run/Functions의 /tmp, 웜 인스턴스 간 재사용)
+- TTL 안이면 네트워크 없이 응답, 지나면 ETag/Last-Modified 조건부 요청으로 재검증
+- 응답 내용에 따라 TTL 결정 가능 (예: 오래된 HN 아이템은 길게)
+- 항목 수 기준 LRU 제거, 히트/미스 카운터 제공
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Union
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TTL = Union[float, Callable[[Any], float]]
+
+
+class HttpCache:
+    """디스크 기반 LRU HTTP 캐시"""
+
+    def __init__(self, cache_dir: str = None, max_entries: int = None, default_ttl: float = 60, clock=time.time):
+        """
+        Args:
+            cache_dir: 캐시 디렉터리
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 제거)
+            default_ttl: 기본 TTL (초)
+            clock: 현재 시각 함수 (테스트용 주입 가능)
+        """
+        self.cache_dir = cache_dir or os.getenv("HTTP_CACHE_DIR", "/tmp/collector_http_cache")
+        self.max_entries = max_entries or int(os.getenv("HTTP_CACHE_MAX_ENTRIES", 5000))
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # 파일 수정 시각 = 마지막 사용 시각 (재시작 후에도 LRU 순서 유지)
+        files = [name for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        files.sort(key=lambda name: os.path.getmtime(os.path.join(self.cache_dir, name)))
+        self.index = OrderedDict((name[:-5], None) for name in files)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def _read(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, entry: Dict):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.index[key] = None
+            self.index.move_to_end(key)
+            self.stats["stores"] += 1
+            while len(self.index) > self.max_entries:
+                oldest, _ = self.index.popitem(last=False)
+                self.stats["evictions"] += 1
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+
+    def _touch(self, key: str):
+        with self.lock:
+            if key in self.index:
+                self.index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _count(self, name: str):
+        with self.lock:
+            self.stats[name] += 1
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        return self.clock() - entry["stored_at"] < entry["ttl"]
+
+    def _resolve_ttl(self, ttl: Optional[TTL], body: Any) -> float:
+        if ttl is None:
+            return self.default_ttl
+        return ttl(body) if callable(ttl) else ttl
+
+    def get_json(self, session, url: str, ttl: TTL = None, timeout: float = 10, headers: Dict = None) -> Any:
+        """
+        JSON GET (캐시 우선)
+
+        Args:
+            session: requests.Session
+            url: 요청 URL
+            ttl: TTL(초) 또는 응답 본문을 받아 TTL을 돌려주는 함수
+            timeout: 요청 타임아웃
+            headers: 추가 요청 헤더
+        """
+        key = self._key(url)
+        entry = self._read(key)
+
+        if entry and self._is_fresh(entry):
+            self._count("hits")
+            self._touch(key)
+            return entry["body"]
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = session.get(url, headers=request_headers, timeout=timeout)
+
+        if entry and response.status_code == 304:
+            # 변경 없음: 본문 재사용, TTL만 갱신
+            self._count("revalidated")
+            entry["stored_at"] = self.clock()
+            entry["ttl"] = self._resolve_ttl(ttl, entry["body"])
+            self._write(key, entry)
+            return entry["body"]
+
+        response.raise_for_status()
+        body = response.json()
+        self._count("misses")
+
+        self._write(key, {
+            "url": url,
+            "body": body,
+            "stored_at": self.clock(),
+            "ttl": self._resolve_ttl(ttl, body),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        })
+        return body
+
+    def get_or_compute(self, cache_key: str, ttl: TTL, compute: Callable[[], Any]) -> Any:
+        """
+        HTTP가 아닌 호출 결과 캐시 (예: PRAW 리스팅). 결과는 JSON 직렬화 가능해야 함
+        """
+        key = self._key(cache_key)
+        entry = self._read(key)
+
+        if entry and self._is_fresh(entry):
+            self._count("hits")
+            self._touch(key)
+            return entry["body"]
+
+        body = compute()
+        self._count("misses")
+        self._write(key, {
+            "url": cache_key,
+            "body": body,
+            "stored_at": self.clock(),
+            "ttl": self._resolve_ttl(ttl, body)
+        })
+        return body
+
+    def get_stats(self) -> Dict:
+        """히트/미스 카운터 + 현재 항목 수"""
+        with self.lock:
+            total = self.stats["hits"] + self.stats["revalidated"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self.index),
+                "hit_rate": round((self.stats["hits"] + self.stats["revalidated"]) / total, 3) if total else 0.0
+            }
@@ -1,95 +1,320 @@
 """Phase 1: 콘텐츠 수집기 - Reddit/Hacker News"""
 import os
-import praw
-import requests
+import sys
 from google.cloud import firestore
 from flask import Flask, request, jsonify
 import logging
+from hackernews_client import HackerNewsClient
+from collectors import FunctionCollector, StreamingFanOut, fan_out
+from seen_index import SeenIndex
+from topic_writer import BatchTopicWriter
+from topic_clustering import cluster_topics, StreamingDeduper
+from ranking import TrendRanker
+from http_cache import HttpCache
+from client_registry import get_session, get_reddit
+from streaming import TopKSelector
+from scheduler import AdaptiveScheduler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 db = firestore.Client(project=os.getenv("GCP_PROJECT_ID"))
+http_cache = HttpCache()
+hn_client = HackerNewsClient(
+    cache=http_cache,
+    session=get_session("hackernews", pool_size=int(os.getenv("HN_MAX_WORKERS", 16)))
+)
+
+def stream_reddit_trends():
+    """Reddit 트렌딩 토픽을 최소 점수 이상이면 바로 yield"""
+    subreddits = "technology+programming+artificial"
+    
+    def fetch_listing():
+        reddit = get_reddit()  # 프로세스 전역 클라이언트 (OAuth 토큰 재사용)
+        return [
+            {
+                "title": submission.title,
+                "url": submission.url,
+                "score": submission.score,
+                "posted_at": submission.created_utc
+            }
+            for submission in reddit.subreddit(subreddits).hot(limit=50)
+        ]
+    
+    # PRAW 리스팅은 URL 단위 캐시가 어려우므로 결과 리스트를 짧은 TTL로 캐시
+    listing = http_cache.get_or_compute(
+        f"reddit:hot:{subreddits}:50",
+        float(os.getenv("REDDIT_LISTING_TTL", 120)),
+        fetch_listing
+    )
+    
+    for submission in listing:
+        if submission["score"] >= int(os.getenv("MIN_REDDIT_SCORE", 1000)):
+            yield {**submission, "source": "reddit"}
 
 def collect_reddit_trends():
-    """Reddit에서 트렌딩 토픽 수집"""
+    """Reddit에서 트렌딩 토픽 수집 (소스별 절삭 없이 최소 점수 이상 전체)"""
     try:
-        reddit = praw.Reddit(
-            client_id=os.getenv("REDDIT_CLIENT_ID"),
-            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-            user_agent=os.getenv("REDDIT_USER_AGENT")
-        )
-        
-        topics = []
-        for submission in reddit.subreddit("technology+programming+artificial").hot(limit=50):
-            if submission.score >= int(os.getenv("MIN_REDDIT_SCORE", 1000)):
-                topics.append({
-                    "title": submission.title,
-                    "url": submission.url,
-                    "score": submission.score,
-                    "source": "reddit"
-                })
+        topics = list(stream_reddit_trends())
         
         logger.info(f"Reddit에서 {len(topics)}개 토픽 수집")
-        return sorted(topics, key=lambda x: x["score"], reverse=True)[:5]
+        return sorted(topics, key=lambda x: x["score"], reverse=True)
         
     except Exception as e:
         logger.error(f"Reddit 수집 실패: {e}")
-        return []
+        raise
+
+def stream_hackernews_trends():
+    """Hacker News 스토리를 아이템 응답이 도착하는 순서대로 yield"""
+    # 세션/워커 풀을 공유하는 병렬 조회 (HN_SCAN_DEPTH로 스캔 깊이 조절)
+    scan_depth = int(os.getenv("HN_SCAN_DEPTH", 30))
+    
+    for story in hn_client.iter_top_stories(scan_depth):
+        if story.get("score", 0) >= int(os.getenv("MIN_HN_SCORE", 100)):
+            yield {
+                "title": story.get("title"),
+                "url": story.get("url", f"https://news.ycombinator.com/item?id={story.get('id')}"),
+                "score": story.get("score"),
+                "posted_at": story.get("time"),
+                "source": "hackernews"
+            }
 
 def collect_hackernews_trends():
-    """Hacker News에서 트렌딩 토픽 수집"""
+    """Hacker News에서 트렌딩 토픽 수집 (소스별 절삭 없이 최소 점수 이상 전체)"""
     try:
-        url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-        response = requests.get(url, timeout=30)
-        story_ids = response.json()[:30]
-        
-        topics = []
-        for story_id in story_ids:
-            story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-            story = requests.get(story_url, timeout=10).json()
-            
-            if story.get("score", 0) >= int(os.getenv("MIN_HN_SCORE", 100)):
-                topics.append({
-                    "title": story.get("title"),
-                    "url": story.get("url", f"https://news.ycombinator.com/item?id={story_id}"),
-                    "score": story.get("score"),
-                    "source": "hackernews"
-                })
+        topics = list(stream_hackernews_trends())
         
         logger.info(f"Hacker News에서 {len(topics)}개 토픽 수집")
-        return sorted(topics, key=lambda x: x["score"], reverse=True)[:5]
+        return sorted(topics, key=lambda x: x["score"], reverse=True)
         
     except Exception as e:
         logger.error(f"Hacker News 수집 실패: {e}")
-        return []
+        raise
+
+# 등록된 수집 소스 (새 소스는 TopicCollector 구현 후 여기에 추가)
+COLLECTORS = [
+    FunctionCollector("reddit", collect_reddit_trends, stream_reddit_trends),
+    FunctionCollector("hackernews", collect_hackernews_trends, stream_hackernews_trends),
+]
+
+def load_ranker():
+    """Firestore에 저장된 랭킹 상태 로드"""
+    return TrendRanker(
+        window_size=int(os.getenv("RANK_WINDOW_SIZE", 500)),
+        max_items=int(os.getenv("RANK_MAX_ITEMS", 3000)),
+        weight_score=float(os.getenv("RANK_WEIGHT_SCORE", 0.4)),
+        weight_velocity=float(os.getenv("RANK_WEIGHT_VELOCITY", 0.6))
+    ).load(db.collection("collector_state").document("ranking"))
+
+def load_seen_index():
+    """Firestore에 저장된 seen 인덱스 로드"""
+    return SeenIndex(
+        ttl_seconds=float(os.getenv("SEEN_TTL_HOURS", 168)) * 3600,
+        max_entries=int(os.getenv("SEEN_INDEX_MAX_ENTRIES", 10000))
+    ).load(db.collection("collector_state").document("seen_index"))
+
+def topic_document(topic: dict) -> dict:
+    """trending_topics 문서 내용"""
+    return {
+        **topic,
+        "status": "pending",
+        "created_at": firestore.SERVER_TIMESTAMP
+    }
+
+def save_collector_state(ranker, seen_index, new_topics: list):
+    """랭킹 상태 저장 + 저장한 토픽(+ 병합된 중복)만 seen 처리"""
+    ranker.save(db.collection("collector_state").document("ranking"), db.transaction())
+    
+    # 나머지 후보는 다음 실행에서 다시 후보가 됨
+    if new_topics:
+        seen_index.mark(new_topics)
+        seen_index.mark(duplicate for topic in new_topics for duplicate in topic["duplicates"])
+        seen_index.save(db.collection("collector_state").document("seen_index"))
+
+def run_batch_pipeline(collectors: list) -> tuple:
+    """
+    배치 수집 파이프라인: 모든 소스 완료 후 랭킹 → 중복 제거 → 클러스터링 → 상위 K 저장
+    
+    Returns:
+        (응답용 결과 dict, 이번 실행에서 저장(seen 처리)한 토픽 리스트)
+    """
+    # 모든 소스 병렬 수집 (전체 데드라인 내 완료된 소스만 사용)
+    deadline = float(os.getenv("COLLECT_DEADLINE_SECONDS", 45))
+    source_results = fan_out(collectors, deadline)
+    
+    candidates = [topic for result in source_results for topic in result.topics]
+    
+    # 소스별 정규화 점수 + 상승 속도로 랭킹 (모든 후보를 스냅샷으로 기록)
+    ranker = load_ranker()
+    ranked = ranker.rank(candidates)
+    
+    # 이미 수집한 토픽 제외 (정규화 URL + 제목 지문 기준)
+    seen_index = load_seen_index()
+    fresh_topics = seen_index.filter_new(ranked, dedupe_batch=False)
+    
+    # 소스 간 유사 토픽 병합 (클러스터별 대표 1개, 랭킹 점수 합산)
+    all_topics = cluster_topics(
+        fresh_topics,
+        threshold=float(os.getenv("CLUSTER_SIMILARITY", 0.5)),
+        score_key="rank_score"
+    )
+    all_topics.sort(key=lambda x: x["rank_score"], reverse=True)
+    new_topics = all_topics[:int(os.getenv("MAX_TOPICS_PER_RUN", 5))]
+    
+    logger.info(f"후보 {len(candidates)}개 중 신규 {len(fresh_topics)}개 ({len(all_topics)}개 클러스터)")
+    
+    # Firestore에 일괄 저장 (TOPIC_WRITE_BATCH_SIZE개 단위 커밋)
+    with BatchTopicWriter(db, "trending_topics", int(os.getenv("TOPIC_WRITE_BATCH_SIZE", 500))) as writer:
+        for topic in new_topics:
+            writer.add(topic_document(topic))
+    
+    save_collector_state(ranker, seen_index, new_topics)
+    
+    return {
+        "mode": "batch",
+        "topics_count": len(new_topics),
+        "topic_ids": writer.written_ids,
+        "candidates_count": len(candidates),
+        "skipped_seen": len(candidates) - len(fresh_topics),
+        "merged_duplicates": len(fresh_topics) - len(all_topics),
+        "partial": any(result.status != "ok" for result in source_results),
+        "sources": {result.name: result.summary() for result in source_results}
+    }, new_topics
+
+def collect_batch() -> dict:
+    """배치 모드: 등록된 모든 소스를 한 번 수집"""
+    result, _ = run_batch_pipeline(COLLECTORS)
+    return result
+
+def run_scheduler():
+    """
+    스케줄러 모드: /collect 호출 없이 소스별 적응형 주기로 계속 수집
+    - 급상승 신규 토픽이 나오면 해당 소스 주기 단축, 신규가 없으면 주기 연장
+    """
+    def handle(collector):
+        # 신규 판단은 저장한 토픽 기준 (저장하지 않은 후보는 seen 처리되지 않아 매번 다시 신규로 잡힘)
+        result, written_topics = run_batch_pipeline([collector])
+        
+        # fan_out은 수집 예외를 결과에 담아 반환하므로, 실패/타임아웃은 다시 올려 오류 백오프로 처리
+        source = result["sources"][collector.name]
+        if source["status"] != "ok":
+            raise RuntimeError(f"{source['status']}: {source['error']}")
+        
+        logger.info(f"[{collector.name}] 스케줄 수집: {result['topics_count']}개 저장")
+        return written_topics
+    
+    scheduler = AdaptiveScheduler(
+        COLLECTORS,
+        handle,
+        base_interval=float(os.getenv("SCHEDULE_BASE_INTERVAL", 300)),
+        min_interval=float(os.getenv("SCHEDULE_MIN_INTERVAL", 60)),
+        max_interval=float(os.getenv("SCHEDULE_MAX_INTERVAL", 1800)),
+        tighten_factor=float(os.getenv("SCHEDULE_TIGHTEN_FACTOR", 0.5)),
+        backoff_factor=float(os.getenv("SCHEDULE_BACKOFF_FACTOR", 1.5)),
+        hot_velocity_pct=float(os.getenv("SCHEDULE_HOT_VELOCITY_PCT", 0.8))
+    )
+    scheduler.run_forever()
+
+def collect_streaming() -> dict:
+    """
+    스트리밍 모드: 후보가 도착할 때마다 랭킹/중복 판별 후 상위 K 힙에 반영
+    - rank_score가 STREAM_EMIT_THRESHOLD 이상이면 즉시 Firestore에 저장 (다음 단계 바로 시작)
+    - 즉시 저장만으로 K개가 차면 느린 소스를 기다리지 않고 종료
+    - 나머지 자리는 스트림 종료 후 힙 상위 후보로 채움
+    """
+    deadline = float(os.getenv("COLLECT_DEADLINE_SECONDS", 45))
+    max_topics = int(os.getenv("MAX_TOPICS_PER_RUN", 5))
+    
+    ranker = load_ranker()
+    seen_index = load_seen_index()
+    deduper = StreamingDeduper(threshold=float(os.getenv("CLUSTER_SIMILARITY", 0.5)))
+    writer = BatchTopicWriter(db, "trending_topics", int(os.getenv("TOPIC_WRITE_BATCH_SIZE", 500)))
+    
+    def emit(topic: dict):
+        writer.add(topic_document(topic))
+        writer.flush()
+    
+    selector = TopKSelector(max_topics, float(os.getenv("STREAM_EMIT_THRESHOLD", 0.9)), emit)
+    fan = StreamingFanOut(COLLECTORS, deadline)
+    candidates_count = skipped_seen = merged_duplicates = 0
+    
+    for topic in fan:
+        candidates_count += 1
+        # 이전 실행까지의 소스별 윈도우 기준으로 후보 1개씩 점수화
+        ranked = ranker.rank([topic])[0]
+        
+        if seen_index.is_seen(ranked):
+            skipped_seen += 1
+            continue
+        
+        if deduper.add(ranked) is not ranked:
+            merged_duplicates += 1
+            continue
+        
+        selector.offer(ranked, ranked["rank_score"])
+        if selector.full:
+            logger.info(f"즉시 저장 {max_topics}개 완료, 남은 소스 대기 없이 종료")
+            break
+    
+    remaining = selector.finalize()
+    for topic in remaining:
+        writer.add(topic_document(topic))
+    writer.flush()
+    
+    new_topics = selector.emitted + remaining
+    save_collector_state(ranker, seen_index, new_topics)
+    
+    logger.info(f"스트리밍 수집: 후보 {candidates_count}개, 즉시 저장 {len(selector.emitted)}개, 종료 후 저장 {len(remaining)}개")
+    
+    return {
+        "mode": "stream",
+        "topics_count": len(new_topics),
+        "topic_ids": writer.written_ids,
+        "emitted_early": len(selector.emitted),
+        "candidates_count": candidates_count,
+        "skipped_seen": skipped_seen,
+        "merged_duplicates": merged_duplicates,
+        "partial": any(result.status != "ok" for result in fan.results),
+        "sources": {result.name: result.summary() for result in fan.results}
+    }
 
 @app.route('/collect', methods=['POST'])
 def collect_content():
-    """콘텐츠 수집 트리거"""
+    """
+    콘텐츠 수집 트리거
+    
+    Request Body (선택):
+    {
+        "mode": "batch" | "stream"  (기본값: COLLECT_MODE 환경 변수, 없으면 batch)
+    }
+    """
     try:
-        reddit_topics = collect_reddit_trends()
-        hn_topics = collect_hackernews_trends()
+        data = request.get_json(silent=True) or {}
+        mode = data.get("mode") or os.getenv("COLLECT_MODE", "batch")
         
-        all_topics = reddit_topics + hn_topics
-        all_topics.sort(key=lambda x: x["score"], reverse=True)
+        result = collect_streaming() if mode == "stream" else collect_batch()
         
-        # Firestore에 저장
-        for topic in all_topics[:5]:
-            db.collection("trending_topics").add({
-                **topic,
-                "status": "pending",
-                "created_at": firestore.SERVER_TIMESTAMP
-            })
+        logger.info(f"총 {result['topics_count']}개 토픽 Firestore에 저장")
         
-        logger.info(f"총 {len(all_topics[:5])}개 토픽 Firestore에 저장")
-        
-        return jsonify({"success": True, "topics_count": len(all_topics[:5])}), 200
+        return jsonify({
+            "success": True,
+            **result,
+            "http_cache": http_cache.get_stats()
+        }), 200
         
     except Exception as e:
         logger.error(f"콘텐츠 수집 실패: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """HTTP 캐시 히트/미스 카운터"""
+    return jsonify(http_cache.get_stats()), 200
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=int(os.getenv("PORT", 8080)))
+    # COLLECTOR_MODE=scheduler 또는 --scheduler: HTTP 서버 대신 상주 스케줄러로 실행
+    if os.getenv("COLLECTOR_MODE") == "scheduler" or "--scheduler" in sys.argv:
+        run_scheduler()
+    else:
+        app.run(host="0.0.0.0", port=int(os.getenv("PORT", 8080)))
@@ -0,0 +1,230 @@
+"""
+소스 간 점수 정규화 + 트렌드 속도(velocity) 랭킹 엔진
+- Reddit 업보트와 HN 포인트는 스케일이 달라 원점수로 비교 불가
+- 소스별 최근 점수 윈도우 기준 백분위로 정규화
+- 같은 아이템의 반복 스냅샷(없으면 게시 시각)으로 시간당 점수 상승 속도 계산
+- 후보 전체를 NumPy 벡터 연산 한 번으로 점수화
+- 상태는 Firestore 문서 1개 (collector_state/ranking)
+  - 저장은 트랜잭션으로 최신 문서를 다시 읽어 이번 실행의 관측값만 합침 (동시 실행 간 갱신 유실 방지)
+  - snapshots 맵은 쿼리하지 않으므로 색인 제외 필요 (문서당 색인 항목 40,000개 한도, deploy.sh 참고)
+"""
+
+import time
+import logging
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+from google.cloud import firestore
+
+from seen_index import SeenIndex
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _item_key(topic: Dict) -> str:
+    """스냅샷 키 (정규화 URL 해시, 없으면 제목 해시)"""
+    keys = SeenIndex.keys_for(topic)
+    return keys[0] if keys else ""
+
+
+def _percentile(window: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """정렬된 윈도우 기준 백분위 (0~1)"""
+    if window.size == 0:
+        return np.full(values.shape, 0.5)
+    return np.searchsorted(window, values, side="right") / window.size
+
+
+class TrendRanker:
+    """소스별 롤링 윈도우와 아이템 스냅샷을 유지하는 랭킹 엔진"""
+
+    def __init__(
+        self,
+        window_size: int = 500,
+        snapshot_ttl_seconds: float = 48 * 3600,
+        max_snapshots: int = 5,
+        max_items: int = 3000,
+        weight_score: float = 0.4,
+        weight_velocity: float = 0.6,
+        clock=time.time
+    ):
+        """
+        Args:
+            window_size: 소스별로 유지할 최근 점수/속도 개수
+            snapshot_ttl_seconds: 아이템 스냅샷 보존 기간 (초)
+            max_snapshots: 아이템당 보존할 스냅샷 수
+            max_items: 스냅샷을 보존할 최대 아이템 수 (초과 시 마지막 관측이 오래된 아이템부터 제거)
+                아이템당 배열 값이 최대 max_snapshots × 2개라 기본값(3000 × 10)은 문서 크기 1 MiB와
+                색인 항목 40,000개 한도 안에 들어감 (snapshots 색인을 제외하면 더 늘려도 됨)
+            weight_score: 정규화 점수 가중치
+            weight_velocity: 정규화 속도 가중치
+            clock: 현재 시각 함수 (테스트용 주입 가능)
+        """
+        self.window_size = window_size
+        self.snapshot_ttl_seconds = snapshot_ttl_seconds
+        self.max_snapshots = max_snapshots
+        self.max_items = max_items
+        self.weight_score = weight_score
+        self.weight_velocity = weight_velocity
+        self.clock = clock
+
+        self.score_windows: Dict[str, List[float]] = defaultdict(list)
+        self.velocity_windows: Dict[str, List[float]] = defaultdict(list)
+        self.snapshots: Dict[str, List[List[float]]] = {}
+        # 이번 실행의 관측값 (저장 시 최신 문서에 다시 적용)
+        self.observations: List[tuple] = []
+
+    def velocities(self, topics: List[Dict], now: float) -> np.ndarray:
+        """
+        시간당 점수 상승 속도
+
+        - 이전 스냅샷이 있으면: (현재 점수 - 가장 오래된 스냅샷 점수) / 경과 시간
+        - 없으면: 현재 점수 / 게시 후 경과 시간 (최소 1시간)
+        - 둘 다 없으면 0
+        """
+        scores = np.array([float(topic.get("score") or 0) for topic in topics])
+        prev_scores = np.full(len(topics), np.nan)
+        prev_times = np.full(len(topics), np.nan)
+        posted_at = np.array([float(topic.get("posted_at") or np.nan) for topic in topics])
+
+        for i, topic in enumerate(topics):
+            history = self.snapshots.get(_item_key(topic))
+            if history:
+                prev_times[i], prev_scores[i] = history[0]
+
+        snapshot_hours = (now - prev_times) / 3600
+        age_hours = np.maximum((now - posted_at) / 3600, 1.0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            velocity = np.where(
+                snapshot_hours > 0,
+                (scores - prev_scores) / snapshot_hours,
+                scores / age_hours
+            )
+        return np.nan_to_num(velocity, nan=0.0)
+
+    def rank(self, topics: List[Dict]) -> List[Dict]:
+        """
+        후보를 점수화하고 관측값을 윈도우/스냅샷에 기록
+
+        Returns:
+            rank_score 내림차순으로 정렬된 토픽 복사본.
+            각 토픽에 score_pct, velocity, velocity_pct, rank_score 필드 추가
+        """
+        if not topics:
+            return []
+
+        now = self.clock()
+        sources = np.array([topic.get("source", "") for topic in topics])
+        scores = np.array([float(topic.get("score") or 0) for topic in topics])
+        velocity = self.velocities(topics, now)
+
+        score_pct = np.zeros(len(topics))
+        velocity_pct = np.zeros(len(topics))
+
+        for source in np.unique(sources):
+            mask = sources == source
+            score_window = np.sort(np.concatenate([self.score_windows[source], scores[mask]]))
+            velocity_window = np.sort(np.concatenate([self.velocity_windows[source], velocity[mask]]))
+            score_pct[mask] = _percentile(score_window, scores[mask])
+            velocity_pct[mask] = _percentile(velocity_window, velocity[mask])
+
+        rank_score = self.weight_score * score_pct + self.weight_velocity * velocity_pct
+
+        self._observe(topics, sources, scores, velocity, now)
+
+        ranked = []
+        for i in np.argsort(-rank_score, kind="stable"):
+            ranked.append({
+                **topics[i],
+                "score_pct": round(float(score_pct[i]), 4),
+                "velocity": round(float(velocity[i]), 2),
+                "velocity_pct": round(float(velocity_pct[i]), 4),
+                "rank_score": round(float(rank_score[i]), 4)
+            })
+        return ranked
+
+    def _observe(self, topics: List[Dict], sources: np.ndarray, scores: np.ndarray, velocity: np.ndarray, now: float):
+        """이번 관측값을 롤링 윈도우와 아이템 스냅샷에 추가"""
+        self.observations.append((topics, sources, scores, velocity, now))
+        self._apply(topics, sources, scores, velocity, now)
+
+    def _apply(self, topics: List[Dict], sources: np.ndarray, scores: np.ndarray, velocity: np.ndarray, now: float):
+        for source in np.unique(sources):
+            mask = sources == source
+            self.score_windows[source] = (self.score_windows[source] + scores[mask].tolist())[-self.window_size:]
+            self.velocity_windows[source] = (self.velocity_windows[source] + velocity[mask].tolist())[-self.window_size:]
+
+        for topic, score in zip(topics, scores.tolist()):
+            key = _item_key(topic)
+            if key:
+                history = self.snapshots.setdefault(key, [])
+                history.append([now, score])
+                del history[:-self.max_snapshots]
+
+    def evict(self):
+        """마지막 스냅샷이 TTL을 넘긴 아이템 제거 + 최대 아이템 수 초과분 제거"""
+        now = self.clock()
+        self.snapshots = {
+            key: history for key, history in self.snapshots.items()
+            if history and now - history[-1][0] < self.snapshot_ttl_seconds
+        }
+
+        overflow = len(self.snapshots) - self.max_items
+        if overflow > 0:
+            oldest = sorted(self.snapshots, key=lambda key: self.snapshots[key][-1][0])[:overflow]
+            for key in oldest:
+                del self.snapshots[key]
+
+    def _read(self, doc):
+        """스냅샷 문서 내용으로 상태 교체"""
+        data = doc.to_dict() if doc.exists else {}
+        self.score_windows = defaultdict(list, data.get("score_windows", {}))
+        self.velocity_windows = defaultdict(list, data.get("velocity_windows", {}))
+        # Firestore는 중첩 배열을 지원하지 않으므로 [t0, s0, t1, s1, ...] 형태로 저장
+        self.snapshots = {
+            key: [flat[i:i + 2] for i in range(0, len(flat), 2)]
+            for key, flat in data.get("snapshots", {}).items()
+        }
+
+    def _document(self) -> Dict:
+        return {
+            "score_windows": dict(self.score_windows),
+            "velocity_windows": dict(self.velocity_windows),
+            "snapshots": {
+                key: [value for pair in history for value in pair]
+                for key, history in self.snapshots.items()
+            },
+            "updated_at": self.clock()
+        }
+
+    def load(self, doc_ref) -> "TrendRanker":
+        """Firestore 문서에서 상태 로드"""
+        self._read(doc_ref.get())
+        self.evict()
+        return self
+
+    def save(self, doc_ref, transaction=None):
+        """
+        만료 스냅샷 정리 후 Firestore 문서에 저장
+
+        Args:
+            transaction: 주어지면 트랜잭션 안에서 최신 문서를 다시 읽고 이번 실행의 관측값만 다시 적용해 저장
+                (로드 이후 다른 실행이 저장한 관측값을 덮어쓰지 않음)
+        """
+        if transaction is None:
+            self.evict()
+            doc_ref.set(self._document())
+        else:
+            @firestore.transactional
+            def run(transaction):
+                self._read(doc_ref.get(transaction=transaction))
+                for observation in self.observations:
+                    self._apply(*observation)
+                self.evict()
+                transaction.set(doc_ref, self._document())
+
+            run(transaction)
+        self.observations = []
+        logger.info(f"랭킹 상태 저장: 스냅샷 {len(self.snapshots)}개")
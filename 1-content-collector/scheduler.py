@@ -0,0 +1,164 @@
+"""
+소스별 적응형 폴링 스케줄러
+- /collect 호출 없이 소스마다 자체 주기로 수집
+- 신규(미수집) 토픽 중 상승 속도가 높은 항목이 나오면 주기 단축
+- 신규 토픽이 없으면(모두 seen) 주기를 점진적으로 늘려 API 호출 절약
+- clock/sleep 주입으로 가짜 시계 + 스텁 소스 테스트 가능
+"""
+
+import time
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from collectors import TopicCollector
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceSchedule:
+    """소스별 폴링 상태"""
+    name: str
+    interval: float
+    next_run_at: float
+    runs: int = 0
+    errors: int = 0
+    last_new: int = 0
+    last_hot: int = 0
+
+    def summary(self) -> Dict:
+        return {
+            "interval_seconds": round(self.interval, 1),
+            "next_run_at": round(self.next_run_at, 1),
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_new": self.last_new,
+            "last_hot": self.last_hot
+        }
+
+
+class AdaptiveScheduler:
+    """소스별 주기를 신규/급상승 토픽 여부에 따라 조절하는 스케줄러"""
+
+    def __init__(
+        self,
+        collectors: List[TopicCollector],
+        handler: Callable[[TopicCollector], List[Dict]],
+        base_interval: float = 300,
+        min_interval: float = 60,
+        max_interval: float = 1800,
+        tighten_factor: float = 0.5,
+        backoff_factor: float = 1.5,
+        hot_velocity_pct: float = 0.8,
+        clock=time.monotonic,
+        sleep=time.sleep
+    ):
+        """
+        Args:
+            collectors: 폴링할 수집기 리스트
+            handler: 수집기 1개를 수집/저장하고 이번에 저장(seen 처리)한 신규 토픽 리스트를 반환하는 함수
+                     (토픽에 velocity_pct가 있으면 급상승 판단에 사용)
+            base_interval: 시작 주기 (초)
+            min_interval: 최소 주기 (초)
+            max_interval: 최대 주기 (초)
+            tighten_factor: 급상승 토픽 발견 시 주기 배율
+            backoff_factor: 신규 토픽이 없을 때 주기 배율
+            hot_velocity_pct: 급상승으로 보는 velocity_pct 하한
+            clock: 현재 시각 함수 (테스트용 주입 가능)
+            sleep: 대기 함수 (테스트용 주입 가능)
+        """
+        self.collectors = {collector.name: collector for collector in collectors}
+        self.handler = handler
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.tighten_factor = tighten_factor
+        self.backoff_factor = backoff_factor
+        self.hot_velocity_pct = hot_velocity_pct
+        self.clock = clock
+        self.sleep = sleep
+
+        # 첫 tick에서 모든 소스를 한 번씩 수집
+        now = self.clock()
+        self.schedules = {
+            name: SourceSchedule(name=name, interval=base_interval, next_run_at=now)
+            for name in self.collectors
+        }
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def adjust(self, schedule: SourceSchedule, new_topics: List[Dict]):
+        """
+        수집 결과로 다음 주기 결정
+        - 급상승 신규 토픽 있음: 주기 × tighten_factor
+        - 신규 토픽은 있으나 급상승 없음: 기본 주기 쪽으로 복귀
+        - 신규 토픽 없음: 주기 × backoff_factor
+        """
+        hot = [topic for topic in new_topics if topic.get("velocity_pct", 0) >= self.hot_velocity_pct]
+        schedule.last_new = len(new_topics)
+        schedule.last_hot = len(hot)
+
+        if hot:
+            schedule.interval = self._clamp(schedule.interval * self.tighten_factor)
+        elif new_topics:
+            schedule.interval = self._clamp((schedule.interval + self.base_interval) / 2)
+        else:
+            schedule.interval = self._clamp(schedule.interval * self.backoff_factor)
+
+    def run_source(self, name: str):
+        """소스 1개 수집 후 주기 조절 (실패 시 백오프)"""
+        schedule = self.schedules[name]
+        schedule.runs += 1
+
+        try:
+            new_topics = self.handler(self.collectors[name]) or []
+            self.adjust(schedule, new_topics)
+        except Exception as e:
+            logger.error(f"[{name}] 스케줄 수집 실패: {e}")
+            schedule.errors += 1
+            schedule.interval = self._clamp(schedule.interval * self.backoff_factor)
+
+        schedule.next_run_at = self.clock() + schedule.interval
+        logger.info(
+            f"[{name}] 신규 {schedule.last_new}개 (급상승 {schedule.last_hot}개), "
+            f"다음 수집 {schedule.interval:.0f}초 후"
+        )
+
+    def run_due(self) -> List[str]:
+        """실행 시각이 된 소스를 모두 수집하고 실행한 소스 이름 반환"""
+        now = self.clock()
+        due = sorted(
+            (schedule for schedule in self.schedules.values() if schedule.next_run_at <= now),
+            key=lambda schedule: schedule.next_run_at
+        )
+        for schedule in due:
+            self.run_source(schedule.name)
+        return [schedule.name for schedule in due]
+
+    def seconds_until_next(self) -> float:
+        """다음 실행 예정 소스까지 남은 시간 (초)"""
+        if not self.schedules:
+            return self.max_interval
+        next_run_at = min(schedule.next_run_at for schedule in self.schedules.values())
+        return max(0.0, next_run_at - self.clock())
+
+    def run_forever(self, max_ticks: Optional[int] = None):
+        """
+        스케줄 루프
+
+        Args:
+            max_ticks: 최대 반복 횟수 (None이면 무한, 테스트용)
+        """
+        logger.info(f"적응형 스케줄러 시작: {', '.join(self.schedules)}")
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            self.run_due()
+            ticks += 1
+            self.sleep(self.seconds_until_next())
+
+    def get_status(self) -> Dict:
+        """소스별 주기/최근 결과"""
+        return {name: schedule.summary() for name, schedule in self.schedules.items()}
@@ -0,0 +1,151 @@
+"""
+이미 수집한 토픽 인덱스 (증분 수집용)
+- 정규화된 URL + 제목 지문(fingerprint)을 해시로 저장
+- TTL이 지난 항목은 자동 제거, 최대 항목 수 제한
+- Firestore 문서 1개에 압축 저장 (해시 앞 16자리 → 마지막 수집 시각)
+"""
+
+import re
+import time
+import hashlib
+import logging
+from typing import Dict, List, Iterable
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# URL 비교 시 무시할 추적용 쿼리 파라미터
+TRACKING_PARAMS = {"ref", "ref_src", "source", "fbclid", "gclid", "mc_cid", "mc_eid"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    URL 정규화
+    - scheme/host 소문자, www. 제거, 기본 포트 제거
+    - utm_* 등 추적 파라미터 제거, 쿼리 정렬
+    - fragment 및 끝 슬래시 제거
+    """
+    if not url:
+        return ""
+
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def title_fingerprint(title: str) -> str:
+    """제목 지문: 소문자, 구두점 제거, 단어 정렬 (어순/대소문자 차이 무시)"""
+    words = re.findall(r"\w+", (title or "").lower())
+    return " ".join(sorted(set(words)))
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()[:16]
+
+
+class SeenIndex:
+    """TTL 기반 해시 집합"""
+
+    def __init__(self, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 10000, clock=time.time):
+        """
+        Args:
+            ttl_seconds: 항목 유지 기간 (초)
+            max_entries: 최대 항목 수 (초과 시 오래된 항목부터 제거)
+            clock: 현재 시각 함수 (테스트용 주입 가능)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries: Dict[str, float] = {}
+
+    @staticmethod
+    def keys_for(topic: Dict) -> List[str]:
+        """토픽의 인덱스 키 (URL 키, 제목 키)"""
+        keys = []
+        url = normalize_url(topic.get("url", ""))
+        if url:
+            keys.append("u" + _hash(url))
+        fingerprint = title_fingerprint(topic.get("title", ""))
+        if fingerprint:
+            keys.append("t" + _hash(fingerprint))
+        return keys
+
+    def is_seen(self, topic: Dict) -> bool:
+        """URL 또는 제목 중 하나라도 TTL 안에 본 적 있으면 True"""
+        now = self.clock()
+        return any(
+            now - self.entries.get(key, float("-inf")) < self.ttl_seconds
+            for key in self.keys_for(topic)
+        )
+
+    def mark(self, topics: Iterable[Dict]):
+        """토픽을 수집 완료로 기록"""
+        now = self.clock()
+        for topic in topics:
+            for key in self.keys_for(topic):
+                self.entries[key] = now
+
+    def filter_new(self, topics: List[Dict], dedupe_batch: bool = True) -> List[Dict]:
+        """
+        처음 보는 토픽만 반환
+
+        Args:
+            topics: 후보 토픽 리스트
+            dedupe_batch: 같은 배치 안의 중복도 제거할지 여부
+                          (뒤에서 클러스터링으로 합칠 경우 False)
+
+        Note: 반환된 토픽은 아직 mark되지 않음.
+              실제로 저장한 토픽만 mark()로 기록해야 다음 실행에서 다시 후보가 될 수 있음
+        """
+        new_topics = []
+        batch_keys = set()
+
+        for topic in topics:
+            keys = self.keys_for(topic)
+            if self.is_seen(topic) or (dedupe_batch and batch_keys.intersection(keys)):
+                continue
+            batch_keys.update(keys)
+            new_topics.append(topic)
+
+        return new_topics
+
+    def evict(self):
+        """TTL 만료 항목 제거 후 최대 항목 수 초과분을 오래된 순으로 제거"""
+        now = self.clock()
+        self.entries = {
+            key: seen_at for key, seen_at in self.entries.items()
+            if now - seen_at < self.ttl_seconds
+        }
+
+        overflow = len(self.entries) - self.max_entries
+        if overflow > 0:
+            oldest = sorted(self.entries, key=self.entries.get)[:overflow]
+            for key in oldest:
+                del self.entries[key]
+
+    def load(self, doc_ref) -> "SeenIndex":
+        """Firestore 문서에서 인덱스 로드"""
+        doc = doc_ref.get()
+        if doc.exists:
+            self.entries = dict(doc.to_dict().get("entries", {}))
+        self.evict()
+        logger.info(f"Seen 인덱스 로드: {len(self.entries)}개 항목")
+        return self
+
+    def save(self, doc_ref):
+        """만료 항목 정리 후 Firestore 문서에 저장"""
+        self.evict()
+        doc_ref.set({"entries": self.entries, "updated_at": self.clock()})
+        logger.info(f"Seen 인덱스 저장: {len(self.entries)}개 항목")
@@ -0,0 +1,67 @@
+"""
+스트리밍 토픽 선택
+- 후보가 도착할 때마다 제한된 힙으로 상위 K개 유지
+- 품질 임계값 이상인 후보는 가장 느린 소스를 기다리지 않고 즉시 다음 단계로 방출
+"""
+
+import heapq
+import itertools
+import logging
+from typing import Callable, Dict, List
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TopKSelector:
+    """임계값 즉시 방출 + 상위 K 힙"""
+
+    def __init__(self, k: int, emit_threshold: float, on_emit: Callable[[Dict], None]):
+        """
+        Args:
+            k: 이번 실행에서 선택할 최대 토픽 수 (즉시 방출분 포함)
+            emit_threshold: 이 점수 이상이면 즉시 방출
+            on_emit: 방출 콜백 (예: Firestore 저장)
+        """
+        self.k = k
+        self.emit_threshold = emit_threshold
+        self.on_emit = on_emit
+        self.emitted: List[Dict] = []
+        self.heap = []  # (score, seq, topic) 최소 힙
+        self.counter = itertools.count()
+
+    @property
+    def capacity(self) -> int:
+        """힙에 남길 수 있는 자리 (K - 즉시 방출 수)"""
+        return self.k - len(self.emitted)
+
+    @property
+    def full(self) -> bool:
+        """K개를 모두 즉시 방출해 더 볼 필요가 없는 상태"""
+        return self.capacity <= 0
+
+    def offer(self, topic: Dict, score: float):
+        """후보 1개 처리"""
+        if self.full:
+            return
+
+        if score >= self.emit_threshold:
+            self.emitted.append(topic)
+            self.on_emit(topic)
+            logger.info(f"즉시 방출 ({score:.3f}): {topic.get('title')}")
+            # 방출로 자리가 줄었으면 힙에서 가장 낮은 후보 제거
+            while len(self.heap) > self.capacity:
+                heapq.heappop(self.heap)
+            return
+
+        entry = (score, next(self.counter), topic)
+        if len(self.heap) < self.capacity:
+            heapq.heappush(self.heap, entry)
+        elif self.heap and score > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def finalize(self) -> List[Dict]:
+        """스트림 종료 후 힙에 남은 후보 (점수 내림차순)"""
+        remaining = [topic for _, _, topic in sorted(self.heap, key=lambda x: (-x[0], x[1]))]
+        self.heap = []
+        return remaining
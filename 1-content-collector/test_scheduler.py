@@ -0,0 +1,95 @@
+"""AdaptiveScheduler 주기 조절 테스트 (가짜 시계 + 스텁 소스)"""
+
+import pytest
+
+from collectors import FunctionCollector
+from scheduler import AdaptiveScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def make_scheduler(results, clock, **kwargs):
+    """results: 소스 이름 → 호출마다 반환할 토픽 리스트(또는 예외) 목록"""
+    calls = {name: iter(outcomes) for name, outcomes in results.items()}
+
+    def handler(collector):
+        outcome = next(calls[collector.name])
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    collectors = [FunctionCollector(name, lambda: []) for name in results]
+    options = dict(base_interval=100, min_interval=20, max_interval=400, tighten_factor=0.5, backoff_factor=2.0)
+    options.update(kwargs)
+    return AdaptiveScheduler(collectors, handler, clock=clock, sleep=clock.sleep, **options)
+
+
+def test_backoff_when_no_new_topics_until_max_interval():
+    clock = FakeClock()
+    scheduler = make_scheduler({"hn": [[], [], [], []]}, clock)
+
+    intervals = []
+    for _ in range(4):
+        scheduler.run_source("hn")
+        intervals.append(scheduler.schedules["hn"].interval)
+
+    assert intervals == [200, 400, 400, 400]
+    assert scheduler.schedules["hn"].next_run_at == clock.now + 400
+
+
+def test_hot_topic_tightens_and_new_topics_reset_toward_base():
+    clock = FakeClock()
+    hot = [{"title": "hot", "velocity_pct": 0.95}]
+    warm = [{"title": "warm", "velocity_pct": 0.2}]
+    scheduler = make_scheduler({"hn": [hot, hot, hot, warm, warm]}, clock)
+
+    intervals = []
+    for _ in range(5):
+        scheduler.run_source("hn")
+        intervals.append(scheduler.schedules["hn"].interval)
+
+    # 급상승: 50 → 25 → 최소 20, 신규만 있음: 기본 주기(100) 쪽으로 절반씩 복귀
+    assert intervals == [50, 25, 20, 60, 80]
+    assert scheduler.schedules["hn"].last_hot == 0
+    assert scheduler.schedules["hn"].last_new == 1
+
+
+def test_handler_error_counts_and_backs_off():
+    clock = FakeClock()
+    scheduler = make_scheduler({"reddit": [RuntimeError("error: 503"), [{"title": "new"}]]}, clock)
+
+    scheduler.run_source("reddit")
+    schedule = scheduler.schedules["reddit"]
+    assert schedule.errors == 1
+    assert schedule.interval == 200
+
+    scheduler.run_source("reddit")
+    assert schedule.errors == 1
+    assert schedule.runs == 2
+    assert schedule.interval == 150
+
+
+def test_run_forever_runs_only_due_sources_on_fake_clock():
+    clock = FakeClock()
+    scheduler = make_scheduler(
+        {"hn": [[{"title": "a", "velocity_pct": 0.9}]] * 10, "reddit": [[]] * 10},
+        clock,
+        base_interval=100
+    )
+
+    scheduler.run_forever(max_ticks=3)
+
+    # t=0 둘 다 (hn 50초, reddit 200초 후) → t=50 hn (25초 후) → t=75 hn (최소 20초 후) → t=95
+    assert clock.now == pytest.approx(95)
+    assert scheduler.schedules["hn"].runs == 3
+    assert scheduler.schedules["reddit"].runs == 1
+    assert scheduler.seconds_until_next() == 0.0
@@ -0,0 +1,238 @@
+"""
+소스 간 유사 토픽 클러스터링 (MinHash + LSH)
+- 같은 뉴스가 Reddit/HN에 다른 제목으로 올라오면 하나로 묶음
+- 정규화 제목의 문자 3-gram + 도메인을 MinHash 서명으로 변환
+- LSH 밴딩으로 후보 쌍만 비교하므로 토픽 수에 대략 선형
+- 클러스터마다 대표 토픽 1개 + 합산 점수 반환
+- 스트리밍 모드용 증분 중복 판별기 (StreamingDeduper)
+"""
+
+import re
+import zlib
+import logging
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from seen_index import normalize_url
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 링크 모음/게시판 도메인은 같은 도메인이어도 같은 뉴스라는 근거가 아님
+AGGREGATOR_DOMAINS = {
+    "reddit.com", "old.reddit.com", "i.redd.it", "v.redd.it",
+    "news.ycombinator.com", "github.com", "youtube.com", "twitter.com", "x.com"
+}
+
+# (a * x + b) % p 계산이 uint64 안에서 넘치지 않도록 31비트 소수 사용
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def _domain(url: str) -> str:
+    host = (urlsplit(url or "").hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def topic_shingles(topic: Dict, size: int = 3) -> Set[str]:
+    """정규화 제목의 문자 n-gram + 도메인 토큰"""
+    text = " ".join(re.findall(r"\w+", (topic.get("title") or "").lower()))
+    shingles = {text[i:i + size] for i in range(max(1, len(text) - size + 1))}
+
+    domain = _domain(topic.get("url"))
+    if domain and domain not in AGGREGATOR_DOMAINS:
+        shingles.add(f"domain:{domain}")
+
+    return shingles
+
+
+class MinHasher:
+    """고정 시드 MinHash 서명 생성기 (NumPy 벡터 연산)"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 42):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self.b = rng.integers(0, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, shingles: Set[str]) -> Tuple[int, ...]:
+        values = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) % _MERSENNE_PRIME for shingle in shingles),
+            dtype=np.uint64
+        ) if shingles else np.zeros(1, dtype=np.uint64)
+        hashed = (self.a * values + self.b) % _MERSENNE_PRIME
+        return tuple(hashed.min(axis=1).tolist())
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """서명으로 추정한 Jaccard 유사도"""
+        return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+class LSHIndex:
+    """MinHash 서명 밴딩 인덱스"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands로 나누어 떨어져야 합니다")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = defaultdict(list)
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, signature[start:start + self.rows]
+
+    def add(self, key, signature: Tuple[int, ...]):
+        for band_key in self._band_keys(signature):
+            self.buckets[band_key].append(key)
+
+    def candidates(self, signature: Tuple[int, ...]) -> Set:
+        """밴드 하나 이상이 일치하는 키 집합"""
+        found = set()
+        for band_key in self._band_keys(signature):
+            found.update(self.buckets.get(band_key, ()))
+        return found
+
+
+def cluster_topics(
+    topics: List[Dict],
+    threshold: float = 0.5,
+    num_perm: int = 64,
+    bands: int = 16,
+    score_key: str = "score"
+) -> List[Dict]:
+    """
+    유사 토픽을 묶어 클러스터별 대표 토픽 반환
+
+    Args:
+        topics: 토픽 리스트
+        threshold: 같은 클러스터로 볼 최소 추정 Jaccard 유사도
+        num_perm: MinHash 순열 수
+        bands: LSH 밴드 수 (rows = num_perm / bands)
+        score_key: 합산할 점수 필드
+
+    Returns:
+        대표 토픽 리스트. 대표 토픽에는 다음 필드가 추가됨
+            - score_key: 클러스터 합산 점수
+            - cluster_size: 클러스터 크기
+            - sources: 클러스터에 포함된 소스 목록
+            - duplicates: 대표를 제외한 나머지 토픽 (title/url/source/score)
+    """
+    if not topics:
+        return []
+
+    hasher = MinHasher(num_perm)
+    index = LSHIndex(num_perm, bands)
+    parent = list(range(len(topics)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    signatures = []
+    url_owner = {}
+
+    for i, topic in enumerate(topics):
+        # 같은 URL은 서명 비교 없이 바로 병합
+        url = normalize_url(topic.get("url", ""))
+        if url in url_owner:
+            union(url_owner[url], i)
+        elif url:
+            url_owner[url] = i
+
+        signature = hasher.signature(topic_shingles(topic))
+        for j in index.candidates(signature):
+            if MinHasher.similarity(signature, signatures[j]) >= threshold:
+                union(j, i)
+
+        index.add(i, signature)
+        signatures.append(signature)
+
+    clusters = defaultdict(list)
+    for i in range(len(topics)):
+        clusters[find(i)].append(topics[i])
+
+    representatives = []
+    for members in clusters.values():
+        members.sort(key=lambda x: x.get(score_key) or 0, reverse=True)
+        representative = dict(members[0])
+        representative[score_key] = sum(member.get(score_key) or 0 for member in members)
+        representative["cluster_size"] = len(members)
+        representative["sources"] = sorted({member.get("source") for member in members})
+        representative["duplicates"] = [
+            {key: member.get(key) for key in ("title", "url", "source", score_key)}
+            for member in members[1:]
+        ]
+        representatives.append(representative)
+
+    merged = len(topics) - len(representatives)
+    if merged:
+        logger.info(f"유사 토픽 클러스터링: {len(topics)}개 → {len(representatives)}개 ({merged}개 병합)")
+
+    return representatives
+
+
+class StreamingDeduper:
+    """
+    도착 순서대로 들어오는 토픽의 증분 중복 판별
+
+    먼저 도착한 토픽이 대표가 되고, 이후 유사 토픽은 대표의 duplicates에 붙습니다.
+    (배치 모드와 달리 점수 합산은 하지 않음 - 이미 방출된 대표의 점수를 바꿀 수 없으므로)
+    """
+
+    def __init__(self, threshold: float = 0.5, num_perm: int = 64, bands: int = 16):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.index = LSHIndex(num_perm, bands)
+        self.representatives: List[Dict] = []
+        self.signatures: List[Tuple[int, ...]] = []
+        self.url_owner: Dict[str, int] = {}
+
+    def add(self, topic: Dict) -> Dict:
+        """
+        토픽 등록
+
+        Returns:
+            새 대표면 topic 자신, 중복이면 기존 대표 토픽
+        """
+        url = normalize_url(topic.get("url", ""))
+        signature = self.hasher.signature(topic_shingles(topic))
+
+        owner = self.url_owner.get(url) if url else None
+        if owner is None:
+            for j in self.index.candidates(signature):
+                if MinHasher.similarity(signature, self.signatures[j]) >= self.threshold:
+                    owner = j
+                    break
+
+        if owner is not None:
+            representative = self.representatives[owner]
+            representative["duplicates"].append(
+                {key: topic.get(key) for key in ("title", "url", "source", "score")}
+            )
+            representative["cluster_size"] += 1
+            representative["sources"] = sorted(set(representative["sources"]) | {topic.get("source")})
+            return representative
+
+        topic.setdefault("duplicates", [])
+        topic.setdefault("cluster_size", 1)
+        topic.setdefault("sources", [topic.get("source")])
+
+        key = len(self.representatives)
+        self.representatives.append(topic)
+        self.signatures.append(signature)
+        self.index.add(key, signature)
+        if url:
+            self.url_owner[url] = key
+        return topic
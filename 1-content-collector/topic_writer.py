@@ -0,0 +1,72 @@
+"""
+토픽 일괄 저장 (Firestore batched writes)
+- 문서마다 .add()로 왕복하는 대신 WriteBatch로 묶어서 커밋
+- flush_size마다 자동 커밋 (Firestore 배치 한도 500)
+"""
+
+import logging
+from typing import Dict, List
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Firestore WriteBatch 1회 최대 쓰기 수
+MAX_BATCH_SIZE = 500
+
+
+class BatchTopicWriter:
+    """BulkWriter 스타일의 토픽 버퍼"""
+
+    def __init__(self, db, collection: str = "trending_topics", flush_size: int = MAX_BATCH_SIZE):
+        """
+        Args:
+            db: Firestore 클라이언트 (batch()/collection()을 제공하는 객체면 됨)
+            collection: 저장할 컬렉션 이름
+            flush_size: 한 번에 커밋할 문서 수 (1~500)
+        """
+        self.db = db
+        self.collection = collection
+        self.flush_size = max(1, min(flush_size, MAX_BATCH_SIZE))
+        self.batch = None
+        self.buffered = 0
+        self.written_ids: List[str] = []
+        self.commits = 0
+
+    def add(self, data: Dict) -> str:
+        """
+        문서를 버퍼에 추가 (flush_size에 도달하면 자동 커밋)
+
+        Returns:
+            미리 할당된 문서 ID
+        """
+        if self.batch is None:
+            self.batch = self.db.batch()
+
+        doc_ref = self.db.collection(self.collection).document()
+        self.batch.set(doc_ref, data)
+        self.buffered += 1
+        self.written_ids.append(doc_ref.id)
+
+        if self.buffered >= self.flush_size:
+            self.flush()
+
+        return doc_ref.id
+
+    def flush(self):
+        """버퍼에 쌓인 쓰기를 한 번에 커밋"""
+        if self.batch is None or self.buffered == 0:
+            return
+
+        self.batch.commit()
+        self.commits += 1
+        logger.info(f"{self.collection}: {self.buffered}개 문서 일괄 저장 (커밋 {self.commits}회)")
+
+        self.batch = None
+        self.buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
@@ -0,0 +1,227 @@
+"""
+한국어 TTS 발화 길이 추정 모델
+- 한글 음절 수 + 숫자를 읽는 소리(예: 85.4% → 팔십오 점 사 퍼센트) + 영문 약어/단어 음절
+- 문장 끝/쉼표/문단 경계의 쉼 길이
+- speaking_rate로 나눠 TTS 설정 반영
+- 특징 행렬 × 계수 벡터로 여러 스크립트를 한 번에 추정 (NumPy)
+- 실측 오디오 길이로 계수 보정 (calibrate), Firestore config/duration_model에 저장/로드
+
+※ 2-script-generator와 3-audio-generator에 같은 파일을 둡니다 (서비스별 독립 배포).
+"""
+
+import os
+import re
+import logging
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FEATURES = ("syllables", "latin_syllables", "sentence_pauses", "comma_pauses", "paragraph_pauses", "base")
+
+# Neural2 한국어 음성 speaking_rate=1.0 기준 초기값 (calibrate()로 보정)
+DEFAULT_COEFFICIENTS = {
+    "syllables": 0.16,
+    "latin_syllables": 0.14,
+    "sentence_pauses": 0.35,
+    "comma_pauses": 0.15,
+    "paragraph_pauses": 0.30,
+    "base": 0.30
+}
+
+_DIGITS = "영일이삼사오육칠팔구"
+_SMALL_UNITS = ("", "십", "백", "천")
+_LARGE_UNITS = ("", "만", "억", "조", "경")
+
+# 영문 알파벳을 한국어로 읽을 때의 음절 수 (A=에이, H=에이치, W=더블유 ...)
+_LETTER_SYLLABLES = {
+    "A": 2, "B": 1, "C": 1, "D": 1, "E": 1, "F": 2, "G": 1, "H": 3, "I": 2, "J": 2, "K": 2, "L": 1, "M": 1,
+    "N": 1, "O": 1, "P": 1, "Q": 1, "R": 1, "S": 2, "T": 1, "U": 1, "V": 2, "W": 3, "X": 2, "Y": 2, "Z": 2
+}
+
+# 읽을 때 소리가 나는 기호
+_SYMBOL_READINGS = {"%": "퍼센트", "$": "달러", "+": "플러스", "&": "앤드", "@": "앳", "~": "에서"}
+
+_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_HANGUL = re.compile(r"[가-힣]")
+_LATIN_WORD = re.compile(r"[A-Za-z]+")
+_VOWEL_GROUP = re.compile(r"[aeiouy]+", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"[.!?…]+")
+_COMMA = re.compile(r"[,·:;]")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+
+
+def read_integer(value: int) -> str:
+    """정수를 한자어 수사로 읽기 (10000 → 만, 2024 → 이천이십사, 가장 큰 단위를 넘으면 자릿수별로)"""
+    if value == 0:
+        return "영"
+    if value >= 10000 ** len(_LARGE_UNITS):
+        # 경(10^16) 단위를 넘는 수는 보통 숫자를 하나씩 읽음
+        return "".join(_DIGITS[int(digit)] for digit in str(value))
+
+    groups = []
+    while value:
+        groups.append(value % 10000)
+        value //= 10000
+
+    words = []
+    for large_index in range(len(groups) - 1, -1, -1):
+        group = groups[large_index]
+        if not group:
+            continue
+        part = ""
+        for small_index in range(3, -1, -1):
+            digit = (group // (10 ** small_index)) % 10
+            if not digit:
+                continue
+            # 십/백/천 앞의 '일'은 읽지 않음 (일십 → 십)
+            if digit == 1 and small_index > 0:
+                part += _SMALL_UNITS[small_index]
+            else:
+                part += _DIGITS[digit] + _SMALL_UNITS[small_index]
+        # 만 단위가 정확히 1이면 '일만'이 아니라 '만'
+        if part == "일" and large_index == 1:
+            part = ""
+        words.append(part + _LARGE_UNITS[large_index])
+    return "".join(words)
+
+
+def read_number(text: str) -> str:
+    """숫자 문자열 읽기 ("1,200" → 천이백, "85.4" → 팔십오점사)"""
+    integer_part, _, fraction = text.replace(",", "").partition(".")
+    spoken = read_integer(int(integer_part)) if integer_part else ""
+    if fraction:
+        spoken += "점" + "".join(_DIGITS[int(digit)] for digit in fraction)
+    return spoken
+
+
+def _latin_syllables(word: str) -> float:
+    """영문 단어의 한국어 발음 음절 수 (대문자 약어는 글자별, 나머지는 모음 묶음 기준 근사)"""
+    if word.isupper() and len(word) <= 5:
+        return float(sum(_LETTER_SYLLABLES.get(letter, 1) for letter in word))
+    # 외래어 표기는 자음 뒤에 '으'가 붙어 음절이 늘어나는 경향
+    return max(1.0, len(_VOWEL_GROUP.findall(word)) * 1.5)
+
+
+def text_features(text: str) -> np.ndarray:
+    """스크립트 1개의 특징 벡터 (FEATURES 순서)"""
+    text = text or ""
+
+    number_syllables = sum(len(read_number(match)) for match in _NUMBER.findall(text))
+    symbol_syllables = sum(len(reading) * text.count(symbol) for symbol, reading in _SYMBOL_READINGS.items())
+    hangul_syllables = len(_HANGUL.findall(text))
+    latin = sum(_latin_syllables(word) for word in _LATIN_WORD.findall(text))
+
+    # 소수점/천 단위 쉼표는 쉼이 아님
+    without_numbers = _NUMBER.sub(" ", text)
+    sentence_pauses = len(_SENTENCE_END.findall(without_numbers))
+    comma_pauses = len(_COMMA.findall(without_numbers))
+    paragraph_pauses = len(_PARAGRAPH.findall(text))
+
+    return np.array([
+        hangul_syllables + number_syllables + symbol_syllables,
+        latin,
+        sentence_pauses,
+        comma_pauses,
+        paragraph_pauses,
+        1.0
+    ], dtype=np.float64)
+
+
+class DurationModel:
+    """선형 발화 길이 모델: seconds = (features · coefficients) / speaking_rate"""
+
+    def __init__(self, coefficients: Dict[str, float] = None, speaking_rate: float = 1.0):
+        """
+        Args:
+            coefficients: 특징별 초 단위 계수 (없으면 DEFAULT_COEFFICIENTS)
+            speaking_rate: TTS speaking_rate 기본값
+        """
+        merged = {**DEFAULT_COEFFICIENTS, **(coefficients or {})}
+        self.coefficients = np.array([merged[name] for name in FEATURES], dtype=np.float64)
+        self.speaking_rate = speaking_rate
+
+    def feature_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        return np.vstack([text_features(text) for text in texts]) if texts else np.zeros((0, len(FEATURES)))
+
+    def estimate_many(self, texts: Sequence[str], speaking_rate: float = None) -> np.ndarray:
+        """여러 스크립트의 예상 길이(초)를 한 번에 계산"""
+        rate = speaking_rate or self.speaking_rate
+        return self.feature_matrix(texts) @ self.coefficients / rate
+
+    def estimate(self, text: str, speaking_rate: float = None) -> float:
+        """스크립트 1개의 예상 길이(초)"""
+        return float(self.estimate_many([text], speaking_rate)[0])
+
+    def calibrate(self, samples: Iterable[Tuple[str, float, float]]) -> Dict[str, float]:
+        """
+        실측 길이로 계수 재추정 (최소제곱, 음수 계수는 0으로)
+
+        Args:
+            samples: (스크립트, 실측 길이(초), speaking_rate) 목록
+
+        Returns:
+            {"samples": n, "mae_before": 초, "mae_after": 초}
+        """
+        samples = list(samples)
+        if len(samples) < len(FEATURES):
+            raise ValueError(f"보정에는 최소 {len(FEATURES)}개 샘플이 필요합니다 (현재 {len(samples)}개)")
+
+        texts, measured, rates = zip(*samples)
+        measured = np.asarray(measured, dtype=np.float64)
+        rates = np.asarray(rates, dtype=np.float64)
+
+        # seconds × rate = features · coefficients
+        matrix = self.feature_matrix(texts)
+        target = measured * rates
+
+        mae_before = float(np.mean(np.abs(matrix @ self.coefficients / rates - measured)))
+        # 샘플에 한 번도 나타나지 않은 특징은 추정할 수 없으므로 기존 계수 유지
+        observed = matrix.any(axis=0)
+        fixed = matrix[:, ~observed] @ self.coefficients[~observed]
+        coefficients, *_ = np.linalg.lstsq(matrix[:, observed], target - fixed, rcond=None)
+        self.coefficients[observed] = np.maximum(coefficients, 0.0)
+        mae_after = float(np.mean(np.abs(matrix @ self.coefficients / rates - measured)))
+
+        logger.info(f"발화 길이 모델 보정: {len(samples)}개 샘플, MAE {mae_before:.2f}초 → {mae_after:.2f}초")
+        return {"samples": len(samples), "mae_before": round(mae_before, 3), "mae_after": round(mae_after, 3)}
+
+    def check_bounds(self, text: str, min_seconds: float, max_seconds: float, speaking_rate: float = None) -> Tuple[str, float]:
+        """
+        길이 범위 검사
+
+        Returns:
+            ("ok" | "too_short" | "too_long", 예상 길이(초))
+        """
+        seconds = self.estimate(text, speaking_rate)
+        if seconds < min_seconds:
+            return "too_short", seconds
+        if seconds > max_seconds:
+            return "too_long", seconds
+        return "ok", seconds
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: round(float(value), 6) for name, value in zip(FEATURES, self.coefficients)}
+
+    def load(self, doc_ref) -> "DurationModel":
+        """Firestore 문서의 보정 계수 로드 (없거나 실패하면 기본값 유지)"""
+        try:
+            doc = doc_ref.get()
+            if doc.exists:
+                coefficients = {**DEFAULT_COEFFICIENTS, **(doc.to_dict().get("coefficients") or {})}
+                self.coefficients = np.array([coefficients[name] for name in FEATURES], dtype=np.float64)
+        except Exception as e:
+            logger.warning(f"발화 길이 모델 계수 로드 실패 (기본값 사용): {e}")
+        return self
+
+    def save(self, doc_ref, stats: Dict = None):
+        """보정 계수를 Firestore 문서에 저장"""
+        doc_ref.set({"coefficients": self.to_dict(), "calibration": stats or {}})
+
+
+def script_bounds() -> Tuple[float, float]:
+    """환경 변수의 허용 길이 범위 (초)"""
+    return float(os.getenv("SCRIPT_MIN_SECONDS", 40)), float(os.getenv("SCRIPT_MAX_SECONDS", 60))
+
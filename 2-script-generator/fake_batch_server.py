@@ -0,0 +1,152 @@
+"""
+로컬 테스트용 OpenAI Batch API 가짜 서버
+- POST /v1/files, GET /v1/files/{id}/content
+- POST /v1/batches, GET /v1/batches/{id}
+- 배치는 생성 후 FAKE_BATCH_DELAY초가 지나면 completed
+- 응답 본문은 local_templates로 요청의 모드(시스템 프롬프트)에 맞는 Info/Sales 스크립트를 생성
+
+사용법:
+    python fake_batch_server.py  # 기본 포트 8765
+    OPENAI_BASE_URL=http://localhost:8765/v1 OPENAI_API_KEY=test python main.py
+    curl -X POST localhost:8080/submit-batch
+    curl -X POST localhost:8080/poll-batches
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from local_templates import render
+
+_lock = threading.Lock()
+_files = {}
+_batches = {}
+
+
+def _completion(request_line: dict) -> dict:
+    """요청 1건에 대한 배치 출력 줄 (후보마다 custom_id/순번으로 고정한 템플릿 스크립트)"""
+    messages = request_line["body"]["messages"]
+    return {
+        "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+        "custom_id": request_line["custom_id"],
+        "response": {
+            "status_code": 200,
+            "body": {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion",
+                "model": request_line["body"].get("model"),
+                "choices": [
+                    {"index": index, "message": {"role": "assistant", "content": render(messages, random.Random(f"{request_line['custom_id']}:{index}"))}, "finish_reason": "stop"}
+                    for index in range(request_line["body"].get("n") or 1)
+                ],
+                "usage": {"prompt_tokens": 1200, "completion_tokens": 250, "total_tokens": 1450}
+            }
+        },
+        "error": None
+    }
+
+
+def _batch_view(batch: dict) -> dict:
+    """경과 시간에 따라 completed로 전환한 배치 객체"""
+    if batch["status"] == "in_progress" and time.time() - batch["created_at"] >= batch["_delay"]:
+        lines = [json.loads(line) for line in _files[batch["input_file_id"]]["content"].splitlines() if line.strip()]
+        output_id = f"file-{uuid.uuid4().hex[:12]}"
+        _files[output_id] = {
+            "content": "\n".join(json.dumps(_completion(line), ensure_ascii=False) for line in lines) + "\n",
+            "filename": "output.jsonl"
+        }
+        batch.update({
+            "status": "completed",
+            "output_file_id": output_id,
+            "completed_at": int(time.time()),
+            "request_counts": {"total": len(lines), "completed": len(lines), "failed": 0}
+        })
+    return {key: value for key, value in batch.items() if not key.startswith("_")}
+
+
+class FakeBatchHandler(BaseHTTPRequestHandler):
+    def _send_json(self, payload: dict, status: int = 200):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        with _lock:
+            if self.path == "/v1/files":
+                # multipart/form-data에서 file 파트만 추출
+                raw = self._body()
+                message = BytesParser(policy=HTTP).parsebytes(
+                    f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode("utf-8") + raw
+                )
+                part = next(part for part in message.iter_parts() if part.get_param("name", header="content-disposition") == "file")
+                file_id = f"file-{uuid.uuid4().hex[:12]}"
+                _files[file_id] = {"content": part.get_payload(decode=True).decode("utf-8"), "filename": part.get_filename()}
+                return self._send_json({
+                    "id": file_id, "object": "file", "bytes": len(_files[file_id]["content"]),
+                    "created_at": int(time.time()), "filename": part.get_filename(), "purpose": "batch", "status": "processed"
+                })
+
+            if self.path == "/v1/batches":
+                request_body = json.loads(self._body())
+                batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+                _batches[batch_id] = {
+                    "id": batch_id,
+                    "object": "batch",
+                    "endpoint": request_body["endpoint"],
+                    "input_file_id": request_body["input_file_id"],
+                    "completion_window": request_body["completion_window"],
+                    "status": "in_progress",
+                    "output_file_id": None,
+                    "error_file_id": None,
+                    "created_at": int(time.time()),
+                    "metadata": request_body.get("metadata"),
+                    "_delay": float(os.getenv("FAKE_BATCH_DELAY", 0))
+                }
+                return self._send_json(_batch_view(_batches[batch_id]))
+
+        self._send_json({"error": {"message": "not found"}}, 404)
+
+    def do_GET(self):
+        with _lock:
+            parts = self.path.strip("/").split("/")
+            if parts[:2] == ["v1", "batches"] and len(parts) == 3 and parts[2] in _batches:
+                return self._send_json(_batch_view(_batches[parts[2]]))
+
+            if parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[3] == "content" and parts[2] in _files:
+                body = _files[parts[2]]["content"].encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+        self._send_json({"error": {"message": "not found"}}, 404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port: int = 0) -> ThreadingHTTPServer:
+    """백그라운드 스레드로 서버 시작 (port=0이면 임의 포트)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeBatchHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("FAKE_BATCH_PORT", 8765))
+    print(f"가짜 Batch API 서버: http://127.0.0.1:{port}/v1")
+    ThreadingHTTPServer(("127.0.0.1", port), FakeBatchHandler).serve_forever()
@@ -0,0 +1,375 @@
+"""
+LLM 호출 백엔드
+- OpenAIBackend: 커넥션 풀/타임아웃 설정, 레이트 리밋·일시 오류 재시도 (지수 백오프 + full jitter)
+- TemplateBackend: 네트워크 없이 결정적 응답 (같은 입력 → 같은 출력), 오프라인 파이프라인/부하 테스트용
+- 두 백엔드 모두 호출 수/토큰/지연 시간 지표를 LLMMetrics에 누적
+- LLM_BACKEND 환경 변수로 선택 (openai | template)
+
+※ 2-script-generator와 4-video-editor에 같은 파일을 둡니다 (서비스별 독립 배포).
+"""
+
+import os
+import time
+import random
+import hashlib
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List
+
+import httpx
+from openai import OpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Completion:
+    """완성 응답 1건 (n>1 요청이면 texts에 후보 전체, text는 첫 번째 후보)"""
+    text: str
+    usage: Dict[str, int]
+    latency: float
+    model: str
+    backend: str
+    retries: int = 0
+    texts: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.texts:
+            self.texts = [self.text]
+
+
+def prompt_usage(usage) -> Dict[str, int]:
+    """
+    응답 usage에서 캐시/비캐시 입력 토큰 분리
+
+    usage.prompt_tokens_details.cached_tokens가 프롬프트 캐시로 처리된 입력 토큰 수
+    (SDK 버전에 따라 객체 또는 dict, 필드가 없으면 0으로 간주)
+    """
+    def field_value(obj, name):
+        if obj is None:
+            return None
+        if isinstance(obj, dict):
+            return obj.get(name)
+        return getattr(obj, name, None)
+
+    prompt_tokens = field_value(usage, "prompt_tokens") or 0
+    cached_tokens = field_value(field_value(usage, "prompt_tokens_details"), "cached_tokens") or 0
+
+    return {
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens,
+        "uncached_tokens": prompt_tokens - cached_tokens,
+        "completion_tokens": field_value(usage, "completion_tokens") or 0
+    }
+
+
+class LLMMetrics:
+    """호출/토큰/지연 시간 누적 지표 (스레드 안전, 지연 시간 분위수는 최근 window건 기준)"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+            self.retries = 0
+            self.prompt_tokens = 0
+            self.cached_tokens = 0
+            self.completion_tokens = 0
+            self.latency_sum = 0.0
+            self.latency_max = 0.0
+            self.started_at = time.monotonic()
+            self._latencies.clear()
+
+    def record(self, completion: Completion):
+        with self._lock:
+            self.calls += 1
+            self.retries += completion.retries
+            self.prompt_tokens += completion.usage.get("prompt_tokens", 0)
+            self.cached_tokens += completion.usage.get("cached_tokens", 0)
+            self.completion_tokens += completion.usage.get("completion_tokens", 0)
+            self.latency_sum += completion.latency
+            self.latency_max = max(self.latency_max, completion.latency)
+            self._latencies.append(completion.latency)
+
+    def record_error(self, retries: int = 0):
+        with self._lock:
+            self.errors += 1
+            self.retries += retries
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            elapsed = time.monotonic() - self.started_at
+
+            def percentile(p: float) -> float:
+                if not latencies:
+                    return 0.0
+                return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "retries": self.retries,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "completion_tokens": self.completion_tokens,
+                "latency_avg": round(self.latency_sum / self.calls, 3) if self.calls else 0,
+                "latency_p50": round(percentile(0.5), 3),
+                "latency_p95": round(percentile(0.95), 3),
+                "latency_max": round(self.latency_max, 3),
+                "calls_per_minute": round(self.calls / elapsed * 60, 2) if elapsed > 0 else 0,
+                "completion_tokens_per_second": round(self.completion_tokens / elapsed, 2) if elapsed > 0 else 0
+            }
+
+
+class OpenAIBackend:
+    """OpenAI Chat Completions 백엔드"""
+
+    name = "openai"
+
+    def __init__(
+        self,
+        client=None,
+        api_key: str = None,
+        timeout: float = 60.0,
+        max_retries: int = 5,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 30.0,
+        pool_size: int = 16,
+        metrics: LLMMetrics = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            client: 기존 OpenAI 클라이언트 (주면 커넥션 풀을 공유하고 타임아웃만 덮어씀)
+            api_key: client가 없을 때 새 클라이언트에 사용할 키
+            timeout: 요청 1회 타임아웃 (초)
+            max_retries: 재시도 횟수 (SDK 자체 재시도는 끄고 여기서 일괄 처리)
+            retry_base_delay / retry_max_delay: 지수 백오프 기준/상한 (초)
+            pool_size: 새 클라이언트의 keep-alive 커넥션 수
+        """
+        if client is not None:
+            self.client = client.with_options(timeout=timeout, max_retries=0)
+        else:
+            self.client = OpenAI(
+                api_key=api_key or os.getenv("OPENAI_API_KEY"),
+                timeout=timeout,
+                max_retries=0,
+                http_client=httpx.Client(
+                    timeout=timeout,
+                    limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+                )
+            )
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.metrics = metrics or LLMMetrics()
+        self._sleep = sleep
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Retry-After 헤더가 있으면 그 값, 없으면 지수 백오프 + full jitter"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            if retry_after:
+                return min(float(retry_after), self.retry_max_delay)
+        except ValueError:
+            pass
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt)))
+
+    def with_retry(self, call):
+        """
+        레이트 리밋(429)/일시적 오류 시 max_retries회까지 재시도
+
+        Returns:
+            (call() 결과, 재시도 횟수)
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                return call(), attempt
+            except (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError) as e:
+                if attempt >= self.max_retries:
+                    self.metrics.record_error(attempt)
+                    raise
+                delay = self._retry_delay(e, attempt)
+                logger.warning(f"OpenAI 호출 재시도 {attempt + 1}/{self.max_retries} ({type(e).__name__}, {delay:.1f}초 후)")
+                self._sleep(delay)
+            except Exception:
+                self.metrics.record_error(attempt)
+                raise
+
+    def complete(self, messages: List[Dict], model: str, **params) -> Completion:
+        """Chat Completion 1회 (재시도 포함, params에 n을 주면 후보 n개를 한 번에 생성)"""
+        started_at = time.monotonic()
+        response, retries = self.with_retry(
+            lambda: self.client.chat.completions.create(messages=messages, model=model, **params)
+        )
+        texts = [(choice.message.content or "").strip() for choice in response.choices]
+        completion = Completion(
+            text=texts[0],
+            texts=texts,
+            usage=prompt_usage(response.usage),
+            latency=time.monotonic() - started_at,
+            model=model,
+            backend=self.name,
+            retries=retries
+        )
+        self.metrics.record(completion)
+        return completion
+
+    def stream(self, messages: List[Dict], model: str, usage_out: Dict = None, **params) -> Iterator[str]:
+        """
+        스트리밍 호출: 토큰 조각(delta)을 도착하는 대로 yield
+
+        연결 단계 오류만 재시도 (첫 토큰 이후 오류는 호출자에게 전달).
+        스트림이 끝나면 usage_out에 prompt_usage() 결과를 채웁니다.
+        """
+        started_at = time.monotonic()
+        stream, retries = self.with_retry(lambda: self.client.chat.completions.create(
+            messages=messages,
+            model=model,
+            stream=True,
+            stream_options={"include_usage": True},
+            **params
+        ))
+
+        usage = {}
+        parts = []
+        for chunk in stream:
+            if chunk.usage:
+                usage = prompt_usage(chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+
+        if usage_out is not None:
+            usage_out.update(usage)
+        self.metrics.record(Completion(
+            text="".join(parts), usage=usage, latency=time.monotonic() - started_at,
+            model=model, backend=self.name, retries=retries
+        ))
+
+    def embed(self, text: str, model: str) -> List[float]:
+        """임베딩 1건"""
+        response, _ = self.with_retry(lambda: self.client.embeddings.create(model=model, input=text))
+        return response.data[0].embedding
+
+
+def _estimate_tokens(text: str) -> int:
+    """토큰 수 근사 (한국어 약 1.5자/토큰, 영문 약 4자/토큰의 중간값)"""
+    return max(1, len(text) // 2)
+
+
+class TemplateBackend:
+    """
+    결정적 로컬 백엔드 (API 호출 없음)
+
+    render(messages, rng)가 응답 본문을 만듭니다. rng는 메시지 내용 해시로 시드한
+    random.Random이라 같은 요청에는 항상 같은 응답이 나옵니다.
+    latency를 주면 호출마다 그만큼 대기해 실제 API 지연을 흉내냅니다 (부하 테스트용).
+    """
+
+    name = "template"
+    client = None
+
+    def __init__(self, render: Callable[[List[Dict], random.Random], str], latency: float = 0.0,
+                 metrics: LLMMetrics = None, sleep: Callable[[float], None] = time.sleep):
+        self.render = render
+        self.latency = latency
+        self.metrics = metrics or LLMMetrics()
+        self._sleep = sleep
+
+    @staticmethod
+    def _seed(messages: List[Dict], model: str, params: Dict) -> int:
+        digest = hashlib.sha256()
+        for message in messages:
+            digest.update(f"{message['role']}\x00{message['content']}\x00".encode("utf-8"))
+        digest.update(f"{model}\x00{params.get('seed', '')}".encode("utf-8"))
+        return int.from_bytes(digest.digest()[:8], "big")
+
+    def complete(self, messages: List[Dict], model: str, **params) -> Completion:
+        started_at = time.monotonic()
+        if self.latency:
+            self._sleep(self.latency)
+        # 후보마다 시드를 달리해 n개 생성 (입력 토큰은 API처럼 1회분만 집계)
+        seed = self._seed(messages, model, params)
+        texts = [
+            self.render(messages, random.Random(seed + index)).strip()
+            for index in range(max(1, int(params.get("n") or 1)))
+        ]
+        prompt_tokens = sum(_estimate_tokens(message["content"]) for message in messages)
+        completion = Completion(
+            text=texts[0],
+            texts=texts,
+            usage={
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": 0,
+                "uncached_tokens": prompt_tokens,
+                "completion_tokens": sum(_estimate_tokens(text) for text in texts)
+            },
+            latency=time.monotonic() - started_at,
+            model=model,
+            backend=self.name
+        )
+        self.metrics.record(completion)
+        return completion
+
+    def stream(self, messages: List[Dict], model: str, usage_out: Dict = None, **params) -> Iterator[str]:
+        """complete() 결과를 어절 단위 조각으로 나눠 yield"""
+        completion = self.complete(messages, model, **params)
+        for index, piece in enumerate(completion.text.split(" ")):
+            yield piece if index == 0 else " " + piece
+        if usage_out is not None:
+            usage_out.update(completion.usage)
+
+    def embed(self, text: str, model: str, dimensions: int = 256) -> List[float]:
+        """문자 3-gram 해싱 임베딩 (정규화, 비슷한 문자열일수록 코사인 유사도가 높음)"""
+        vector = [0.0] * dimensions
+        padded = f"  {text.lower()}  "
+        for index in range(len(padded) - 2):
+            bucket = int.from_bytes(hashlib.md5(padded[index:index + 3].encode("utf-8")).digest()[:4], "big")
+            vector[bucket % dimensions] += 1.0
+        norm = sum(value * value for value in vector) ** 0.5 or 1.0
+        return [value / norm for value in vector]
+
+
+def create_backend(render: Callable = None, client=None, metrics: LLMMetrics = None):
+    """
+    환경 변수로 백엔드 생성
+
+    LLM_BACKEND: openai (기본) | template
+    LLM_TIMEOUT, LLM_POOL_SIZE, OPENAI_MAX_RETRIES, OPENAI_RETRY_BASE_DELAY, OPENAI_RETRY_MAX_DELAY,
+    LLM_TEMPLATE_LATENCY (template 백엔드의 호출당 대기 시간, 초)
+
+    Args:
+        render: template 백엔드의 응답 생성 함수
+        client: openai 백엔드가 공유할 기존 OpenAI 클라이언트 (선택)
+    """
+    backend_name = os.getenv("LLM_BACKEND", "openai")
+
+    if backend_name == "template":
+        if render is None:
+            raise ValueError("template 백엔드에는 render 함수가 필요합니다")
+        backend = TemplateBackend(render, latency=float(os.getenv("LLM_TEMPLATE_LATENCY", "0")), metrics=metrics)
+    elif backend_name == "openai":
+        backend = OpenAIBackend(
+            client=client,
+            timeout=float(os.getenv("LLM_TIMEOUT", "60")),
+            max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "5")),
+            retry_base_delay=float(os.getenv("OPENAI_RETRY_BASE_DELAY", "1.0")),
+            retry_max_delay=float(os.getenv("OPENAI_RETRY_MAX_DELAY", "30")),
+            pool_size=int(os.getenv("LLM_POOL_SIZE", "16")),
+            metrics=metrics
+        )
+    else:
+        raise ValueError(f"알 수 없는 LLM_BACKEND: {backend_name}")
+
+    logger.info(f"LLM 백엔드: {backend.name}")
+    return backend
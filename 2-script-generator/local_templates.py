@@ -0,0 +1,102 @@
+"""
+로컬 템플릿 스크립트 생성기 (LLM_BACKEND=template)
+- API 호출 없이 토픽을 끼워 넣은 Info 5단계 / Sales 4단계 스크립트를 생성
+- 문단별 문장 후보 중 rng로 선택 (같은 요청 → 같은 스크립트)
+- 부분 수정/구조 재정리 요청에도 같은 문단 후보로 응답하므로 검증·수정 루프까지 오프라인으로 동작
+"""
+
+import random
+import re
+from typing import Dict, List
+
+from prompts import SALES_SYSTEM_PROMPT
+
+INFO_SECTIONS = [
+    [
+        "{topic}, 이게 정말 가능할까요? 믿기 힘들지만 사실입니다.",
+        "방금 {topic} 소식에 업계가 발칵 뒤집혔습니다.",
+        "{topic}, 지금 모르면 3개월 뒤에 후회합니다."
+    ],
+    [
+        "실제로 이번 발표는 단순한 업데이트가 아닙니다. 지난 1년 동안 쌓인 기술이 한꺼번에 공개된 거죠. "
+        "전문가들은 스마트폰 이후 가장 큰 변화라고 말합니다.",
+        "배경을 보면 더 흥미롭습니다. 이미 전 세계 개발자 수백만 명이 비슷한 도구를 쓰고 있고, "
+        "기업들은 앞다투어 투자를 늘리고 있죠."
+    ],
+    [
+        "그런데 여기서 문제가 생깁니다. 기술이 빨라질수록 검증은 어려워지거든요. "
+        "잘못된 결과가 나오면 누가 책임질까요? 더 무서운 건, 대부분이 이 변화를 아직 모른다는 겁니다.",
+        "하지만 모든 게 장밋빛은 아닙니다. 비용은 예상보다 크고, 보안 문제도 아직 남아 있습니다. "
+        "실제로 도입했다가 되돌린 기업도 있죠. 결국 속도와 안전 사이의 선택입니다."
+    ],
+    [
+        "전문가들은 기술을 무조건 믿지도, 거부하지도 말라고 조언합니다. "
+        "먼저 도입한 팀들은 작은 업무부터 맡기고, 결과를 사람이 꼼꼼히 확인했습니다. "
+        "그 결과 업무 시간은 절반으로 줄고 실수도 줄었죠. 핵심은 도구를 이해하고 책임감 있게 쓰는 겁니다.",
+        "놀랍게도 해법은 단순합니다. 내 일에서 반복되는 부분만 새 기술에 맡겨 보는 거죠. "
+        "한 스타트업은 이렇게 시작해서 6개월 만에 생산성을 두 배로 올렸습니다. "
+        "작게 시작해서 꾸준히 배우는 사람이 결국 이깁니다."
+    ],
+    [
+        "여러분은 이 변화를 어떻게 보시나요? 댓글로 알려주세요! 구독하면 매일 최신 IT 소식을 받아보실 수 있습니다.",
+        "여러분이라면 바로 써 보시겠어요? 댓글로 알려주세요! 좋아요와 구독도 잊지 마세요."
+    ]
+]
+
+SALES_SECTIONS = [
+    [
+        "{topic} 같은 소식, 매번 따라가기 힘드시죠? 뉴스만 보다가 하루가 끝나지 않나요?",
+        "{topic}, 들어는 봤는데 설명하라면 막막하시죠? 그 마음 잘 압니다."
+    ],
+    [
+        "하루만 놓쳐도 동료들과의 대화에서 뒤처진 느낌이 듭니다. 회의 시간에 새로운 용어가 나오면 당황하게 되고, "
+        "주말에 몰아서 공부하려 해도 어디서부터 시작해야 할지 모르겠죠. 결국 영상만 틀어 놓고 정작 중요한 건 놓치게 됩니다. "
+        "이런 악순환이 반복되면서 점점 자신감도 떨어집니다.",
+        "새로운 기술은 매주 쏟아지는데, 정리된 자료는 찾기 어렵습니다. 검색하면 광고와 과장된 제목뿐이고, "
+        "겨우 찾은 글은 너무 어렵거나 이미 지난 이야기입니다. 바쁜 일상 속에서 공부할 시간은 점점 줄어들고, "
+        "모르는 게 쌓일수록 시작하기는 더 두려워지죠."
+    ],
+    [
+        "그런데 하루 10분으로 이 모든 걸 해결하는 방법이 있습니다. 매일 아침 출근길에 핵심만 정리된 요약을 받고, "
+        "점심시간에는 5분짜리 실전 예제로 바로 적용해 봅니다. 퇴근 후에는 오늘 배운 내용을 짧은 퀴즈로 복습해서 "
+        "확실하게 내 것으로 만들죠. 이 시스템은 내 학습 패턴을 분석해서 꼭 필요한 내용만 골라 추천해 줍니다. "
+        "그래서 시간 낭비 없이 꾸준히 성장할 수 있습니다.",
+        "이 방법의 핵심은 간단합니다. 전문가들이 매일 쏟아지는 소식 중 정말 중요한 것만 골라서, "
+        "누구나 이해할 수 있는 말로 풀어 줍니다. 어려운 개념은 그림과 예시로 설명하고, "
+        "실무에 바로 써먹을 수 있는 팁까지 함께 알려 줍니다. 하루 10분이면 충분하고, "
+        "한 달만 지나도 회의에서 먼저 이야기를 꺼내는 자신을 발견하게 될 겁니다."
+    ],
+    [
+        "지금 바로 고정 댓글에서 7일 무료 체험을 시작하세요. 이번 주에 시작하는 분께는 프리미엄 기능도 함께 열어 드립니다!",
+        "고정 댓글에서 무료 체험을 바로 시작해 보세요. 선착순 혜택은 이번 주까지만 드립니다!"
+    ]
+]
+
+_TOPIC = re.compile(r"^토픽:\s*(.+)$", re.MULTILINE)
+_REPAIR_TARGET = re.compile(r"^다시 쓸 문단:\s*(\d+)번째", re.MULTILINE)
+_DEFAULT_TOPIC = "이번 소식"
+
+
+def _compact_topic(topic: str, max_length: int = 16) -> str:
+    """제목이 길면 앞부분만 사용 (예상 길이가 범위를 넘지 않도록)"""
+    topic = " ".join(topic.split())
+    if len(topic) <= max_length:
+        return topic
+    return topic[:max_length].rsplit(" ", 1)[0] or topic[:max_length]
+
+
+def render(messages: List[Dict], rng: random.Random) -> str:
+    """TemplateBackend용 응답 생성 (모드는 시스템 프롬프트로 판별)"""
+    sections = SALES_SECTIONS if messages[0]["content"] == SALES_SYSTEM_PROMPT else INFO_SECTIONS
+    user_content = messages[-1]["content"]
+
+    topic_match = _TOPIC.search(user_content)
+    topic = _compact_topic(topic_match.group(1)) if topic_match else _DEFAULT_TOPIC
+
+    # 부분 수정 요청: 해당 문단 후보 하나만 반환
+    repair_match = _REPAIR_TARGET.search(user_content)
+    if repair_match:
+        index = min(int(repair_match.group(1)) - 1, len(sections) - 1)
+        return rng.choice(sections[index]).format(topic=topic)
+
+    return "\n\n".join(rng.choice(candidates).format(topic=topic) for candidates in sections)
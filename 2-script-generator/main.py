@@ -8,11 +8,28 @@ Phase 2: 스크립트 생성기
 """
 
 import os
+import json
+import time
 import random
 import logging
-from flask import Flask, request, jsonify
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from flask import Flask, Response, request, jsonify, stream_with_context
 from google.cloud import firestore
-from openai import OpenAI
+import local_templates
+from llm_backend import create_backend, prompt_usage
+from script_cache import ScriptCache
+from script_stream import SentenceStreamer
+from duration_model import DurationModel, script_bounds
+from script_stats import stats_increment, accumulate, summarize, day_key, recent_day_keys
+from topic_lease import TopicLeaser, clear_lease_fields
+from script_batches import TERMINAL_STATUSES, build_request_line, submit_batch, fetch_results
+from script_validator import SECTION_NAMES, ScriptValidator, first_sentence, join_sections, split_sections
+from prompts import (
+    PROMPT_VERSION, DEFAULT_PRODUCT_INFO, build_info_messages, build_sales_messages,
+    build_section_repair_messages, build_restructure_messages
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,155 +40,302 @@ app = Flask(__name__)
 GCP_PROJECT = os.getenv("GCP_PROJECT_ID")
 SALES_MODE_PROBABILITY = float(os.getenv("SALES_MODE_PROBABILITY", "0.25"))  # 기본 25%
 
+SCRIPT_BATCH_CONCURRENCY = int(os.getenv("SCRIPT_BATCH_CONCURRENCY", "4"))
+SCRIPT_BATCH_MAX_ITEMS = int(os.getenv("SCRIPT_BATCH_MAX_ITEMS", "100"))
+SCRIPT_BATCH_API_MAX_ITEMS = int(os.getenv("SCRIPT_BATCH_API_MAX_ITEMS", "1000"))
+
+# 스트리밍 모드에서 완성된 문단의 TTS를 미리 요청할 오디오 생성기 URL (선택)
+AUDIO_GENERATOR_URL = os.getenv("AUDIO_GENERATOR_URL")
+AUDIO_PREFETCH_CONCURRENCY = int(os.getenv("AUDIO_PREFETCH_CONCURRENCY", "4"))
+
+# 오디오 생성기의 TTS speaking_rate (발화 길이 추정에 사용)
+TTS_SPEAKING_RATE = float(os.getenv("TTS_SPEAKING_RATE", "1.05"))
+
+# 검증 실패 시 부분 수정 호출 최대 횟수 (스크립트당)
+SCRIPT_REPAIR_MAX_ATTEMPTS = int(os.getenv("SCRIPT_REPAIR_MAX_ATTEMPTS", "2"))
+
+# 한 번의 호출로 받을 후보 스크립트 수 (n>1이면 로컬 점수로 최선 1개 선택, 나머지는 alternates로 저장)
+SCRIPT_CANDIDATES = int(os.getenv("SCRIPT_CANDIDATES", "1"))
+SCRIPT_MAX_CANDIDATES = int(os.getenv("SCRIPT_MAX_CANDIDATES", "5"))
+
+# 스크립트 생성 요청 파라미터 (동기 호출/배치 API 요청 공통)
+CHAT_PARAMS = {
+    "model": os.getenv("SCRIPT_MODEL", "gpt-4o"),
+    "temperature": 0.85,
+    "max_tokens": 500
+}
+
+# Firestore WriteBatch 1회 최대 쓰기 수
+MAX_BATCH_WRITES = 500
+
+# 토픽 임대: 여러 인스턴스가 같은 토픽을 중복 생성하지 않도록 생성 전에 트랜잭션으로 선점
+TOPIC_LEASING = os.getenv("TOPIC_LEASING", "true") == "true"
+TOPIC_LEASE_SECONDS = float(os.getenv("TOPIC_LEASE_SECONDS", "300"))
+TOPIC_LEASE_MAX_CLAIMS = int(os.getenv("TOPIC_LEASE_MAX_CLAIMS", "3"))
+
+# 배치 결과 반영 임대: 겹쳐 실행된 /poll-batches가 같은 배치를 중복 저장하지 않도록 submitted → finishing 선점
+BATCH_FINISH_LEASE_SECONDS = float(os.getenv("BATCH_FINISH_LEASE_SECONDS", "600"))
+
+# 스크립트 1개 저장에 필요한 쓰기 수 (스크립트 + 토픽 상태 + 통계 2개)
+SCRIPT_ITEM_WRITES = 4
+
 # 클라이언트 초기화
+# LLM 백엔드: LLM_BACKEND=openai(기본, 재시도/타임아웃/커넥션 풀 포함) | template(오프라인 결정적 응답)
 db = firestore.Client(project=GCP_PROJECT)
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+llm = create_backend(render=local_templates.render)
+# Batch API/파일 업로드용 원본 클라이언트 (template 백엔드에서는 None)
+openai_client = llm.client
+
+# 발화 길이 모델 (3-audio-generator와 같은 모델/보정 계수 사용)
+duration_model = DurationModel(speaking_rate=TTS_SPEAKING_RATE).load(db.collection("config").document("duration_model"))
+# 구조/길이/금지 표현 검증 (제품명 + SCRIPT_FORBIDDEN_PHRASES 쉼표 구분 목록)
+script_validator = ScriptValidator(
+    duration_model,
+    *script_bounds(),
+    forbidden_phrases=[DEFAULT_PRODUCT_INFO["name"]] + [
+        phrase.strip() for phrase in os.getenv("SCRIPT_FORBIDDEN_PHRASES", "").split(",")
+    ],
+    section_tolerance=float(os.getenv("SCRIPT_SECTION_TOLERANCE", "0.5"))
+)
+leaser = TopicLeaser(db, lease_seconds=TOPIC_LEASE_SECONDS, max_claims=TOPIC_LEASE_MAX_CLAIMS)
+audio_session = requests.Session()
+audio_executor = ThreadPoolExecutor(max_workers=AUDIO_PREFETCH_CONCURRENCY)
+
+
+def embed_topic(text: str) -> list:
+    """유사 토픽 조회용 임베딩"""
+    return llm.embed(text, model=os.getenv("SCRIPT_CACHE_EMBEDDING_MODEL", "text-embedding-3-small"))
+
+
+# 스크립트 응답 캐시 (SCRIPT_CACHE_SIMILARITY > 0이면 임베딩 유사도 조회 사용)
+script_cache = ScriptCache(
+    prompt_version=PROMPT_VERSION,
+    max_entries=int(os.getenv("SCRIPT_CACHE_MAX_ENTRIES", 1000)),
+    ttl_seconds=float(os.getenv("SCRIPT_CACHE_TTL_HOURS", 168)) * 3600,
+    similarity_threshold=float(os.getenv("SCRIPT_CACHE_SIMILARITY", 0)),
+    embed=embed_topic,
+    collection=db.collection("script_cache") if os.getenv("SCRIPT_CACHE_FIRESTORE", "true") == "true" else None,
+    db=db,
+    prune_interval_seconds=float(os.getenv("SCRIPT_CACHE_PRUNE_INTERVAL_SECONDS", 3600))
+)
+
+
+def _chat_candidates(messages: list, n: int = 1) -> tuple:
+    """
+    스크립트 생성 모델 호출 (모든 스크립트 생성의 단일 호출 지점, 재시도는 백엔드에서 처리)
+    
+    n>1이면 같은 프롬프트로 후보 n개를 한 번의 요청으로 받습니다 (입력 토큰은 1회분).
+    
+    Returns:
+        (후보 본문 리스트, prompt_usage() 결과)
+    """
+    params = {**CHAT_PARAMS, "n": n} if n > 1 else CHAT_PARAMS
+    completion = llm.complete(messages, **params)
+    
+    usage = completion.usage
+    logger.info(
+        f"입력 토큰 {usage['prompt_tokens']}개 (캐시 {usage['cached_tokens']}개, "
+        f"비캐시 {usage['uncached_tokens']}개), 출력 토큰 {usage['completion_tokens']}개, "
+        f"후보 {len(completion.texts)}개, {completion.latency:.2f}초 [{completion.backend}]"
+    )
+    
+    return completion.texts, usage
 
 
-def generate_info_script(topic: str) -> dict:
+def _chat_completion(messages: list) -> tuple:
+    """
+    단일 응답 호출
+    
+    Returns:
+        (스크립트 본문, prompt_usage() 결과)
+    """
+    texts, usage = _chat_candidates(messages)
+    return texts[0], usage
+
+
+def _chat_completion_stream(messages: list, usage_out: dict):
+    """
+    스트리밍 호출: 토큰 조각(delta)을 도착하는 대로 yield
+    
+    스트림이 끝나면 usage_out에 prompt_usage() 결과를 채웁니다.
+    """
+    return llm.stream(messages, usage_out=usage_out, **CHAT_PARAMS)
+
+
+def merge_usage(total: dict, usage: dict) -> dict:
+    """prompt_usage() 결과 합산 (None은 0으로 간주)"""
+    if not total:
+        return dict(usage) if usage else total
+    if not usage:
+        return total
+    return {name: total.get(name, 0) + usage.get(name, 0) for name in set(total) | set(usage)}
+
+
+def _clean_section(text: str) -> str:
+    """수정 응답에서 따옴표를 벗기고 한 문단으로 합침 (빈 줄이 섞이면 섹션 수가 바뀜)"""
+    text = text.strip().strip('"\'“”‘’').strip()
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def repair_script(mode: str, script: str, usage: dict = None) -> tuple:
+    """
+    로컬 검증 → 실패한 문단만 모델에 수정 요청 → 재검증 (최대 SCRIPT_REPAIR_MAX_ATTEMPTS회)
+    
+    전체 재생성 대신 문제 문단 하나만 다시 쓰게 하므로 출력 토큰이 적고,
+    범위 밖 스크립트가 TTS/렌더링까지 넘어가는 것을 막습니다.
+    문단 수가 틀린 경우에만 전체 구조 재정리를 요청합니다.
+    
+    Returns:
+        (최종 스크립트, 수정 호출까지 합산한 usage, 검증 결과 dict)
+    """
+    report = script_validator.validate(script, mode)
+    repairs = []
+    
+    while not report.passed and len(repairs) < SCRIPT_REPAIR_MAX_ATTEMPTS:
+        target = script_validator.pick_repair(report, mode)
+        try:
+            if target["section"] is None:
+                messages = build_restructure_messages(mode, script, len(SECTION_NAMES[mode]), target["problems"])
+                candidate, repair_usage = _chat_completion(messages)
+            else:
+                index = target["section"]
+                messages = build_section_repair_messages(
+                    mode, join_sections(report.sections), index + 1, SECTION_NAMES[mode][index],
+                    target["problems"], script_validator.target_description(mode, index)
+                )
+                section, repair_usage = _chat_completion(messages)
+                sections = list(report.sections)
+                sections[index] = _clean_section(section)
+                candidate = join_sections(sections)
+        except Exception as e:
+            logger.warning(f"{mode.capitalize()} 스크립트 수정 호출 실패: {e}")
+            break
+        
+        usage = merge_usage(usage, repair_usage)
+        repairs.append({"section": target["section"], "problems": target["problems"]})
+        # 수정 결과가 더 나빠졌으면 버리고 이전 본문 유지 (예산은 소모)
+        candidate_report = script_validator.validate(candidate, mode)
+        if len(candidate_report.issues) <= len(report.issues):
+            script, report = candidate, candidate_report
+        logger.info(
+            f"{mode.capitalize()} 스크립트 수정 {len(repairs)}/{SCRIPT_REPAIR_MAX_ATTEMPTS} "
+            f"(문단 {target['section']}): {'통과' if report.passed else f'문제 {len(report.issues)}개 남음'}"
+        )
+    
+    if not report.passed:
+        logger.warning(f"{mode.capitalize()} 스크립트 검증 실패: {[issue['detail'] for issue in report.issues]}")
+    
+    return script, usage, {**report.to_dict(), "repairs": repairs}
+
+
+def build_script_result(mode: str, script: str, usage: dict = None, product_info: dict = None, validation: dict = None) -> dict:
+    """
+    생성된 본문으로 scripts 문서용 결과 구성 (동기/배치 API 공통)
+    
+    Args:
+        mode: "info" | "sales"
+        script: 생성된 스크립트 본문 (repair_script()를 거친 최종본)
+        usage: prompt_usage() 결과
+        product_info: Sales 모드 제품 정보 (없으면 기본값)
+        validation: repair_script()의 검증 결과
+    """
+    # Hook 추출 (첫 문장 - alternates와 같은 기준: ?/! 종결, 소수점 유지)
+    hook = first_sentence(script)
+    
+    # 발화 길이 검증 (음절/숫자 읽기/쉼 기반 추정, TTS 비용 발생 전에 범위 밖 스크립트 차단)
+    duration_status, estimated_duration = duration_model.check_bounds(script, *script_bounds())
+    if duration_status != "ok":
+        logger.warning(f"{mode.capitalize()} 스크립트 길이 범위 밖 ({duration_status}, 예상 {estimated_duration:.1f}초, {len(script)}자)")
+    
+    result = {
+        "script": script,
+        "mode": mode,
+        "hook": hook,
+        "word_count": len(script),
+        "estimated_duration": round(estimated_duration, 1),
+        "duration_status": duration_status,
+        "prompt_version": PROMPT_VERSION,
+        "usage": usage
+    }
+    if validation is not None:
+        result["validation"] = validation
+    if mode == "sales":
+        result["product"] = (product_info or DEFAULT_PRODUCT_INFO)['name']
+    return result
+
+
+def build_messages(mode: str, topic: str) -> list:
+    """모드별 요청 메시지"""
+    if mode == "sales":
+        return build_sales_messages(topic, DEFAULT_PRODUCT_INFO)
+    return build_info_messages(topic)
+
+
+def candidate_count(value=None) -> int:
+    """요청/환경 변수의 후보 수 (1 ~ SCRIPT_MAX_CANDIDATES)"""
+    return max(1, min(int(value or SCRIPT_CANDIDATES), SCRIPT_MAX_CANDIDATES))
+
+
+def finalize_script(mode: str, candidates: list, usage: dict = None, product_info: dict = None, repair: bool = True) -> dict:
+    """
+    후보 중 최선 선택 → 검증/부분 수정 → 결과 구성 (동기/배치 API 공통)
+    
+    후보가 여러 개면 Hook 강도/길이 적합도/구조 완결성 점수로 1개를 고르고,
+    나머지는 점수와 함께 alternates에 남겨 재생성 없이 교체할 수 있게 합니다.
+    repair=False면 검증만 하고 수정 호출은 하지 않습니다 (실패 시 needs_revision으로 저장).
+    """
+    candidates = [candidate.strip() for candidate in candidates if candidate and candidate.strip()]
+    if not candidates:
+        raise ValueError("생성된 스크립트가 없습니다")
+    
+    ranking = script_validator.rank(mode, candidates) if len(candidates) > 1 else [{"index": 0}]
+    best = ranking[0]
+    if len(candidates) > 1:
+        logger.info(f"{mode.capitalize()} 후보 {len(candidates)}개 중 {best['index']}번 선택 (점수 {[item['score'] for item in ranking]})")
+    
+    if repair:
+        script, usage, validation = repair_script(mode, candidates[best["index"]], usage)
+    else:
+        script = candidates[best["index"]]
+        validation = {**script_validator.validate(script, mode).to_dict(), "repairs": []}
+    result = build_script_result(mode, script, usage, product_info, validation)
+    
+    if len(candidates) > 1:
+        result["candidate_score"] = best
+        result["alternates"] = [
+            {
+                "script": candidates[item["index"]],
+                "hook": first_sentence(candidates[item["index"]]),
+                "score": item
+            }
+            for item in ranking[1:]
+        ]
+    return result
+
+
+def generate_info_script(topic: str, candidates: int = None) -> dict:
     """
     Info 모드: 스토리텔링 기반 몰입형 스크립트 생성 ⭐ 대폭 개선
     
     Args:
         topic: 뉴스 토픽 제목
+        candidates: 한 번에 생성할 후보 수 (기본 SCRIPT_CANDIDATES)
         
     Returns:
-        {"script": str, "mode": "info", "hook": str}
+        {"script": str, "mode": "info", "hook": str, "alternates": [...] (후보가 여러 개일 때)}
     """
     try:
         logger.info(f"Info 모드 스크립트 생성: {topic}")
         
-        response = openai_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a viral short-form video script writer for IT/Tech news. "
-                        "Create HIGHLY ENGAGING 50-60 second scripts in Korean that capture "
-                        "viewers' attention from start to finish.\n\n"
-                        
-                        "📖 STORYTELLING STRUCTURE (몰입형 구조):\n\n"
-                        
-                        "1. Hook - 충격적 질문/사실 (3-5초, 1-2문장):\n"
-                        "   - 시청자의 기존 상식을 뒤집는 충격적인 사실\n"
-                        "   - 또는 강렬한 질문으로 호기심 자극\n"
-                        "   - 예시:\n"
-                        "     ❌ '오늘은 AI 뉴스를 알려드릴게요' (지루함)\n"
-                        "     ✅ '이 AI가 방금 의사 시험에서 인간을 이겼습니다' (충격)\n"
-                        "     ✅ '당신이 지금 보는 영상, 실은 AI가 만든 거라면?' (호기심)\n\n"
-                        
-                        "2. Context Setup - 배경 설명 (8-12초, 2-3문장):\n"
-                        "   - 왜 이게 중요한지, 어떤 배경이 있는지 설명\n"
-                        "   - 시청자가 이해할 수 있도록 쉽게 풀어서\n"
-                        "   - 구체적인 숫자, 사실, 비유 활용\n"
-                        "   - 예시:\n"
-                        "     '실제로 구글이 개발한 Med-PaLM 2는\n"
-                        "      미국 의사 면허 시험에서 85% 이상의 정확도를 기록했습니다.\n"
-                        "      이건 평균적인 의대생보다 높은 점수죠.'\n\n"
-                        
-                        "3. Conflict/Problem - 갈등/문제 제기 (10-15초, 3-4문장):\n"
-                        "   - 이 기술/뉴스가 가져올 변화나 논란\n"
-                        "   - '그런데', '하지만', '문제는' 같은 전환어 사용\n"
-                        "   - 양면성이나 딜레마 제시로 긴장감 조성\n"
-                        "   - 예시:\n"
-                        "     '그런데 여기서 문제가 생깁니다.\n"
-                        "      AI가 진단을 내리면, 잘못됐을 때 누가 책임질까요?\n"
-                        "      의사? 개발자? 아니면 병원?\n"
-                        "      더 무서운 건, AI가 편향된 데이터로 학습하면\n"
-                        "      특정 인종이나 성별에게 잘못된 진단을 내릴 수도 있다는 거죠.'\n\n"
-                        
-                        "4. Resolution/Insight - 해결책/통찰 (15-20초, 4-5문장):\n"
-                        "   - 전문가 의견, 실제 사례, 미래 전망 제시\n"
-                        "   - 긍정적 가능성과 주의할 점 균형있게\n"
-                        "   - 시청자에게 생각할 거리 제공\n"
-                        "   - 예시:\n"
-                        "     '전문가들은 이렇게 말합니다.\n"
-                        "      AI는 의사를 대체하는 게 아니라 보조하는 도구가 될 거라고요.\n"
-                        "      실제로 한국의 한 대학병원에서는\n"
-                        "      AI가 의사가 놓친 암 초기 증상을 발견해 환자를 살린 사례도 있습니다.\n"
-                        "      핵심은 AI를 어떻게 책임감 있게 활용하느냐죠.'\n\n"
-                        
-                        "5. Call-to-Action - 마무리 (5-7초, 2-3문장):\n"
-                        "   - 시청자의 다음 행동 유도\n"
-                        "   - 구독, 좋아요, 댓글 요청\n"
-                        "   - 열린 질문으로 참여 유도\n"
-                        "   - 예시:\n"
-                        "     '여러분은 AI 의사에게 진료 받으실 건가요?\n"
-                        "      댓글로 의견 남겨주세요!\n"
-                        "      구독하시면 최신 IT 트렌드를 매일 받아보실 수 있습니다!'\n\n"
-                        
-                        "🎯 ENGAGEMENT TECHNIQUES (몰입 기법):\n"
-                        "- ✅ 구체적인 숫자와 사실 사용 (예: '85% 정확도', '3초 만에')\n"
-                        "- ✅ 생생한 비유와 예시 (예: '스마트폰 100만 대를 동시에 켠 것과 같은 전력')\n"
-                        "- ✅ 질문 던지기 (예: '그렇다면 우리는 어떻게 해야 할까요?')\n"
-                        "- ✅ '그런데', '하지만', '더 놀라운 건' 같은 전환어로 긴장감 유지\n"
-                        "- ✅ '실제로', '놀랍게도', '믿기 힘들지만' 같은 강조어 사용\n"
-                        "- ✅ 시청자에게 직접 말 걸기 (예: '여러분은 어떻게 생각하시나요?')\n\n"
-                        
-                        "❌ AVOID (피해야 할 것):\n"
-                        "- ❌ 평범한 시작 ('오늘은 ~에 대해 알려드릴게요')\n"
-                        "- ❌ 단순 나열식 정보 전달\n"
-                        "- ❌ 전문 용어 남발 (쉽게 풀어서 설명)\n"
-                        "- ❌ 지루한 통계 나열 (스토리에 녹여서)\n"
-                        "- ❌ 일방적 주장 (양면성 제시)\n\n"
-                        
-                        "📏 FORMAT:\n"
-                        "- Style: 대화체, 존댓말, 친근하면서도 전문적\n"
-                        "- Tone: 열정적이고 호기심 넘치는\n"
-                        "- Emojis: 1-2개만 자연스럽게 (과도하지 않게)\n"
-                        "- Target length: 50-60 seconds spoken (280-350 characters Korean)\n"
-                        "- Pacing: 빠르게 진행되지만 이해하기 쉽게\n\n"
-                        
-                        "🎬 VIRAL ELEMENTS:\n"
-                        "- Hook에서 3초 안에 주목도 확보\n"
-                        "- Conflict로 중간 이탈 방지\n"
-                        "- Resolution으로 만족도 제공\n"
-                        "- CTA로 구독/좋아요 유도\n"
-                    )
-                },
-                {
-                    "role": "user",
-                    "content": (
-                        f"토픽: {topic}\n\n"
-                        "위의 5단계 스토리텔링 구조를 정확히 따라서\n"
-                        "시청자가 끝까지 몰입해서 볼 수 있는\n"
-                        "바이럴 숏폼 스크립트를 한국어로 작성해주세요.\n\n"
-                        "⚠️ 중요:\n"
-                        "- Hook은 반드시 충격적이거나 호기심 자극적이어야 함\n"
-                        "- Conflict에서 긴장감 조성 필수\n"
-                        "- 구체적인 숫자, 사례, 비유 풍부하게 사용\n"
-                        "- 시청자에게 직접 말 걸듯이 작성"
-                    )
-                }
-            ],
-            temperature=0.85,
-            max_tokens=500
-        )
-        
-        script = response.choices[0].message.content.strip()
-        
-        # Hook 추출 (첫 문장)
-        hook = script.split('.')[0] + '.'
-        
-        # 스크립트 길이 검증
-        if len(script) < 250:
-            logger.warning(f"Info 스크립트가 너무 짧음 ({len(script)}자). 최소 250자 권장.")
-        
-        return {
-            "script": script,
-            "mode": "info",
-            "hook": hook,
-            "word_count": len(script),
-            "estimated_duration": len(script) * 0.15  # 한글 1자당 약 0.15초
-        }
+        texts, usage = _chat_candidates(build_info_messages(topic), candidate_count(candidates))
+        return finalize_script("info", texts, usage)
         
     except Exception as e:
         logger.error(f"Info 스크립트 생성 실패: {e}")
         raise
 
 
-def generate_sales_script(topic: str, product_info: dict = None) -> dict:
+def generate_sales_script(topic: str, product_info: dict = None, candidates: int = None) -> dict:
     """
     Sales 모드: 제품 광고 스크립트 생성 (Jab, Jab, Jab, Right Hook)
     Agitation + Solution Tease 대폭 확장
@@ -182,6 +346,7 @@ def generate_sales_script(topic: str, product_info: dict = None) -> dict:
             - name: 제품 이름
             - benefit: 핵심 혜택
             - cta: Call-to-action 문구
+        candidates: 한 번에 생성할 후보 수 (기본 SCRIPT_CANDIDATES)
         
     Returns:
         {"script": str, "mode": "sales", "hook": str, "product": str}
@@ -191,105 +356,66 @@ def generate_sales_script(topic: str, product_info: dict = None) -> dict:
         
         # 기본 제품 정보 (환경 변수에서 가져올 수도 있음)
         if not product_info:
-            product_info = {
-                "name": "IT 학습 솔루션",  # 예시
-                "benefit": "하루 10분으로 최신 IT 트렌드를 완벽하게 이해하고 실무에 바로 적용",
-                "cta": "지금 바로 고정 댓글에서 무료 체험판 받아가세요"
-            }
-        
-        response = openai_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a conversion-focused sales script writer for IT/Tech products. "
-                        "Create a 50-60 second script in Korean with the following EXPANDED structure:\n\n"
-                        
-                        "1. Problem Hook (3-5초, 1-2문장):\n"
-                        "   - 시청자의 현실적인 고민/문제를 구체적으로 제기\n"
-                        "   - 예: 'IT 트렌드를 따라가기 힘드시죠? 매일 쏟아지는 뉴스에 압도당하고 계신가요?'\n\n"
-                        
-                        "2. Agitation (15-20초, 4-6문장) ⭐ 대폭 확장:\n"
-                        "   - 문제의 심각성을 구체적인 예시와 함께 깊이 있게 설명\n"
-                        "   - 시청자가 겪는 실제 상황을 디테일하게 묘사\n"
-                        "   - 예시:\n"
-                        "     '하루만 놓쳐도 동료들과의 대화에서 뒤처진 느낌...\n"
-                        "      회의 시간에 최신 기술 용어가 나오면 당황하게 되고,\n"
-                        "      주말에 몰아서 공부하려 해도 어디서부터 시작해야 할지 막막합니다.\n"
-                        "      결국 YouTube만 띄워놓고 정작 중요한 건 놓치게 되죠.\n"
-                        "      이런 악순환이 반복되면서 점점 자신감도 떨어집니다.'\n\n"
-                        
-                        "3. Solution Tease (20-25초, 5-7문장) ⭐ 대폭 확장:\n"
-                        "   - 해결책의 구체적인 메커니즘과 작동 방식 설명\n"
-                        "   - 왜 이 방법이 효과적인지 논리적으로 제시\n"
-                        "   - 실제 사용 시나리오와 결과를 생생하게 묘사\n"
-                        "   - 예시:\n"
-                        "     '그런데 하루 10분으로 이 모든 걸 해결하는 방법이 있습니다.\n"
-                        "      매일 아침 출근길에 핵심만 쏙쏙 정리된 큐레이션을 받고,\n"
-                        "      점심시간에는 5분짜리 실전 예제로 바로 적용해보고,\n"
-                        "      퇴근 후에는 오늘 배운 내용을 복습 퀴즈로 확실하게 내 것으로 만듭니다.\n"
-                        "      AI가 자동으로 내 학습 패턴을 분석해서\n"
-                        "      꼭 필요한 내용만 딱 맞춰 추천해주기 때문에\n"
-                        "      시간 낭비 없이 효율적으로 성장할 수 있습니다.'\n\n"
-                        
-                        "4. CTA (5-7초, 2-3문장):\n"
-                        "   - 구체적인 혜택과 함께 명확한 행동 유도\n"
-                        "   - 긴급성과 희소성 강조\n"
-                        "   - 예: '지금 바로 고정 댓글에서 7일 무료 체험을 시작하세요.\n"
-                        "           선착순 100명에게만 프리미엄 기능도 무료로 드립니다!'\n\n"
-                        
-                        "CRITICAL RULES:\n"
-                        "- 제품 이름을 직접 언급하지 말 것 (플랫폼 정책)\n"
-                        "- '이 방법', '이 시스템', '이 플랫폼' 같은 간접 표현 사용\n"
-                        "- 구체적인 가격이나 링크는 넣지 말 것\n"
-                        "- Agitation과 Solution은 각각 최소 4-6문장씩 작성\n"
-                        "- 자연스럽게 정보 제공하는 것처럼 보이되, 설득력 있게\n"
-                        "- 실제 사용 시나리오를 구체적으로 묘사\n\n"
-                        
-                        "Tone: 친근하고 도움이 되는 느낌, 존댓말 사용\n"
-                        "Total length: 50-60 seconds when spoken (280-350 characters in Korean)"
-                    )
-                },
-                {
-                    "role": "user",
-                    "content": (
-                        f"토픽: {topic}\n"
-                        f"제품 혜택: {product_info['benefit']}\n"
-                        f"CTA: {product_info['cta']}\n\n"
-                        "Sales 스크립트를 한국어로 작성해주세요.\n"
-                        "⚠️ 중요: Agitation과 Solution Tease를 각각 4-6문장씩 풍부하게 작성하여\n"
-                        "시청자가 충분히 납득하고 신뢰할 수 있도록 해주세요."
-                    )
-                }
-            ],
-            temperature=0.85,
-            max_tokens=500
-        )
-        
-        script = response.choices[0].message.content.strip()
+            product_info = DEFAULT_PRODUCT_INFO
         
-        # Hook 추출
-        hook = script.split('.')[0] + '.'
-        
-        # 스크립트 길이 검증
-        if len(script) < 250:
-            logger.warning(f"Sales 스크립트가 너무 짧음 ({len(script)}자). 최소 250자 권장.")
-        
-        return {
-            "script": script,
-            "mode": "sales",
-            "hook": hook,
-            "product": product_info['name'],
-            "word_count": len(script),
-            "estimated_duration": len(script) * 0.15  # 한글 1자당 약 0.15초
-        }
+        texts, usage = _chat_candidates(build_sales_messages(topic, product_info), candidate_count(candidates))
+        return finalize_script("sales", texts, usage, product_info)
         
     except Exception as e:
         logger.error(f"Sales 스크립트 생성 실패: {e}")
         raise
 
 
+def choose_mode(force_mode: str = None) -> str:
+    """모드 결정 ⭐ Jab, Jab, Jab, Right Hook 전략"""
+    if force_mode:
+        logger.info(f"강제 모드: {force_mode}")
+        return force_mode
+    
+    # 20~30% 확률로 Sales 모드
+    random_value = random.random()
+    mode = "sales" if random_value < SALES_MODE_PROBABILITY else "info"
+    logger.info(f"자동 모드 선택: {mode} (확률: {random_value:.2f})")
+    return mode
+
+
+def passed_validation(result: dict) -> bool:
+    """길이 범위 + 로컬 검증 통과 여부 (검증 도입 전 결과는 길이만 확인)"""
+    return result.get("duration_status", "ok") == "ok" and (result.get("validation") or {}).get("passed", True)
+
+
+def cache_if_valid(mode: str, topic: str, result: dict):
+    """검증을 통과한 스크립트만 캐시 (실패본이 재사용되지 않도록)"""
+    if passed_validation(result):
+        script_cache.put(mode, topic, result)
+
+
+def generate_for_mode(mode: str, topic: str, force_regenerate: bool = False, candidates: int = None) -> dict:
+    """
+    모드별 스크립트 생성 (스크립트 캐시 우선)
+    
+    Args:
+        mode: "info" | "sales"
+        topic: 토픽 제목
+        force_regenerate: True면 캐시를 건너뛰고 새로 생성 (결과는 캐시에 덮어씀)
+        candidates: 한 번에 생성할 후보 수 (기본 SCRIPT_CANDIDATES)
+    """
+    if not force_regenerate:
+        cached = script_cache.get(mode, topic)
+        if cached:
+            logger.info(f"스크립트 캐시 적중 [{mode}]: {topic}")
+            # 토큰을 쓰지 않았으므로 usage는 비워서 통계 중복 집계 방지
+            return {**cached, "usage": None, "cache_hit": True}
+    
+    if mode == "sales":
+        result = generate_sales_script(topic, candidates=candidates)
+    else:
+        result = generate_info_script(topic, candidates=candidates)
+    
+    cache_if_valid(mode, topic, result)
+    return {**result, "cache_hit": False}
+
+
 @app.route('/generate-script', methods=['POST'])
 def generate_script():
     """
@@ -298,56 +424,41 @@ def generate_script():
     Request Body:
     {
         "topic_id": "Firestore trending_topics 문서 ID",
-        "force_mode": "info" | "sales" (선택, 강제 모드 지정)
+        "force_mode": "info" | "sales" (선택, 강제 모드 지정),
+        "force_regenerate": true (선택, 스크립트 캐시 무시하고 새로 생성),
+        "candidates": 3 (선택, 한 번의 호출로 후보 n개 생성 후 최선 선택)
     }
     """
     try:
         data = request.get_json()
         topic_id = data.get("topic_id")
         force_mode = data.get("force_mode")  # 테스트용
+        force_regenerate = bool(data.get("force_regenerate"))
+        candidates = data.get("candidates")
         
         if not topic_id:
             return jsonify({"error": "topic_id가 필요합니다"}), 400
         
-        # Firestore에서 토픽 정보 가져오기
-        topic_ref = db.collection("trending_topics").document(topic_id)
-        topic_doc = topic_ref.get()
-        
-        if not topic_doc.exists:
-            return jsonify({"error": "토픽을 찾을 수 없습니다"}), 404
+        # Firestore에서 토픽 정보 가져오기 (TOPIC_LEASING이면 임대까지)
+        topic_data, error_response = claim_topic(topic_id, force_regenerate)
+        if error_response:
+            return error_response
         
-        topic_data = topic_doc.to_dict()
         topic_title = topic_data.get("title")
         
-        # 모드 결정 ⭐ Jab, Jab, Jab, Right Hook 전략
-        if force_mode:
-            mode = force_mode
-            logger.info(f"강제 모드: {mode}")
-        else:
-            # 20~30% 확률로 Sales 모드
-            random_value = random.random()
-            mode = "sales" if random_value < SALES_MODE_PROBABILITY else "info"
-            logger.info(f"자동 모드 선택: {mode} (확률: {random_value:.2f})")
-        
-        # 스크립트 생성
-        if mode == "sales":
-            result = generate_sales_script(topic_title)
-        else:
-            result = generate_info_script(topic_title)
-        
-        # Firestore에 저장
-        script_ref = db.collection("scripts").add({
-            **result,
-            "topic_id": topic_id,
-            "topic_title": topic_title,
-            "status": "pending_audio",
-            "created_at": firestore.SERVER_TIMESTAMP
-        })
+        mode = choose_mode(force_mode)
         
-        script_id = script_ref[1].id
+        # 스크립트 생성 (캐시 적중 시 OpenAI 호출 생략)
+        try:
+            result = generate_for_mode(mode, topic_title, force_regenerate, candidates)
+        except Exception as e:
+            release_topic(topic_id, str(e))
+            raise
         
-        # 토픽 상태 업데이트
-        topic_ref.update({"status": "script_generated"})
+        # Firestore에 저장 (스크립트 + 토픽 상태 + 통계 집계를 한 번에 커밋)
+        script_id = save_script(result, topic_id, topic_title)
+        if script_id is None:
+            return jsonify({"error": "임대가 만료되어 다른 인스턴스가 처리 중입니다 (결과 저장 안 함)"}), 409
         
         logger.info(f"스크립트 생성 완료 [{mode}]: {script_id} ({result.get('word_count')}자, {result.get('estimated_duration', 0):.1f}초)")
         
@@ -358,7 +469,13 @@ def generate_script():
             "script": result["script"],
             "hook": result["hook"],
             "word_count": result.get("word_count"),
-            "estimated_duration": result.get("estimated_duration", 0)
+            "estimated_duration": result.get("estimated_duration", 0),
+            "duration_status": result.get("duration_status"),
+            "validation": result.get("validation"),
+            "candidate_score": result.get("candidate_score"),
+            "alternates": len(result.get("alternates") or []),
+            "usage": result.get("usage"),
+            "cache_hit": result.get("cache_hit", False)
         }), 200
         
     except Exception as e:
@@ -366,56 +483,749 @@ def generate_script():
         return jsonify({"error": str(e)}), 500
 
 
-@app.route('/stats', methods=['GET'])
-def get_stats():
+def claim_topic(topic_id: str, force_regenerate: bool = False) -> tuple:
     """
-    스크립트 생성 통계
+    단일 토픽 조회 (TOPIC_LEASING이면 임대까지)
+    
+    force_regenerate면 이미 생성된 토픽도 다시 임대할 수 있습니다 (활성 임대 중인 토픽은 불가).
     
     Returns:
-        Info vs Sales 모드 비율, 평균 길이 등
+        (토픽 데이터, None) 또는 (None, (오류 응답, 상태 코드))
     """
-    try:
-        scripts = db.collection("scripts").stream()
-        
-        stats = {
-            "total": 0,
-            "info": 0,
-            "sales": 0,
-            "avg_length_info": 0,
-            "avg_length_sales": 0,
-            "avg_duration_info": 0,
-            "avg_duration_sales": 0
-        }
-        
-        info_lengths = []
-        sales_lengths = []
-        info_durations = []
-        sales_durations = []
-        
-        for script in scripts:
-            data = script.to_dict()
-            stats["total"] += 1
-            mode = data.get("mode", "info")
-            stats[mode] += 1
+    if TOPIC_LEASING:
+        topic_data = leaser.claim(topic_id, any_status=force_regenerate)
+        if topic_data is not None:
+            return topic_data, None
+    
+    topic_doc = db.collection("trending_topics").document(topic_id).get()
+    if not topic_doc.exists:
+        return None, (jsonify({"error": "토픽을 찾을 수 없습니다"}), 404)
+    if not TOPIC_LEASING:
+        return topic_doc.to_dict(), None
+    
+    return None, (jsonify({
+        "error": "다른 인스턴스가 처리 중이거나 생성 대상 상태가 아닙니다",
+        "status": topic_doc.to_dict().get("status")
+    }), 409)
+
+
+def release_topic(topic_id: str, error: str = None):
+    """생성 실패 시 임대 반납 (다음 요청/인스턴스가 바로 다시 가져갈 수 있도록)"""
+    if TOPIC_LEASING:
+        leaser.release(topic_id, error=error)
+
+
+def save_script(result: dict, topic_id: str, topic_title: str):
+    """
+    스크립트 1개 저장 (스크립트 + 토픽 상태 + 통계)
+    
+    Returns:
+        script_id (임대를 잃었으면 저장하지 않고 None)
+    """
+    script_ref = db.collection("scripts").document()
+    group = script_item_writes(script_ref, result, topic_id, topic_title)
+    
+    if TOPIC_LEASING:
+        owned, _ = leaser.commit_if_owned({topic_id: group}, apply_writes)
+        return script_ref.id if owned else None
+    
+    commit_writes([group])
+    return script_ref.id
+
+
+def script_document(result: dict, topic_id: str, topic_title: str) -> dict:
+    """scripts 문서 내용 (길이/구조/금지 표현 검증 실패 시 TTS로 넘기지 않고 needs_revision)"""
+    return {
+        **result,
+        "topic_id": topic_id,
+        "topic_title": topic_title,
+        "status": "pending_audio" if passed_validation(result) else "needs_revision",
+        "created_at": firestore.SERVER_TIMESTAMP
+    }
+
+
+def apply_writes(target, group: list):
+    """쓰기 묶음을 WriteBatch 또는 Transaction에 추가"""
+    for op, ref, data in group:
+        if op == "set":
+            target.set(ref, data)
+        elif op == "merge":
+            target.set(ref, data, merge=True)
+        else:
+            target.update(ref, data)
+
+
+def commit_writes(writes: list) -> int:
+    """
+    쓰기 목록을 WriteBatch로 커밋 (MAX_BATCH_WRITES개 단위)
+    
+    Args:
+        writes: (op, 문서 참조, 데이터) 또는 그 리스트(같은 배치에 넣어야 하는 묶음).
+                op는 "set" | "merge" | "update"
+    
+    Returns:
+        커밋 횟수
+    """
+    commits = 0
+    batch = None
+    buffered = 0
+    
+    for group in writes:
+        group = group if isinstance(group, list) else [group]
+        if batch is not None and buffered + len(group) > MAX_BATCH_WRITES:
+            batch.commit()
+            commits += 1
+            batch = None
+        
+        if batch is None:
+            batch = db.batch()
+            buffered = 0
+        
+        apply_writes(batch, group)
+        buffered += len(group)
+    
+    if batch is not None and buffered:
+        batch.commit()
+        commits += 1
+    
+    return commits
+
+
+def stats_writes(result: dict) -> list:
+    """통계 집계 문서(전체 + 오늘 롤업) Increment 쓰기"""
+    increment = stats_increment(result)
+    stats_ref = db.collection("stats").document("scripts")
+    today = day_key()
+    return [
+        ("merge", stats_ref, {**increment, "updated_at": firestore.SERVER_TIMESTAMP}),
+        ("merge", stats_ref.collection("daily").document(today), {**increment, "date": today})
+    ]
+
+
+def script_item_writes(script_ref, result: dict, topic_id: str, topic_title: str) -> list:
+    """스크립트 1개 저장에 필요한 쓰기 묶음 (스크립트 + 토픽 상태 + 통계, 한 배치로 커밋)"""
+    return [
+        ("set", script_ref, script_document(result, topic_id, topic_title)),
+        ("update", db.collection("trending_topics").document(topic_id), {"status": "script_generated", **clear_lease_fields()}),
+        *stats_writes(result)
+    ]
+
+
+def script_writes(items: list, batch_id: str = None) -> list:
+    """
+    성공한 항목별 쓰기 묶음, 항목에 script_id 기록
+    
+    Args:
+        batch_id: Batch API 결과면 문서 ID를 {batch_id}_{topic_id}로 고정 (중단 후 다시 반영해도 덮어쓰기)
+    """
+    writes = []
+    for item in items:
+        script_ref = db.collection("scripts").document(f"{batch_id}_{item['topic_id']}" if batch_id else None)
+        writes.append(script_item_writes(script_ref, item["result"], item["topic_id"], item["topic_title"]))
+        item["script_id"] = script_ref.id
+    return writes
+
+
+def write_scripts_batch(items: list) -> int:
+    """
+    성공한 항목을 WriteBatch로 저장 (항목당 쓰기 4회)
+    
+    Returns:
+        커밋 횟수
+    """
+    return commit_writes(script_writes(items))
+
+
+def write_claimed_scripts(items: list) -> tuple:
+    """
+    임대한 토픽들의 결과 저장 (트랜잭션마다 소유권 확인, TOPIC_LEASING이 꺼져 있으면 write_scripts_batch)
+    
+    Returns:
+        (커밋 횟수, 임대를 잃어 저장하지 않은 토픽 ID 집합)
+    """
+    if not TOPIC_LEASING:
+        return write_scripts_batch(items), set()
+    
+    groups = {}
+    for item in items:
+        script_ref = db.collection("scripts").document()
+        groups[item["topic_id"]] = script_item_writes(script_ref, item["result"], item["topic_id"], item["topic_title"])
+        item["script_id"] = script_ref.id
+    
+    commits = 0
+    lost = set()
+    topic_ids = list(groups)
+    chunk_size = MAX_BATCH_WRITES // SCRIPT_ITEM_WRITES
+    for start in range(0, len(topic_ids), chunk_size):
+        chunk = topic_ids[start:start + chunk_size]
+        _, lost_ids = leaser.commit_if_owned({topic_id: groups[topic_id] for topic_id in chunk}, apply_writes)
+        lost.update(lost_ids)
+        commits += 1
+    
+    for item in items:
+        if item["topic_id"] in lost:
+            item.pop("script_id", None)
+    return commits, lost
+
+
+def load_topics(data: dict, max_items: int, any_status: bool = False):
+    """
+    요청 본문의 topic_ids 또는 status로 생성 대상 토픽 조회 (TOPIC_LEASING이면 임대까지)
+    
+    Returns:
+        [(토픽 ID, 토픽 데이터)] 리스트 - 데이터가 None이면 없는 토픽이거나 다른 인스턴스가 임대 중.
+        topic_ids/status가 둘 다 없으면 None
+    """
+    if not TOPIC_LEASING:
+        docs = load_topic_docs(data, max_items)
+        return None if docs is None else [(doc.id, doc.to_dict() if doc.exists else None) for doc in docs]
+    
+    if data.get("topic_ids"):
+        topic_ids = data["topic_ids"][:max_items]
+        claimed = dict(leaser.claim_many(topic_ids, any_status))
+        return [(topic_id, claimed.get(topic_id)) for topic_id in topic_ids]
+    
+    if data.get("status"):
+        limit = min(int(data.get("limit") or max_items), max_items)
+        return leaser.claim_pending(limit, data["status"])
+    
+    return None
+
+
+def load_topic_docs(data: dict, max_items: int):
+    """
+    요청 본문의 topic_ids(get_all 한 번) 또는 status(쿼리 한 번)로 토픽 문서 조회
+    
+    Returns:
+        토픽 스냅샷 리스트 (둘 다 없으면 None)
+    """
+    if data.get("topic_ids"):
+        refs = [db.collection("trending_topics").document(topic_id) for topic_id in data["topic_ids"][:max_items]]
+        return list(db.get_all(refs))
+    
+    if data.get("status"):
+        limit = min(int(data.get("limit") or max_items), max_items)
+        return list(
+            db.collection("trending_topics").where("status", "==", data["status"]).limit(limit).stream()
+        )
+    
+    return None
+
+
+def request_paragraph_audio(text: str) -> dict:
+    """
+    완성된 문단 하나를 오디오 생성기에 미리 합성 요청 (스트리밍 모드 TTS 선행 시작)
+    
+    오디오 생성기는 문단을 전체 스크립트와 같은 문장 청크로 나눠 청크 캐시에 저장합니다.
+    scripts 문서에 audio_prefetched가 있으면 전체 음성 생성 시 이 청크들을 합성 없이 이어 붙입니다.
+    """
+    response = audio_session.post(
+        AUDIO_GENERATOR_URL,
+        json={"script_text": text, "segment": True},
+        timeout=120
+    )
+    response.raise_for_status()
+    data = response.json()
+    return {"chunks": data.get("chunks"), "synthesized_characters": data.get("synthesized_characters")}
+
+
+@app.route('/generate-script-stream', methods=['POST'])
+def generate_script_stream():
+    """
+    스트리밍 스크립트 생성 (NDJSON)
+    
+    토큰이 도착하는 대로 문장을 확정해 한 줄씩 내보냅니다.
+    첫 문장이 끝나면 hook 이벤트, 문단이 끝나면 paragraph 이벤트를 보내고,
+    prefetch_audio=true이면 완성된 문단을 생성이 끝나기 전에 오디오 생성기의 청크 캐시에 미리 합성합니다
+    (전체 음성 생성 시 합성 없이 재사용).
+    
+    Request Body:
+    {
+        "topic_id": "Firestore trending_topics 문서 ID",
+        "force_mode": "info" | "sales" (선택),
+        "force_regenerate": true (선택),
+        "prefetch_audio": true (선택, AUDIO_GENERATOR_URL 필요)
+    }
+    
+    Response (application/x-ndjson, 한 줄에 이벤트 하나):
+        {"type": "mode", "mode": "info"}
+        {"type": "hook", "text": "..."}
+        {"type": "sentence", "index": 0, "text": "..."}
+        {"type": "paragraph", "index": 0, "text": "..."}
+        {"type": "done", "script_id": "...", ...} 또는 {"type": "error", "error": "..."}
+    """
+    data = request.get_json(silent=True) or {}
+    topic_id = data.get("topic_id")
+    
+    if not topic_id:
+        return jsonify({"error": "topic_id가 필요합니다"}), 400
+    
+    topic_data, error_response = claim_topic(topic_id, bool(data.get("force_regenerate")))
+    if error_response:
+        return error_response
+    
+    topic_title = topic_data.get("title")
+    mode = choose_mode(data.get("force_mode"))
+    prefetch_audio = bool(data.get("prefetch_audio")) and bool(AUDIO_GENERATOR_URL)
+    
+    def event_line(event: dict) -> str:
+        return json.dumps(event, ensure_ascii=False) + "\n"
+    
+    def generate():
+        started_at = time.monotonic()
+        streamer = SentenceStreamer()
+        usage = {}
+        audio_futures = []
+        cached = None if data.get("force_regenerate") else script_cache.get(mode, topic_title)
+        
+        def handle(events: list):
+            for event in events:
+                if event["type"] == "hook":
+                    event["elapsed_seconds"] = round(time.monotonic() - started_at, 3)
+                elif event["type"] == "paragraph" and prefetch_audio:
+                    audio_futures.append((event["index"], audio_executor.submit(request_paragraph_audio, event["text"])))
+                yield event_line(event)
+        
+        try:
+            yield event_line({"type": "mode", "mode": mode, "cache_hit": bool(cached)})
             
-            word_count = data.get("word_count", 0)
-            duration = data.get("estimated_duration", 0)
+            if cached:
+                # 캐시 적중: 저장된 본문을 한 번에 분할
+                yield from handle(streamer.feed(cached["script"]))
+            else:
+                for delta in _chat_completion_stream(build_messages(mode, topic_title), usage):
+                    yield from handle(streamer.feed(delta))
+            yield from handle(streamer.close())
             
-            if mode == "info":
-                info_lengths.append(word_count)
-                info_durations.append(duration)
+            if cached:
+                result = {**cached, "usage": None, "cache_hit": True}
             else:
-                sales_lengths.append(word_count)
-                sales_durations.append(duration)
+                script, usage, validation = repair_script(mode, streamer.text.strip(), usage or None)
+                result = build_script_result(mode, script, usage, validation=validation)
+                cache_if_valid(mode, topic_title, result)
+                result = {**result, "cache_hit": False}
+            
+            # 수정된 문단은 이미 보낸 내용과 다르므로 최종본에서 바뀌지 않은 문단만 유지
+            final_sections = split_sections(result["script"])
+            unchanged = {
+                index for index, paragraph in enumerate(streamer.paragraphs)
+                if index < len(final_sections) and final_sections[index] == paragraph
+            }
+            
+            # 스트리밍 중 확정한 첫 문장을 hook으로 사용 (이미 클라이언트에 전달된 값과 일치)
+            if 0 in unchanged:
+                result["hook"] = streamer.hook or result["hook"]
+            
+            # 선행 합성된 문단 (수정된 문단의 청크는 최종본과 달라 재사용되지 않음)
+            prefetched = []
+            for index, future in audio_futures:
+                try:
+                    future.result()
+                    if index in unchanged:
+                        prefetched.append(index)
+                except Exception as e:
+                    logger.warning(f"문단 {index} 선행 TTS 실패: {e}")
+            if prefetched:
+                result["audio_prefetched"] = True
+                result["audio_prefetched_paragraphs"] = prefetched
+            
+            script_id = save_script(result, topic_id, topic_title)
+            if script_id is None:
+                yield event_line({"type": "error", "error": "임대가 만료되어 다른 인스턴스가 처리 중입니다 (결과 저장 안 함)"})
+                return
+            
+            logger.info(f"스트리밍 스크립트 생성 완료 [{mode}]: {script_id} ({result['word_count']}자)")
+            
+            yield event_line({
+                "type": "done",
+                "script_id": script_id,
+                "mode": mode,
+                "hook": result["hook"],
+                "word_count": result["word_count"],
+                "estimated_duration": result["estimated_duration"],
+                "duration_status": result.get("duration_status"),
+                "validation": result.get("validation"),
+                # 수정이 있었으면 스트리밍된 문단 대신 사용할 최종 본문
+                "script": result["script"] if len(unchanged) < len(final_sections) else None,
+                "usage": result.get("usage"),
+                "cache_hit": result["cache_hit"],
+                "audio_prefetched_paragraphs": prefetched,
+                "elapsed_seconds": round(time.monotonic() - started_at, 3)
+            })
+            
+        except Exception as e:
+            logger.error(f"스트리밍 스크립트 생성 실패: {e}")
+            release_topic(topic_id, str(e))
+            yield event_line({"type": "error", "error": str(e)})
+    
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@app.route('/generate-scripts', methods=['POST'])
+def generate_scripts():
+    """
+    여러 토픽의 스크립트를 동시 생성하는 배치 엔드포인트
+    
+    Request Body (topic_ids 또는 status 중 하나):
+    {
+        "topic_ids": ["토픽 문서 ID", ...],
+        "status": "pending" (topic_ids가 없을 때 이 상태의 토픽 조회),
+        "limit": 20 (status 조회 시 최대 개수, 기본 SCRIPT_BATCH_MAX_ITEMS),
+        "concurrency": 4 (선택, 기본 SCRIPT_BATCH_CONCURRENCY),
+        "force_mode": "info" | "sales" (선택),
+        "force_regenerate": true (선택),
+        "candidates": 3 (선택, 토픽별 후보 수)
+    }
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        force_mode = data.get("force_mode")
+        force_regenerate = bool(data.get("force_regenerate"))
+        candidates = data.get("candidates")
+        concurrency = max(1, int(data.get("concurrency") or SCRIPT_BATCH_CONCURRENCY))
+        started_at = time.monotonic()
+        
+        # TOPIC_LEASING이면 임대한 토픽만 생성 (여러 인스턴스가 동시에 호출해도 중복 없음)
+        topics = load_topics(data, SCRIPT_BATCH_MAX_ITEMS, force_regenerate)
+        if topics is None:
+            return jsonify({"error": "topic_ids 또는 status가 필요합니다"}), 400
+        
+        outcomes = {}
+        jobs = []
+        for topic_id, topic_data in topics:
+            if topic_data is None:
+                outcomes[topic_id] = {"topic_id": topic_id, "status": "unavailable" if TOPIC_LEASING else "not_found"}
+                continue
+            jobs.append((topic_id, topic_data.get("title")))
+        
+        def run(topic_id: str, topic_title: str) -> dict:
+            item_started_at = time.monotonic()
+            mode = choose_mode(force_mode)
+            result = generate_for_mode(mode, topic_title, force_regenerate, candidates)
+            return {
+                "topic_id": topic_id,
+                "topic_title": topic_title,
+                "result": result,
+                "elapsed": time.monotonic() - item_started_at
+            }
+        
+        # 제한된 동시성으로 생성 (레이트 리밋은 LLM 백엔드에서 백오프)
+        succeeded = []
+        with ThreadPoolExecutor(max_workers=min(concurrency, max(1, len(jobs)))) as executor:
+            futures = {executor.submit(run, topic_id, title): topic_id for topic_id, title in jobs}
+            for future in as_completed(futures):
+                topic_id = futures[future]
+                try:
+                    succeeded.append(future.result())
+                except Exception as e:
+                    logger.error(f"배치 스크립트 생성 실패 ({topic_id}): {e}")
+                    outcomes[topic_id] = {"topic_id": topic_id, "status": "error", "error": str(e)}
+                    release_topic(topic_id, str(e))
+        
+        commits, lost = write_claimed_scripts(succeeded)
+        
+        for topic_id in lost:
+            outcomes[topic_id] = {"topic_id": topic_id, "status": "lease_lost"}
+        succeeded = [item for item in succeeded if item["topic_id"] not in lost]
+        
+        for item in succeeded:
+            result = item["result"]
+            outcomes[item["topic_id"]] = {
+                "topic_id": item["topic_id"],
+                "status": "ok",
+                "script_id": item["script_id"],
+                "mode": result["mode"],
+                "word_count": result.get("word_count"),
+                "cache_hit": result.get("cache_hit", False),
+                "elapsed_seconds": round(item["elapsed"], 3)
+            }
+        
+        elapsed = time.monotonic() - started_at
+        ordered_ids = [topic_id for topic_id, _ in topics]
+        
+        logger.info(
+            f"배치 스크립트 생성: {len(succeeded)}/{len(topics)}개 성공, "
+            f"{elapsed:.1f}초, 커밋 {commits}회 (동시성 {concurrency})"
+        )
+        
+        return jsonify({
+            "success": True,
+            "requested": len(topics),
+            "succeeded": len(succeeded),
+            "failed": len(topics) - len(succeeded),
+            "concurrency": concurrency,
+            "commits": commits,
+            "elapsed_seconds": round(elapsed, 3),
+            "scripts_per_minute": round(len(succeeded) / elapsed * 60, 2) if elapsed > 0 else 0,
+            "items": [outcomes[topic_id] for topic_id in ordered_ids]
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"배치 스크립트 생성 실패: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/submit-batch', methods=['POST'])
+def submit_script_batch():
+    """
+    지연 모드: 대기 토픽을 OpenAI Batch API 작업 하나로 제출
+    
+    캐시 적중 토픽은 즉시 저장하고, 나머지만 JSONL로 묶어 제출합니다.
+    제출한 토픽은 status="script_queued"로 바꿔 중복 제출을 막고,
+    결과는 /poll-batches가 scripts 컬렉션에 반영합니다.
+    
+    Request Body (선택):
+    {
+        "topic_ids": [...] 또는 "status": "pending" (기본값), "limit": 1000,
+        "force_mode": "info" | "sales",
+        "force_regenerate": true,
+        "candidates": 3 (요청당 후보 수, 결과 반영 시 최선 선택)
+    }
+    """
+    if openai_client is None:
+        return jsonify({"error": f"Batch API는 openai 백엔드에서만 사용할 수 있습니다 (현재: {llm.name})"}), 400
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        data.setdefault("status", "pending")
+        force_regenerate = bool(data.get("force_regenerate"))
+        candidates = candidate_count(data.get("candidates"))
+        params = {**CHAT_PARAMS, "n": candidates} if candidates > 1 else CHAT_PARAMS
         
-        stats["info_percentage"] = (stats["info"] / stats["total"] * 100) if stats["total"] > 0 else 0
-        stats["sales_percentage"] = (stats["sales"] / stats["total"] * 100) if stats["total"] > 0 else 0
+        # 제출할 토픽도 임대 (다른 인스턴스의 동기 생성/배치 제출과 중복 방지)
+        topics = load_topics(data, SCRIPT_BATCH_API_MAX_ITEMS, force_regenerate)
         
-        stats["avg_length_info"] = sum(info_lengths) / len(info_lengths) if info_lengths else 0
-        stats["avg_length_sales"] = sum(sales_lengths) / len(sales_lengths) if sales_lengths else 0
+        cached_items = []
+        items = {}
+        lines = []
+        for topic_id, topic_data in topics:
+            if topic_data is None:
+                continue
+            topic_title = topic_data.get("title")
+            mode = choose_mode(data.get("force_mode"))
+            
+            cached = None if force_regenerate else script_cache.get(mode, topic_title)
+            if cached:
+                cached_items.append({
+                    "topic_id": topic_id,
+                    "topic_title": topic_title,
+                    "result": {**cached, "usage": None, "cache_hit": True}
+                })
+                continue
+            
+            # custom_id = 토픽 ID (배치 내 고유)
+            items[topic_id] = {"topic_title": topic_title, "mode": mode}
+            lines.append(build_request_line(topic_id, build_messages(mode, topic_title), params))
+        
+        write_claimed_scripts(cached_items)
+        
+        if not lines:
+            return jsonify({
+                "success": True,
+                "batch_id": None,
+                "submitted": 0,
+                "cached": len(cached_items)
+            }), 200
         
-        stats["avg_duration_info"] = sum(info_durations) / len(info_durations) if info_durations else 0
-        stats["avg_duration_sales"] = sum(sales_durations) / len(sales_durations) if sales_durations else 0
+        try:
+            batch = submit_batch(openai_client, lines, metadata={"prompt_version": PROMPT_VERSION})
+        except Exception as e:
+            for topic_id in items:
+                release_topic(topic_id, str(e))
+            raise
+        
+        writes = [("set", db.collection("script_batches").document(batch.id), {
+            "batch_id": batch.id,
+            "input_file_id": batch.input_file_id,
+            "status": "submitted",
+            "openai_status": batch.status,
+            "prompt_version": PROMPT_VERSION,
+            "items": items,
+            "request_count": len(items),
+            "created_at": firestore.SERVER_TIMESTAMP
+        })]
+        writes += [
+            ("update", db.collection("trending_topics").document(topic_id), {
+                "status": "script_queued", "script_batch_id": batch.id, **clear_lease_fields()
+            })
+            for topic_id in items
+        ]
+        commit_writes(writes)
+        
+        logger.info(f"스크립트 배치 제출 완료: {batch.id} ({len(items)}개, 캐시 {len(cached_items)}개)")
+        
+        return jsonify({
+            "success": True,
+            "batch_id": batch.id,
+            "submitted": len(items),
+            "cached": len(cached_items)
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"스크립트 배치 제출 실패: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+def claim_script_batch(ref) -> bool:
+    """
+    배치 결과 반영 선점 (트랜잭션: submitted 또는 임대가 만료된 finishing → finishing)
+    
+    Returns:
+        선점 여부 (다른 poller가 처리 중이거나 이미 끝났으면 False)
+    """
+    @firestore.transactional
+    def run(transaction):
+        snapshot = ref.get(transaction=transaction)
+        data = snapshot.to_dict() if snapshot.exists else {}
+        now = datetime.now(timezone.utc)
+        expires_at = data.get("finishing_expires_at")
+        stale = data.get("status") == "finishing" and (expires_at is None or expires_at <= now)
+        if data.get("status") != "submitted" and not stale:
+            return False
+        transaction.update(ref, {
+            "status": "finishing",
+            "finishing_owner": leaser.owner,
+            "finishing_expires_at": now + timedelta(seconds=BATCH_FINISH_LEASE_SECONDS)
+        })
+        return True
+    
+    try:
+        return run(db.transaction())
+    except Exception as e:
+        logger.warning(f"배치 선점 실패 ({ref.id}): {e}")
+        return False
+
+
+def finish_script_batch(batch_doc, batch) -> dict:
+    """
+    종료된 배치 결과를 scripts 컬렉션에 반영 (claim_script_batch()로 선점한 뒤 호출)
+    - 성공 항목: 후보 선택 + 로컬 검증 후 저장 (수정 호출 없음 - 요청 시간 안에 동기 LLM 호출을 하지 않음)
+    - 실패 항목(배치 실패/만료/결과 처리 예외 포함): 토픽을 pending으로 되돌려 다음 제출 대상에 포함
+    """
+    items = batch_doc.to_dict().get("items", {})
+    results = fetch_results(openai_client, batch) if batch.output_file_id or getattr(batch, "error_file_id", None) else {}
+    
+    succeeded = []
+    failed = {}
+    for topic_id, item in items.items():
+        output = results.get(topic_id) or {"error": f"배치 {batch.status}"}
+        if "error" in output:
+            failed[topic_id] = output["error"]
+            continue
+        
+        # 항목 하나의 예외가 배치 전체를 막지 않도록 항목별로 실패 처리
+        try:
+            result = finalize_script(
+                item["mode"],
+                output.get("candidates") or [output.get("content")],
+                prompt_usage(output.get("usage")),
+                repair=False
+            )
+        except Exception as e:
+            failed[topic_id] = f"결과 처리 실패: {e}"
+            continue
+        result["generation"] = "batch"
+        cache_if_valid(item["mode"], item["topic_title"], result)
+        succeeded.append({"topic_id": topic_id, "topic_title": item["topic_title"], "result": result})
+    
+    # custom_id(토픽 ID)별 고정 문서 ID: 임대 만료 후 다른 poller가 다시 반영해도 중복 저장되지 않음
+    writes = script_writes(succeeded, batch_doc.id)
+    writes += [
+        ("update", db.collection("trending_topics").document(topic_id), {"status": "pending"})
+        for topic_id in failed
+    ]
+    writes.append(("update", batch_doc.reference, {
+        "status": "done",
+        "openai_status": batch.status,
+        "succeeded": len(succeeded),
+        "failed": len(failed),
+        "errors": failed,
+        "completed_at": firestore.SERVER_TIMESTAMP
+    }))
+    commit_writes(writes)
+    
+    for topic_id, error in failed.items():
+        logger.warning(f"배치 항목 실패 ({topic_id}): {error}")
+    
+    return {"succeeded": len(succeeded), "failed": len(failed)}
+
+
+@app.route('/poll-batches', methods=['POST'])
+def poll_script_batches():
+    """
+    제출된 배치 상태 확인 (Cloud Scheduler 등으로 주기 호출)
+    
+    종료된 배치는 트랜잭션으로 finishing으로 선점한 뒤 결과를 scripts 컬렉션에 반영하고
+    status="done"으로 표시합니다. 반영 도중 인스턴스가 죽으면 임대 만료 후 다음 호출이 다시 처리합니다.
+    """
+    if openai_client is None:
+        return jsonify({"error": f"Batch API는 openai 백엔드에서만 사용할 수 있습니다 (현재: {llm.name})"}), 400
+    
+    try:
+        batches = []
+        for batch_doc in db.collection("script_batches").where("status", "in", ["submitted", "finishing"]).stream():
+            if batch_doc.to_dict().get("status") == "finishing" and not claim_script_batch(batch_doc.reference):
+                continue  # 다른 poller가 반영 중
+            batch = openai_client.batches.retrieve(batch_doc.id)
+            summary = {"batch_id": batch_doc.id, "openai_status": batch.status}
+            
+            if batch.status in TERMINAL_STATUSES:
+                if batch_doc.to_dict().get("status") == "submitted" and not claim_script_batch(batch_doc.reference):
+                    continue
+                summary.update(finish_script_batch(batch_doc, batch))
+                logger.info(f"스크립트 배치 종료 [{batch.status}]: {batch_doc.id} {summary}")
+            else:
+                batch_doc.reference.update({"openai_status": batch.status})
+            
+            batches.append(summary)
+        
+        return jsonify({"success": True, "batches": batches}), 200
+    
+    except Exception as e:
+        logger.error(f"스크립트 배치 확인 실패: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    """스크립트 캐시 히트/미스 카운터"""
+    return jsonify(script_cache.get_stats()), 200
+
+
+@app.route('/llm-stats', methods=['GET'])
+def llm_stats():
+    """
+    LLM 호출 지표 (프로세스 시작 또는 ?reset=true 이후 누적)
+    
+    호출 수, 재시도/오류 수, 토큰, 지연 시간(평균/p50/p95/최대), 분당 호출 수
+    """
+    snapshot = {"backend": llm.name, "model": CHAT_PARAMS["model"], **llm.metrics.snapshot()}
+    if request.args.get("reset") == "true":
+        llm.metrics.reset()
+    return jsonify(snapshot), 200
+
+
+@app.route('/stats', methods=['GET'])
+def get_stats():
+    """
+    스크립트 생성 통계 (누적 집계 문서 1개 조회, 스크립트 수와 무관하게 일정 시간)
+    
+    Query:
+        days: 최근 N일 일별 롤업 포함 (선택, 최대 90)
+    
+    Returns:
+        Info vs Sales 모드 비율, 평균/표준편차 길이 등
+    """
+    try:
+        stats_ref = db.collection("stats").document("scripts")
+        stats = summarize(stats_ref.get().to_dict())
+        
+        days = min(int(request.args.get("days", 0)), 90)
+        if days > 0:
+            keys = recent_day_keys(days)
+            daily_docs = db.get_all([stats_ref.collection("daily").document(key) for key in keys])
+            daily = {doc.id: summarize(doc.to_dict()) for doc in daily_docs if doc.exists}
+            stats["daily"] = [{"date": key, **daily[key]} for key in keys if key in daily]
         
         return jsonify(stats), 200
         
@@ -424,6 +1234,40 @@ def get_stats():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/stats/rebuild', methods=['POST'])
+def rebuild_stats():
+    """
+    scripts 컬렉션 전체를 한 번 스캔해 집계 문서를 다시 계산 (도입 시 백필/불일치 복구용)
+    
+    일별 롤업은 created_at 기준으로 다시 계산합니다.
+    """
+    try:
+        results = []
+        by_day = {}
+        for script in db.collection("scripts").stream():
+            data = script.to_dict()
+            results.append(data)
+            created_at = data.get("created_at")
+            if isinstance(created_at, datetime):
+                by_day.setdefault(day_key(created_at), []).append(data)
+        
+        stats_ref = db.collection("stats").document("scripts")
+        writes = [("set", stats_ref, {**accumulate(results), "updated_at": firestore.SERVER_TIMESTAMP})]
+        writes += [
+            ("set", stats_ref.collection("daily").document(key), {**accumulate(items), "date": key})
+            for key, items in by_day.items()
+        ]
+        commit_writes(writes)
+        
+        logger.info(f"통계 재계산 완료: 스크립트 {len(results)}개, 일별 롤업 {len(by_day)}개")
+        
+        return jsonify({"success": True, "scripts": len(results), "days": len(by_day)}), 200
+        
+    except Exception as e:
+        logger.error(f"통계 재계산 실패: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8080))
     app.run(host="0.0.0.0", port=port)
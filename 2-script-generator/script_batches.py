@@ -0,0 +1,97 @@
+"""
+OpenAI Batch API 연동 (지연 허용 스크립트 생성)
+- 대기 토픽을 /v1/chat/completions 요청 JSONL로 묶어 파일 업로드 + 배치 생성
+- 배치 API는 동기 호출 대비 약 50% 요금, 별도 한도라 인터랙티브 호출 한도를 소모하지 않음
+- 완료된 배치의 출력 파일을 custom_id 기준으로 파싱
+- OPENAI_BASE_URL을 fake_batch_server.py로 지정하면 로컬에서 전체 흐름 확인 가능
+"""
+
+import io
+import json
+import logging
+from typing import Dict, Iterable, List
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# 더 이상 상태가 바뀌지 않는 배치 상태
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_request_line(custom_id: str, messages: List[Dict], params: Dict) -> str:
+    """배치 입력 JSONL 한 줄"""
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {**params, "messages": messages}
+    }, ensure_ascii=False)
+
+
+def submit_batch(client, lines: Iterable[str], metadata: Dict = None, completion_window: str = "24h"):
+    """
+    JSONL 업로드 후 배치 생성
+
+    Args:
+        client: OpenAI 클라이언트
+        lines: build_request_line() 결과
+        metadata: 배치 메타데이터 (문자열 값만)
+        completion_window: 완료 기한 (현재 "24h"만 지원)
+
+    Returns:
+        생성된 Batch 객체
+    """
+    lines = list(lines)
+    payload = ("\n".join(lines) + "\n").encode("utf-8")
+    input_file = client.files.create(file=("scripts.jsonl", io.BytesIO(payload)), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=completion_window,
+        metadata=metadata or {}
+    )
+    logger.info(f"배치 제출: {batch.id} ({len(lines)}개 요청, 파일 {input_file.id})")
+    return batch
+
+
+def _read_jsonl(client, file_id: str) -> List[Dict]:
+    if not file_id:
+        return []
+    text = client.files.content(file_id).text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def fetch_results(client, batch) -> Dict[str, Dict]:
+    """
+    완료된 배치의 출력/오류 파일 파싱
+
+    Returns:
+        {custom_id: {"content": str, "candidates": [str, ...], "usage": dict} 또는 {"error": str}}
+        (candidates는 n>1 요청의 후보 전체, content는 첫 번째 후보)
+    """
+    results = {}
+
+    for line in _read_jsonl(client, batch.output_file_id):
+        custom_id = line.get("custom_id")
+        response = line.get("response") or {}
+        body = response.get("body") or {}
+
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or body.get("error") or f"HTTP {response.get('status_code')}"
+            results[custom_id] = {"error": json.dumps(error, ensure_ascii=False) if isinstance(error, dict) else str(error)}
+            continue
+
+        candidates = [(choice["message"]["content"] or "").strip() for choice in body["choices"]]
+        results[custom_id] = {
+            "content": candidates[0],
+            "candidates": candidates,
+            "usage": body.get("usage")
+        }
+
+    for line in _read_jsonl(client, getattr(batch, "error_file_id", None)):
+        error = line.get("error") or (line.get("response") or {}).get("body", {}).get("error")
+        results.setdefault(line.get("custom_id"), {"error": str(error)})
+
+    return results
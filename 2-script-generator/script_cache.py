@@ -0,0 +1,269 @@
+"""
+생성 스크립트 응답 캐시
+- 키: 모드 + 정규화 토픽 + 프롬프트 버전 (프롬프트를 바꾸면 자동 무효화)
+- L1: 프로세스 메모리 LRU (TTL, 최대 항목 수)
+- L2 (선택): Firestore 컬렉션 (인스턴스 간 공유, 정확 일치만)
+  - 문서마다 expires_at을 저장 → Firestore TTL 정책으로 만료 문서 자동 삭제
+    (gcloud firestore fields ttls update expires_at --collection-group=script_cache --enable-ttl)
+  - TTL 정책이 없어도 쓰기 시 prune_interval_seconds마다 백그라운드 스레드에서 만료 문서를 일부 삭제
+- 선택적 임베딩 유사도 조회: 표현만 조금 다른 토픽도 재사용
+  - L1(이 인스턴스 메모리)에 있는 항목만 대상 (L2는 정확 일치로만 조회)
+  - 토픽 임베딩은 정규화 토픽별로 메모해 조회 실패 후 저장할 때 다시 호출하지 않음
+"""
+
+import re
+import time
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_topic(topic: str) -> str:
+    """대소문자/전각/구두점/공백 차이를 무시한 토픽 문자열"""
+    text = unicodedata.normalize("NFKC", topic or "").lower()
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class ScriptCache:
+    """모드/토픽/프롬프트 버전 기준 스크립트 캐시"""
+
+    def __init__(
+        self,
+        prompt_version: str,
+        max_entries: int = 1000,
+        ttl_seconds: float = 7 * 24 * 3600,
+        similarity_threshold: float = 0.0,
+        embed: Callable[[str], List[float]] = None,
+        collection=None,
+        db=None,
+        prune_interval_seconds: float = 3600,
+        prune_batch_size: int = 100,
+        clock=time.time
+    ):
+        """
+        Args:
+            prompt_version: 현재 프롬프트 버전 (키에 포함)
+            max_entries: L1 최대 항목 수 (초과 시 LRU 제거)
+            ttl_seconds: 항목 유효 기간 (초)
+            similarity_threshold: 임베딩 코사인 유사도 하한 (0이면 유사도 조회 안 함)
+            embed: 텍스트 → 임베딩 벡터 함수 (유사도 조회 시 필요)
+            collection: L2로 쓸 Firestore 컬렉션 참조 (선택)
+            db: Firestore 클라이언트 (L2 만료 문서를 WriteBatch로 삭제할 때 사용, 없으면 문서별 삭제)
+            prune_interval_seconds: L2 만료 문서 정리 최소 간격 (초, 0이면 정리 안 함)
+            prune_batch_size: 정리 1회에 삭제할 최대 문서 수
+            clock: 현재 시각 함수 (테스트용 주입 가능)
+        """
+        self.prompt_version = prompt_version
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed if similarity_threshold > 0 else None
+        self.collection = collection
+        self.db = db
+        self.prune_interval_seconds = prune_interval_seconds
+        self.prune_batch_size = prune_batch_size
+        self.clock = clock
+        self.last_pruned_at = 0.0
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.stats = {"hits": 0, "similar_hits": 0, "l2_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "pruned": 0}
+
+    def key(self, mode: str, topic: str) -> str:
+        raw = f"{mode}|{normalize_topic(topic)}|{self.prompt_version}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def _count(self, name: str):
+        with self.lock:
+            self.stats[name] += 1
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        return self.clock() - entry["stored_at"] < self.ttl_seconds
+
+    def _put_local(self, key: str, entry: Dict):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def _get_local(self, key: str) -> Optional[Dict]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if not self._is_fresh(entry):
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def _get_remote(self, key: str) -> Optional[Dict]:
+        if self.collection is None:
+            return None
+        try:
+            doc = self.collection.document(key).get()
+        except Exception as e:
+            logger.warning(f"스크립트 캐시 L2 조회 실패: {e}")
+            return None
+        if not doc.exists:
+            return None
+        entry = doc.to_dict()
+        return entry if self._is_fresh(entry) else None
+
+    def _find_similar(self, mode: str, vector: np.ndarray) -> Optional[Dict]:
+        """같은 모드/프롬프트 버전 항목 중 코사인 유사도가 가장 높은 항목"""
+        with self.lock:
+            candidates = [
+                entry for entry in self.entries.values()
+                if entry["mode"] == mode and entry.get("embedding") is not None and self._is_fresh(entry)
+            ]
+        if not candidates:
+            return None
+
+        matrix = np.array([entry["embedding"] for entry in candidates], dtype=np.float32)
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.similarity_threshold:
+            logger.info(f"유사 토픽 캐시 적중 (유사도 {similarities[best]:.3f}): {candidates[best]['topic']}")
+            return candidates[best]
+        return None
+
+    def _embedding(self, topic: str) -> Optional[np.ndarray]:
+        """정규화 토픽의 단위 임베딩 (get 실패 후 put에서 같은 토픽을 다시 임베딩하지 않도록 메모)"""
+        if not self.embed:
+            return None
+        text = normalize_topic(topic)
+        with self.lock:
+            if text in self.vectors:
+                self.vectors.move_to_end(text)
+                return self.vectors[text]
+        try:
+            vector = np.asarray(self.embed(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"토픽 임베딩 실패 (유사도 조회 생략): {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        vector = vector / norm if norm else None
+        with self.lock:
+            self.vectors[text] = vector
+            while len(self.vectors) > self.max_entries:
+                self.vectors.popitem(last=False)
+        return vector
+
+    def get(self, mode: str, topic: str) -> Optional[Dict]:
+        """캐시된 결과 (없으면 None). 정확 일치 L1 → L2 → 임베딩 유사도(L1 항목만) 순으로 조회"""
+        key = self.key(mode, topic)
+
+        entry = self._get_local(key)
+        if entry:
+            self._count("hits")
+            return entry["result"]
+
+        entry = self._get_remote(key)
+        if entry:
+            self._count("l2_hits")
+            self._put_local(key, entry)
+            return entry["result"]
+
+        vector = self._embedding(topic)
+        if vector is not None:
+            entry = self._find_similar(mode, vector)
+            if entry:
+                self._count("similar_hits")
+                return entry["result"]
+
+        self._count("misses")
+        return None
+
+    def put(self, mode: str, topic: str, result: Dict):
+        """생성 결과 저장 (JSON 직렬화 가능한 dict)"""
+        key = self.key(mode, topic)
+        entry = {
+            "mode": mode,
+            "topic": topic,
+            "prompt_version": self.prompt_version,
+            "result": result,
+            "stored_at": self.clock()
+        }
+
+        if self.collection is not None:
+            expires_at = datetime.fromtimestamp(entry["stored_at"] + self.ttl_seconds, timezone.utc)
+            try:
+                self.collection.document(key).set({**entry, "expires_at": expires_at})
+            except Exception as e:
+                logger.warning(f"스크립트 캐시 L2 저장 실패: {e}")
+            self._maybe_prune()
+
+        vector = self._embedding(topic)
+        if vector is not None:
+            entry["embedding"] = vector
+
+        self._put_local(key, entry)
+        self._count("stores")
+
+    def _maybe_prune(self):
+        """마지막 정리 후 prune_interval_seconds가 지났으면 L2 만료 문서 정리"""
+        if not self.prune_interval_seconds:
+            return
+        now = self.clock()
+        with self.lock:
+            if now - self.last_pruned_at < self.prune_interval_seconds:
+                return
+            self.last_pruned_at = now
+        # 요청 경로를 막지 않도록 백그라운드에서 정리
+        threading.Thread(target=self.prune, name="script-cache-prune", daemon=True).start()
+
+    def prune(self) -> int:
+        """
+        L2에서 expires_at이 지난 문서를 최대 prune_batch_size개 삭제 (WriteBatch 커밋 1회)
+
+        Returns:
+            삭제한 문서 수
+        """
+        if self.collection is None:
+            return 0
+        now = datetime.fromtimestamp(self.clock(), timezone.utc)
+        try:
+            expired = list(self.collection.where("expires_at", "<", now).limit(self.prune_batch_size).stream())
+            if expired and self.db is not None:
+                batch = self.db.batch()
+                for doc in expired:
+                    batch.delete(doc.reference)
+                batch.commit()
+            else:
+                for doc in expired:
+                    doc.reference.delete()
+        except Exception as e:
+            logger.warning(f"스크립트 캐시 L2 정리 실패: {e}")
+            return 0
+
+        if expired:
+            logger.info(f"스크립트 캐시 L2 만료 문서 {len(expired)}개 삭제")
+        with self.lock:
+            self.stats["pruned"] += len(expired)
+        return len(expired)
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            hits = self.stats["hits"] + self.stats["l2_hits"] + self.stats["similar_hits"]
+            total = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self.entries),
+                "hit_rate": round(hits / total, 3) if total else 0.0
+            }
@@ -0,0 +1,110 @@
+"""
+스크립트 통계 누적 집계
+- stats/scripts 문서에 모드별 개수/합/제곱합을 Increment로 누적
+- 스크립트 문서와 같은 WriteBatch에 넣어 함께 커밋 (원자적 반영)
+- 일별 롤업: stats/scripts/daily/{YYYY-MM-DD}
+- /stats는 집계 문서만 읽으므로 스크립트 수와 무관하게 O(1)
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable
+
+from google.cloud import firestore
+
+MODES = ("info", "sales")
+
+
+def day_key(now: datetime = None) -> str:
+    """일별 롤업 문서 ID (UTC 기준)"""
+    return (now or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+
+
+def recent_day_keys(days: int, now: datetime = None) -> list:
+    """오늘부터 과거 days일의 롤업 문서 ID"""
+    now = now or datetime.now(timezone.utc)
+    return [day_key(now - timedelta(days=offset)) for offset in range(days)]
+
+
+def _mode_values(result: Dict) -> Dict[str, float]:
+    length = result.get("word_count", 0) or 0
+    duration = result.get("estimated_duration", 0) or 0
+    return {
+        "count": 1,
+        "length_sum": length,
+        "length_sumsq": length * length,
+        "duration_sum": duration,
+        "duration_sumsq": duration * duration
+    }
+
+
+def stats_increment(result: Dict) -> Dict:
+    """
+    스크립트 1개를 집계 문서에 반영하는 set(merge=True)용 데이터
+
+    Returns:
+        {"info": {"count": Increment(1), ...}, "prompt_tokens": Increment(n), ...}
+    """
+    mode = result.get("mode", "info")
+    usage = result.get("usage") or {}
+    return {
+        mode: {name: firestore.Increment(value) for name, value in _mode_values(result).items()},
+        "prompt_tokens": firestore.Increment(usage.get("prompt_tokens", 0)),
+        "cached_prompt_tokens": firestore.Increment(usage.get("cached_tokens", 0)),
+        "cache_hits": firestore.Increment(1 if result.get("cache_hit") else 0)
+    }
+
+
+def accumulate(results: Iterable[Dict]) -> Dict:
+    """스크립트 목록으로 집계 문서 전체를 새로 계산 (재구축용, Increment 없이 값 그대로)"""
+    totals = {mode: {name: 0 for name in _mode_values({})} for mode in MODES}
+    totals.update({"prompt_tokens": 0, "cached_prompt_tokens": 0, "cache_hits": 0})
+
+    for result in results:
+        mode_totals = totals.setdefault(result.get("mode", "info"), {name: 0 for name in _mode_values({})})
+        for name, value in _mode_values(result).items():
+            mode_totals[name] += value
+        usage = result.get("usage") or {}
+        totals["prompt_tokens"] += usage.get("prompt_tokens", 0)
+        totals["cached_prompt_tokens"] += usage.get("cached_tokens", 0)
+        totals["cache_hits"] += 1 if result.get("cache_hit") else 0
+
+    return totals
+
+
+def _mean_std(total: float, total_sq: float, count: int):
+    if not count:
+        return 0, 0
+    mean = total / count
+    variance = max(total_sq / count - mean * mean, 0.0)
+    return mean, math.sqrt(variance)
+
+
+def summarize(data: Dict) -> Dict:
+    """집계 문서 → /stats 응답 (기존 필드 유지 + 표준편차)"""
+    data = data or {}
+    counts = {mode: (data.get(mode) or {}).get("count", 0) for mode in MODES}
+    total = sum(counts.values())
+
+    stats = {"total": total, **counts}
+    stats["info_percentage"] = (counts["info"] / total * 100) if total > 0 else 0
+    stats["sales_percentage"] = (counts["sales"] / total * 100) if total > 0 else 0
+
+    for mode in MODES:
+        values = data.get(mode) or {}
+        stats[f"avg_length_{mode}"], stats[f"std_length_{mode}"] = _mean_std(
+            values.get("length_sum", 0), values.get("length_sumsq", 0), counts[mode]
+        )
+        stats[f"avg_duration_{mode}"], stats[f"std_duration_{mode}"] = _mean_std(
+            values.get("duration_sum", 0), values.get("duration_sumsq", 0), counts[mode]
+        )
+
+    # 프롬프트 캐시 적중률 (입력 토큰 중 캐시 처리 비율)
+    prompt_tokens = data.get("prompt_tokens", 0)
+    cached_tokens = data.get("cached_prompt_tokens", 0)
+    stats["prompt_tokens"] = prompt_tokens
+    stats["cached_prompt_tokens"] = cached_tokens
+    stats["prompt_cache_hit_rate"] = (cached_tokens / prompt_tokens) if prompt_tokens > 0 else 0
+    stats["script_cache_hits"] = data.get("cache_hits", 0)
+
+    return stats
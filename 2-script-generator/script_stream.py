@@ -0,0 +1,79 @@
+"""
+스트리밍 스크립트 분할기
+- 토큰 조각(delta)을 받아 문장/문단이 끝나는 즉시 이벤트로 내보냄
+- 첫 문장이 끝나면 Hook 확정 (전체 완료를 기다리지 않음)
+- 완성된 문단은 다음 단계(TTS 등)를 바로 시작하는 데 사용
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# 문장 종결 부호 뒤에 공백/줄바꿈이 와야 문장 끝으로 판단 ("3.5", "gpt-4o." 중간 방지)
+_SENTENCE_END = re.compile(r"[.!?…。]+[\"'”’)]*(?=\s)")
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+class SentenceStreamer:
+    """delta 누적 → hook / sentence / paragraph 이벤트"""
+
+    def __init__(self):
+        self.text = ""
+        self.hook: Optional[str] = None
+        self.sentences: List[str] = []
+        self.paragraphs: List[str] = []
+        self._sentence_start = 0
+        self._paragraph_start = 0
+
+    def _emit_sentence(self, end: int, events: List[Dict]):
+        sentence = " ".join(self.text[self._sentence_start:end].split())
+        self._sentence_start = end
+        if not sentence:
+            return
+        self.sentences.append(sentence)
+        if self.hook is None:
+            self.hook = sentence
+            events.append({"type": "hook", "text": sentence})
+        events.append({"type": "sentence", "index": len(self.sentences) - 1, "text": sentence})
+
+    def _emit_paragraph(self, end: int, events: List[Dict]):
+        paragraph = self.text[self._paragraph_start:end].strip()
+        self._paragraph_start = end
+        if paragraph:
+            self.paragraphs.append(paragraph)
+            events.append({"type": "paragraph", "index": len(self.paragraphs) - 1, "text": paragraph})
+
+    def feed(self, delta: str) -> List[Dict]:
+        """
+        토큰 조각 추가
+
+        Returns:
+            이번 조각으로 확정된 이벤트 리스트 (순서: hook → sentence → paragraph)
+        """
+        if not delta:
+            return []
+        self.text += delta
+        events = []
+
+        # 경계 판정에 다음 글자가 필요하므로 이미 확정된 위치 이후만 검사
+        while True:
+            sentence_match = _SENTENCE_END.search(self.text, self._sentence_start)
+            paragraph_match = _PARAGRAPH_BREAK.search(self.text, max(self._sentence_start, self._paragraph_start))
+
+            if paragraph_match and (not sentence_match or paragraph_match.start() <= sentence_match.end()):
+                # 종결 부호 없이 문단이 끝난 경우도 문장으로 처리
+                self._emit_sentence(paragraph_match.start(), events)
+                self._emit_paragraph(paragraph_match.start(), events)
+                self._sentence_start = self._paragraph_start = paragraph_match.end()
+            elif sentence_match:
+                self._emit_sentence(sentence_match.end(), events)
+            else:
+                break
+
+        return events
+
+    def close(self) -> List[Dict]:
+        """스트림 종료: 남은 문장/문단 확정"""
+        events = []
+        self._emit_sentence(len(self.text), events)
+        self._emit_paragraph(len(self.text), events)
+        return events
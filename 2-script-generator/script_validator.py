@@ -0,0 +1,255 @@
+"""
+스크립트 로컬 검증
+- 구조: 빈 줄로 구분된 섹션 수 (Info 5개, Sales 4개)
+- 길이: 전체 예상 발화 길이 + 섹션별 목표 길이 (DurationModel 기반)
+- 금지 표현: 평범한 시작 문구, 제품명/가격/링크 등 플랫폼 정책 위반
+- 실패한 섹션만 골라 부분 수정할 수 있도록 섹션 인덱스와 함께 문제를 반환
+- 후보 여러 개의 점수화 (Hook 강도 + 길이 적합도 + 구조 완결성) → n-best 선택
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from duration_model import DurationModel
+
+# 모드별 섹션 목표 길이 (초) - 프롬프트의 단계별 시간 배분과 동일
+SECTION_TARGETS = {
+    "info": [(3, 5), (8, 12), (10, 15), (15, 20), (5, 7)],
+    "sales": [(3, 5), (15, 20), (20, 25), (5, 7)]
+}
+
+SECTION_NAMES = {
+    "info": ["Hook", "Context Setup", "Conflict/Problem", "Resolution/Insight", "Call-to-Action"],
+    "sales": ["Problem Hook", "Agitation", "Solution Tease", "CTA"]
+}
+
+# 모드 공통/모드별 금지 표현 (정규식)
+FORBIDDEN_PATTERNS = {
+    "all": [
+        (r"오늘은.{0,30}(알려|소개해)\s?드릴게요", "평범한 시작 문구"),
+        (r"https?://|www\.", "링크"),
+    ],
+    "sales": [
+        (r"\d[\d,]*\s?(원|달러)|\$\s?\d", "구체적인 가격"),
+    ]
+}
+
+# 후보 점수 가중치 (합 1.0)
+SCORE_WEIGHTS = {"hook": 0.4, "length": 0.35, "structure": 0.25}
+
+# Hook에서 호기심/긴장감을 만드는 표현
+HOOK_MARKERS = ("방금", "실제로", "믿기 힘들", "충격", "놀랍게도", "당신", "여러분", "지금", "이게", "왜", "진짜", "드디어")
+
+_SECTION_BREAK = re.compile(r"\n\s*\n")
+_FIRST_SENTENCE = re.compile(r"^.*?[.!?…](?=\s|$)", re.DOTALL)
+# 모델이 붙이는 섹션 라벨 (예: "1. Hook:", "**Agitation**") - 낭독되면 안 됨
+_SECTION_LABEL = re.compile(r"^\s*(\*\*)?\s*(\d+\.\s*)?[A-Za-z/\- ]{3,30}(\([^)]*\))?\s*(\*\*)?\s*:", re.MULTILINE)
+
+
+def split_sections(script: str) -> List[str]:
+    """빈 줄 기준 섹션 분리"""
+    return [section.strip() for section in _SECTION_BREAK.split(script.strip()) if section.strip()]
+
+
+def join_sections(sections: List[str]) -> str:
+    return "\n\n".join(section.strip() for section in sections)
+
+
+def first_sentence(script: str) -> str:
+    """첫 문장 (종결 부호가 없으면 첫 문단)"""
+    first_section = split_sections(script)[0] if script.strip() else ""
+    match = _FIRST_SENTENCE.match(first_section)
+    return " ".join((match.group(0) if match else first_section).split())
+
+
+@dataclass
+class ValidationReport:
+    """검증 결과 (issues의 section이 None이면 스크립트 전체 문제)"""
+    passed: bool
+    estimated_duration: float
+    sections: List[str] = field(default_factory=list)
+    issues: List[Dict] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            "passed": self.passed,
+            "estimated_duration": round(self.estimated_duration, 1),
+            "section_count": len(self.sections),
+            "issues": self.issues
+        }
+
+
+class ScriptValidator:
+    """모드별 구조/길이/금지 표현 검사기"""
+
+    def __init__(
+        self,
+        duration_model: DurationModel,
+        min_seconds: float,
+        max_seconds: float,
+        forbidden_phrases: List[str] = None,
+        section_tolerance: float = 0.5
+    ):
+        """
+        Args:
+            duration_model: 발화 길이 모델
+            min_seconds: 전체 최소 길이 (초)
+            max_seconds: 전체 최대 길이 (초)
+            forbidden_phrases: 추가 금지 문구 (문자열 그대로 포함 여부 검사, 예: 제품명)
+            section_tolerance: 섹션 목표 길이 허용 폭 (0.5면 목표 범위의 50%~150%)
+        """
+        self.duration_model = duration_model
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.forbidden_phrases = [phrase for phrase in (forbidden_phrases or []) if phrase]
+        self.section_tolerance = section_tolerance
+
+    def section_target(self, mode: str, index: int) -> Optional[Tuple[float, float]]:
+        targets = SECTION_TARGETS.get(mode, [])
+        return targets[index] if index < len(targets) else None
+
+    def target_description(self, mode: str, index: int) -> str:
+        """수정 요청에 넣을 목표 길이 (초 + 대략적인 한글 글자 수)"""
+        low, high = self.section_target(mode, index)
+        seconds_per_syllable = self.duration_model.coefficients[0] / self.duration_model.speaking_rate
+        return f"{low}-{high}초 (한글 약 {int(low / seconds_per_syllable)}-{int(high / seconds_per_syllable)}자)"
+
+    def _forbidden(self, mode: str, text: str) -> List[str]:
+        found = [
+            label for pattern, label in FORBIDDEN_PATTERNS["all"] + FORBIDDEN_PATTERNS.get(mode, [])
+            if re.search(pattern, text)
+        ]
+        found += [f"금지 문구 '{phrase}'" for phrase in self.forbidden_phrases if phrase in text]
+        if _SECTION_LABEL.search(text):
+            found.append("섹션 라벨")
+        return found
+
+    def validate(self, script: str, mode: str) -> ValidationReport:
+        """스크립트 검증"""
+        sections = split_sections(script)
+        expected = len(SECTION_TARGETS.get(mode, []))
+        issues = []
+
+        durations = self.duration_model.estimate_many(sections) if sections else []
+        total = float(self.duration_model.estimate(join_sections(sections))) if sections else 0.0
+
+        if total < self.min_seconds:
+            issues.append({"kind": "length", "section": None, "detail": f"전체 {total:.1f}초 < 최소 {self.min_seconds:.0f}초"})
+        elif total > self.max_seconds:
+            issues.append({"kind": "length", "section": None, "detail": f"전체 {total:.1f}초 > 최대 {self.max_seconds:.0f}초"})
+
+        if len(sections) != expected:
+            issues.append({"kind": "structure", "section": None, "detail": f"섹션 {len(sections)}개 (필요: {expected}개)"})
+        else:
+            low_factor, high_factor = 1 - self.section_tolerance, 1 + self.section_tolerance
+            for index, seconds in enumerate(durations):
+                low, high = self.section_target(mode, index)
+                if seconds < low * low_factor or seconds > high * high_factor:
+                    issues.append({
+                        "kind": "section_length",
+                        "section": index,
+                        "detail": f"{SECTION_NAMES[mode][index]} {seconds:.1f}초 (목표 {low}-{high}초)"
+                    })
+
+        for index, section in enumerate(sections):
+            for label in self._forbidden(mode, section):
+                issues.append({"kind": "forbidden", "section": index if len(sections) == expected else None, "detail": label})
+
+        return ValidationReport(passed=not issues, estimated_duration=total, sections=sections, issues=issues)
+
+    def pick_repair(self, report: ValidationReport, mode: str) -> Optional[Dict]:
+        """
+        다음에 고칠 대상 1개 선택
+        - 구조 문제: 전체 재구성 (section=None)
+        - 섹션 문제: 해당 섹션만
+        - 전체 길이 문제만 있으면: 목표 대비 가장 많이 벗어난 섹션
+        """
+        if report.passed:
+            return None
+
+        structural = [issue for issue in report.issues if issue["kind"] == "structure"]
+        if structural:
+            return {"section": None, "problems": [issue["detail"] for issue in report.issues]}
+
+        by_section = {}
+        for issue in report.issues:
+            if issue["section"] is not None:
+                by_section.setdefault(issue["section"], []).append(issue["detail"])
+        if by_section:
+            section = min(by_section)
+            return {"section": section, "problems": by_section[section]}
+
+        # 전체 길이만 벗어난 경우: 목표 중간값과의 차이가 가장 큰 섹션
+        durations = self.duration_model.estimate_many(report.sections)
+        midpoints = [sum(self.section_target(mode, index)) / 2 for index in range(len(report.sections))]
+        too_short = report.estimated_duration < self.min_seconds
+        gaps = [(mid - seconds) if too_short else (seconds - mid) for seconds, mid in zip(durations, midpoints)]
+        section = max(range(len(gaps)), key=lambda index: gaps[index])
+        return {"section": section, "problems": [issue["detail"] for issue in report.issues]}
+
+    def _hook_scores(self, mode: str, hooks: List[str]) -> List[float]:
+        """Hook 강도 0~1: 목표 길이(3-5초) 0.4 + 질문/감탄 0.25 + 구체적 숫자 0.15 + 호기심 표현 0.2"""
+        low, high = SECTION_TARGETS[mode][0]
+        seconds = self.duration_model.estimate_many(hooks) if hooks else []
+        scores = []
+        for hook, hook_seconds in zip(hooks, seconds):
+            if not hook or re.search(FORBIDDEN_PATTERNS["all"][0][0], hook):
+                scores.append(0.0)
+                continue
+            if low <= hook_seconds <= high:
+                fit = 1.0
+            else:
+                fit = max(0.0, 1 - (low - hook_seconds if hook_seconds < low else hook_seconds - high) / high)
+            score = 0.4 * fit
+            score += 0.25 if re.search(r"[?!]", hook) else 0.0
+            score += 0.15 if re.search(r"\d", hook) else 0.0
+            score += 0.2 if any(marker in hook for marker in HOOK_MARKERS) else 0.0
+            scores.append(score)
+        return scores
+
+    def _length_score(self, seconds: float) -> float:
+        """길이 적합도 0~1: 범위 안이면 0.5~1 (중앙일수록 높음), 범위 밖이면 벗어난 정도만큼 0.5에서 감소"""
+        center = (self.min_seconds + self.max_seconds) / 2
+        half_width = (self.max_seconds - self.min_seconds) / 2 or 1.0
+        if self.min_seconds <= seconds <= self.max_seconds:
+            return 1 - 0.5 * abs(seconds - center) / half_width
+        outside = self.min_seconds - seconds if seconds < self.min_seconds else seconds - self.max_seconds
+        return max(0.0, 0.5 - outside / half_width)
+
+    def rank(self, mode: str, scripts: List[str]) -> List[Dict]:
+        """
+        후보 스크립트 점수화 (높은 순 정렬)
+
+        Returns:
+            [{"index": 후보 번호, "score": 0~1, "hook": 점수, "length": 점수, "structure": 점수,
+              "estimated_duration": 초, "issues": 검증 문제 수}, ...]
+        """
+        expected = len(SECTION_TARGETS.get(mode, []))
+        hooks = [first_sentence(script) for script in scripts]
+        hook_scores = self._hook_scores(mode, hooks)
+        durations = self.duration_model.estimate_many(scripts) if scripts else []
+
+        ranking = []
+        for index, script in enumerate(scripts):
+            report = self.validate(script, mode)
+            structure = max(0.0, 1 - abs(len(report.sections) - expected) / expected) if expected else 1.0
+            structure = max(0.0, structure - 0.2 * sum(1 for issue in report.issues if issue["kind"] == "forbidden"))
+            length = self._length_score(float(durations[index]))
+            score = (
+                SCORE_WEIGHTS["hook"] * hook_scores[index]
+                + SCORE_WEIGHTS["length"] * length
+                + SCORE_WEIGHTS["structure"] * structure
+            )
+            ranking.append({
+                "index": index,
+                "score": round(score, 4),
+                "hook": round(hook_scores[index], 4),
+                "length": round(length, 4),
+                "structure": round(structure, 4),
+                "estimated_duration": round(float(durations[index]), 1),
+                "issues": len(report.issues)
+            })
+
+        # 동점이면 검증 문제가 적은 후보, 그다음 먼저 생성된 후보
+        return sorted(ranking, key=lambda item: (-item["score"], item["issues"], item["index"]))
@@ -0,0 +1,249 @@
+"""
+Batch API 왕복 테스트: /submit-batch → /poll-batches → scripts 반영
+- OpenAI는 fake_batch_server, Firestore는 메모리 가짜 클라이언트로 대체
+"""
+
+import sys
+import importlib
+import threading
+from datetime import datetime, timezone
+
+import pytest
+from google.cloud import firestore
+from google.cloud.firestore_v1.transforms import Increment
+
+import fake_batch_server
+
+
+class Snapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return None if self._data is None else dict(self._data)
+
+
+class DocumentReference:
+    def __init__(self, db, collection, document_id):
+        self.db = db
+        self.collection_name = collection
+        self.id = document_id
+
+    @property
+    def _docs(self):
+        return self.db.data.setdefault(self.collection_name, {})
+
+    def get(self, transaction=None):
+        return Snapshot(self, self._docs.get(self.id))
+
+    def set(self, data, merge=False):
+        current = dict(self._docs.get(self.id) or {}) if merge else {}
+        self._docs[self.id] = _apply(current, data)
+
+    def update(self, data):
+        if self.id not in self._docs:
+            raise KeyError(f"{self.collection_name}/{self.id} 없음")
+        self._docs[self.id] = _apply(dict(self._docs[self.id]), data)
+
+    def delete(self):
+        self._docs.pop(self.id, None)
+
+    def collection(self, name):
+        return CollectionReference(self.db, f"{self.collection_name}/{self.id}/{name}")
+
+
+class Query:
+    def __init__(self, db, collection, filters=(), limit=None):
+        self.db = db
+        self.collection = collection
+        self.filters = list(filters)
+        self._limit = limit
+
+    def where(self, field, op, value):
+        return Query(self.db, self.collection, self.filters + [(field, op, value)], self._limit)
+
+    def limit(self, count):
+        return Query(self.db, self.collection, self.filters, count)
+
+    def stream(self, transaction=None):
+        matches = []
+        for document_id, data in list(self.db.data.get(self.collection, {}).items()):
+            if all(_matches(data.get(field), op, value) for field, op, value in self.filters):
+                matches.append(Snapshot(DocumentReference(self.db, self.collection, document_id), data))
+        return iter(matches[:self._limit] if self._limit else matches)
+
+
+class CollectionReference(Query):
+    _ids = iter(range(1, 10 ** 9))
+
+    def __init__(self, db, name):
+        super().__init__(db, name)
+
+    def document(self, document_id=None):
+        return DocumentReference(self.db, self.collection, document_id or f"auto{next(self._ids)}")
+
+
+class WriteBatch:
+    def __init__(self, db):
+        self.db = db
+        self.ops = []
+
+    def set(self, reference, data, merge=False):
+        self.ops.append(lambda: reference.set(data, merge=merge))
+
+    def update(self, reference, data):
+        self.ops.append(lambda: reference.update(data))
+
+    def delete(self, reference):
+        self.ops.append(reference.delete)
+
+    def commit(self):
+        with self.db.lock:
+            for op in self.ops:
+                op()
+        self.ops = []
+
+
+class FakeFirestore:
+    def __init__(self, *args, **kwargs):
+        self.data = {}
+        self.lock = threading.RLock()
+
+    def collection(self, name):
+        return CollectionReference(self, name)
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def transaction(self, **kwargs):
+        return WriteBatch(self)
+
+    def get_all(self, references, transaction=None):
+        return [reference.get() for reference in references]
+
+
+def _matches(actual, op, value):
+    if op == "==":
+        return actual == value
+    if op == "in":
+        return actual in value
+    if actual is None:
+        return False
+    return {"<": actual < value, "<=": actual <= value, ">": actual > value, ">=": actual >= value}[op]
+
+
+def _apply(current, data):
+    """set/update 값 반영 (Increment, DELETE_FIELD, SERVER_TIMESTAMP, 중첩 dict 병합)"""
+    for key, value in data.items():
+        if value is firestore.DELETE_FIELD:
+            current.pop(key, None)
+        elif value is firestore.SERVER_TIMESTAMP:
+            current[key] = datetime.now(timezone.utc)
+        elif isinstance(value, Increment):
+            current[key] = (current.get(key) or 0) + value.value
+        elif isinstance(value, dict):
+            current[key] = _apply(dict(current.get(key) or {}), value)
+        else:
+            current[key] = value
+    return current
+
+
+def _transactional(func):
+    def run(transaction, *args, **kwargs):
+        with transaction.db.lock:
+            result = func(transaction, *args, **kwargs)
+            transaction.commit()
+            return result
+    return run
+
+
+@pytest.fixture(scope="module")
+def service():
+    """가짜 Batch 서버 + 가짜 Firestore로 main 모듈 로드"""
+    server = fake_batch_server.start_server(0)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+        patch.setenv("OPENAI_API_KEY", "test")
+        patch.setenv("LLM_BACKEND", "openai")
+        patch.setattr(firestore, "Client", FakeFirestore)
+        patch.setattr(firestore, "transactional", _transactional)
+        sys.modules.pop("main", None)
+        main = importlib.import_module("main")
+        yield main
+        sys.modules.pop("main", None)
+    server.shutdown()
+
+
+@pytest.fixture
+def db(service):
+    service.db.data.clear()
+    service.script_cache.entries.clear()
+    return service.db
+
+
+def add_topic(db, topic_id, title="엔비디아 신형 GPU 공개"):
+    db.collection("trending_topics").document(topic_id).set({"title": title, "status": "pending"})
+
+
+def test_submit_poll_finish_round_trip_per_mode(service, db):
+    client = service.app.test_client()
+    add_topic(db, "info-topic")
+    add_topic(db, "sales-topic", "무선 이어폰 신제품")
+
+    submitted = {}
+    for topic_id, mode in [("info-topic", "info"), ("sales-topic", "sales")]:
+        response = client.post("/submit-batch", json={"topic_ids": [topic_id], "force_mode": mode, "candidates": 2})
+        body = response.get_json()
+        assert response.status_code == 200, body
+        assert body["submitted"] == 1
+        submitted[topic_id] = body["batch_id"]
+        assert db.data["trending_topics"][topic_id]["status"] == "script_queued"
+
+    response = client.post("/poll-batches")
+    assert response.status_code == 200, response.get_json()
+    assert {batch["batch_id"]: batch["succeeded"] for batch in response.get_json()["batches"]} == {
+        batch_id: 1 for batch_id in submitted.values()
+    }
+
+    scripts = db.data["scripts"]
+    for topic_id, batch_id in submitted.items():
+        script = scripts[f"{batch_id}_{topic_id}"]
+        assert script["generation"] == "batch"
+        assert script["status"] == "pending_audio"
+        assert len(script["alternates"]) == 1
+        assert db.data["trending_topics"][topic_id]["status"] == "script_generated"
+    assert {script["mode"] for script in scripts.values()} == {"info", "sales"}
+    assert all(batch["status"] == "done" for batch in db.data["script_batches"].values())
+
+
+def test_refinishing_stale_batch_overwrites_instead_of_duplicating(service, db):
+    client = service.app.test_client()
+    add_topic(db, "topic-1")
+    batch_id = client.post("/submit-batch", json={"topic_ids": ["topic-1"], "force_mode": "info"}).get_json()["batch_id"]
+    client.post("/poll-batches")
+    assert list(db.data["scripts"]) == [f"{batch_id}_topic-1"]
+
+    # 반영 도중 인스턴스가 죽어 finishing 임대가 만료된 상황
+    db.data["script_batches"][batch_id].update({"status": "finishing", "finishing_expires_at": None})
+    response = client.post("/poll-batches")
+
+    assert response.get_json()["batches"][0]["succeeded"] == 1
+    assert list(db.data["scripts"]) == [f"{batch_id}_topic-1"]
+
+
+def test_active_finishing_lease_is_skipped(service, db):
+    client = service.app.test_client()
+    add_topic(db, "topic-2")
+    batch_id = client.post("/submit-batch", json={"topic_ids": ["topic-2"], "force_mode": "info"}).get_json()["batch_id"]
+    db.data["script_batches"][batch_id].update({
+        "status": "finishing",
+        "finishing_expires_at": datetime(2999, 1, 1, tzinfo=timezone.utc)
+    })
+
+    response = client.post("/poll-batches")
+
+    assert response.get_json()["batches"] == []
+    assert "scripts" not in db.data
@@ -0,0 +1,49 @@
+"""숫자 읽기(read_integer/read_number)와 발화 길이 모델 테스트"""
+
+import pytest
+
+from duration_model import DurationModel, read_integer, read_number
+
+
+@pytest.mark.parametrize("value, spoken", [
+    (0, "영"),
+    (1, "일"),
+    (10, "십"),
+    (111, "백십일"),
+    (2024, "이천이십사"),
+    (9999, "구천구백구십구"),
+    (10000, "만"),
+    (10001, "만일"),
+    (11000, "만천"),
+    (20000, "이만"),
+    (100000000, "일억"),
+    (10 ** 16, "일경"),
+])
+def test_read_integer(value, spoken):
+    assert read_integer(value) == spoken
+
+
+def test_read_integer_largest_unit_boundary():
+    # 10^20 - 1까지는 경 단위로, 10^20부터는 자릿수별로 읽음
+    assert read_integer(10 ** 20 - 1) == "구천구백구십구경" + "구천구백구십구조" + "구천구백구십구억" + "구천구백구십구만" + "구천구백구십구"
+    assert read_integer(10 ** 20) == "일" + "영" * 20
+    assert read_integer(12345678901234567890123) == "일이삼사오육칠팔구영일이삼사오육칠팔구영일이삼"
+
+
+@pytest.mark.parametrize("text, spoken", [
+    ("0", "영"),
+    ("1,200", "천이백"),
+    ("10,000", "만"),
+    ("85.4", "팔십오점사"),
+    ("0.05", "영점영오"),
+    ("100000000000000000000", "일" + "영" * 20),
+])
+def test_read_number(text, spoken):
+    assert read_number(text) == spoken
+
+
+def test_numbers_count_as_spoken_syllables():
+    model = DurationModel()
+    # "10,000" → 만(1음절), "12345" → 만이천삼백사십오(7음절)
+    assert model.estimate("10,000") < model.estimate("12345")
+    assert model.estimate("10,000") == pytest.approx(model.estimate("만"))
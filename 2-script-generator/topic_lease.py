@@ -0,0 +1,236 @@
+"""
+토픽 임대(lease) 관리
+- 여러 인스턴스가 같은 토픽을 동시에 생성하지 않도록 트랜잭션으로 상태를 script_leased로 전환
+- 임대에는 소유자(owner)와 만료 시각이 있고, 만료된 임대는 다른 인스턴스가 회수 (크래시 복구)
+- 같은 토픽이 max_claims번 회수되면 script_failed로 격리 (매번 인스턴스를 죽이는 토픽 방지)
+- 결과 저장은 소유권을 다시 확인하는 트랜잭션 안에서 수행 (임대를 잃은 인스턴스의 결과는 버림)
+
+필요한 Firestore 복합 색인: trending_topics (status ASC, lease_expires_at ASC)
+"""
+
+import os
+import uuid
+import random
+import socket
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from google.cloud import firestore
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LEASED_STATUS = "script_leased"
+FAILED_STATUS = "script_failed"
+
+# 임대 해제 시 지울 필드
+LEASE_FIELDS = ("lease_owner", "lease_expires_at")
+
+
+def default_owner() -> str:
+    """인스턴스 식별자 (Cloud Run 리비전/호스트 + 임의 접미사)"""
+    return f"{os.getenv('K_REVISION') or socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+
+def clear_lease_fields() -> Dict:
+    """토픽 상태를 바꾸는 쓰기에 합쳐 넣을 임대 필드 삭제"""
+    return {name: firestore.DELETE_FIELD for name in LEASE_FIELDS}
+
+
+class TopicLeaser:
+    """트랜잭션 기반 토픽 임대"""
+
+    def __init__(
+        self,
+        db,
+        owner: str = None,
+        lease_seconds: float = 300,
+        max_claims: int = 3,
+        claimable_statuses: Tuple[str, ...] = ("pending",),
+        collection: str = "trending_topics",
+        clock: Callable[[], datetime] = None
+    ):
+        """
+        Args:
+            db: Firestore 클라이언트
+            owner: 임대 소유자 ID (기본: 인스턴스별 고유값)
+            lease_seconds: 임대 유지 시간 (생성 1건의 최대 소요 시간보다 넉넉하게)
+            max_claims: 같은 토픽의 최대 임대 횟수 (초과 시 FAILED_STATUS로 격리)
+            claimable_statuses: 새로 임대할 수 있는 토픽 상태
+            collection: 토픽 컬렉션 이름
+            clock: 현재 시각 함수 (UTC, 테스트용)
+        """
+        self.db = db
+        self.owner = owner or default_owner()
+        self.lease_seconds = lease_seconds
+        self.max_claims = max_claims
+        self.claimable_statuses = claimable_statuses
+        self.collection = db.collection(collection)
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+
+    def _expired(self, data: Dict, now: datetime) -> bool:
+        expires_at = data.get("lease_expires_at")
+        return expires_at is None or expires_at <= now
+
+    def is_claimable(self, data: Dict, now: datetime, any_status: bool = False, status: str = None) -> bool:
+        """
+        임대 가능 여부
+
+        Args:
+            any_status: True면 상태와 무관하게 (활성 임대만 아니면) 임대 가능 (강제 재생성용)
+            status: claimable_statuses 외에 이번 요청에서 임대를 허용할 상태 (예: needs_revision)
+        """
+        current = data.get("status")
+        if current == LEASED_STATUS:
+            return self._expired(data, now)
+        return any_status or current in self.claimable_statuses or (status is not None and current == status)
+
+    def claim(self, topic_id: str, any_status: bool = False, status: str = None) -> Optional[Dict]:
+        """
+        토픽 1개 임대 (트랜잭션: 읽기 → 임대 가능 확인 → 상태 전환)
+
+        Args:
+            status: claimable_statuses 외에 임대를 허용할 상태 (상태 조회로 고른 토픽용)
+
+        Returns:
+            임대 성공 시 토픽 데이터, 이미 다른 인스턴스가 임대 중이거나 대상이 아니면 None
+        """
+        ref = self.collection.document(topic_id)
+
+        @firestore.transactional
+        def run(transaction):
+            snapshot = ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+
+            data = snapshot.to_dict()
+            now = self.clock()
+            if not self.is_claimable(data, now, any_status, status):
+                return None
+
+            reclaimed = data.get("status") == LEASED_STATUS
+            claims = (data.get("lease_claims") or 0) + 1 if reclaimed else 1
+            if reclaimed and claims > self.max_claims:
+                # 임대가 반복해서 만료된 토픽은 더 이상 회수하지 않음
+                transaction.update(ref, {
+                    "status": FAILED_STATUS,
+                    "last_error": f"임대 {self.max_claims}회 만료",
+                    **clear_lease_fields()
+                })
+                logger.warning(f"토픽 격리 ({topic_id}): 임대 {self.max_claims}회 만료")
+                return None
+
+            transaction.update(ref, {
+                "status": LEASED_STATUS,
+                "lease_owner": self.owner,
+                "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                "lease_claims": claims,
+                "lease_previous_status": data.get("lease_previous_status") if reclaimed else data.get("status")
+            })
+            if reclaimed:
+                logger.info(f"만료된 임대 회수 ({topic_id}): {data.get('lease_owner')} → {self.owner}")
+            return data
+
+        try:
+            return run(self.db.transaction())
+        except Exception as e:
+            # 트랜잭션 경합으로 재시도가 모두 실패하면 다른 인스턴스가 가져간 것으로 간주
+            logger.warning(f"토픽 임대 실패 ({topic_id}): {e}")
+            return None
+
+    def claim_many(self, topic_ids: List[str], any_status: bool = False) -> List[Tuple[str, Dict]]:
+        """지정한 토픽들을 각각 임대 (성공한 것만 반환)"""
+        claimed = []
+        for topic_id in topic_ids:
+            data = self.claim(topic_id, any_status)
+            if data is not None:
+                claimed.append((topic_id, data))
+        return claimed
+
+    def claim_pending(self, limit: int, status: str = None) -> List[Tuple[str, Dict]]:
+        """
+        대기 토픽(또는 status 상태 토픽) + 만료된 임대 토픽 중 최대 limit개 임대
+
+        후보를 limit의 2배까지 조회해 섞은 뒤 순서대로 임대를 시도합니다.
+        여러 인스턴스가 동시에 호출해도 같은 순서로 경합하지 않아 충돌이 줄어듭니다.
+        """
+        now = self.clock()
+        candidates = [
+            snapshot.id for snapshot in
+            self.collection.where("status", "==", status or self.claimable_statuses[0]).limit(limit * 2).stream()
+        ]
+        candidates += [
+            snapshot.id for snapshot in
+            self.collection.where("status", "==", LEASED_STATUS).where("lease_expires_at", "<", now).limit(limit).stream()
+        ]
+        random.shuffle(candidates)
+
+        claimed = []
+        for topic_id in dict.fromkeys(candidates):
+            if len(claimed) >= limit:
+                break
+            data = self.claim(topic_id, status=status)
+            if data is not None:
+                claimed.append((topic_id, data))
+        return claimed
+
+    def _owned(self, snapshot) -> bool:
+        data = snapshot.to_dict() if snapshot.exists else {}
+        return data.get("status") == LEASED_STATUS and data.get("lease_owner") == self.owner
+
+    def release(self, topic_id: str, status: str = None, error: str = None) -> bool:
+        """
+        임대 반납 (소유자일 때만, 기본은 임대 전 상태로 복귀)
+
+        Returns:
+            반납 여부 (이미 만료되어 다른 인스턴스가 가져갔으면 False)
+        """
+        ref = self.collection.document(topic_id)
+
+        @firestore.transactional
+        def run(transaction):
+            snapshot = ref.get(transaction=transaction)
+            if not self._owned(snapshot):
+                return False
+            update = {
+                "status": status or snapshot.to_dict().get("lease_previous_status") or self.claimable_statuses[0],
+                **clear_lease_fields()
+            }
+            if error:
+                update["last_error"] = error
+            transaction.update(ref, update)
+            return True
+
+        try:
+            return run(self.db.transaction())
+        except Exception as e:
+            logger.warning(f"토픽 임대 반납 실패 ({topic_id}): {e}")
+            return False
+
+    def commit_if_owned(self, groups: Dict[str, list], apply: Callable) -> Tuple[List[str], List[str]]:
+        """
+        아직 임대를 가진 토픽의 쓰기만 한 트랜잭션으로 커밋
+
+        Args:
+            groups: {토픽 ID: 쓰기 묶음} (트랜잭션 1회 최대 500건 이내로 나눠서 호출)
+            apply: apply(transaction, 쓰기 묶음) - 묶음을 트랜잭션에 추가하는 함수
+
+        Returns:
+            (커밋한 토픽 ID, 임대를 잃어 버린 토픽 ID)
+        """
+        refs = [self.collection.document(topic_id) for topic_id in groups]
+
+        @firestore.transactional
+        def run(transaction):
+            owned, lost = [], []
+            for snapshot in self.db.get_all(refs, transaction=transaction):
+                (owned if self._owned(snapshot) else lost).append(snapshot.id)
+            for topic_id in owned:
+                apply(transaction, groups[topic_id])
+            return owned, lost
+
+        owned, lost = run(self.db.transaction())
+        for topic_id in lost:
+            logger.warning(f"임대 만료로 결과 폐기 ({topic_id}): 다른 인스턴스가 처리 중")
+        return owned, lost
@@ -0,0 +1,55 @@
+"""
+발화 길이 모델 보정
+- 오디오 생성기가 MP3 프레임으로 실측한 scripts.audio_duration(audio_duration_exact=True)을 정답으로 사용
+  (예전 문서는 영상 편집기가 ffprobe로 측정한 video_duration 사용)
+- 보정 계수는 config/duration_model 문서에 저장 (스크립트 생성기/오디오 생성기가 시작 시 로드)
+
+사용법:
+    python calibrate_duration.py            # 최근 스크립트로 보정 후 저장
+    python calibrate_duration.py --dry-run  # 결과만 출력
+"""
+
+import os
+import json
+import argparse
+import logging
+from google.cloud import firestore
+from duration_model import DurationModel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_samples(db, limit: int) -> list:
+    """(스크립트, 실측 길이, speaking_rate) 샘플 조회"""
+    samples = []
+    for doc in db.collection('scripts').where('phase3_status', '==', 'completed').limit(limit).stream():
+        data = doc.to_dict()
+        measured = data.get('audio_duration') if data.get('audio_duration_exact') else data.get('video_duration')
+        if data.get('script') and measured:
+            samples.append((data['script'], float(measured), float(data.get('speaking_rate', 1.05))))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='발화 길이 모델 보정')
+    parser.add_argument('--limit', type=int, default=1000, help='사용할 최대 스크립트 수')
+    parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 결과만 출력')
+    args = parser.parse_args()
+
+    db = firestore.Client(project=os.environ.get('GCP_PROJECT_ID'))
+    samples = load_samples(db, args.limit)
+    logger.info(f"보정 샘플 {len(samples)}개")
+
+    model = DurationModel()
+    stats = model.calibrate(samples)
+
+    print(json.dumps({'coefficients': model.to_dict(), 'calibration': stats}, indent=2, ensure_ascii=False))
+
+    if not args.dry_run:
+        model.save(db.collection('config').document('duration_model'), stats)
+        logger.info("config/duration_model 저장 완료")
+
+
+if __name__ == '__main__':
+    main()
@@ -30,7 +30,7 @@ gcloud functions deploy audio-generator \
     --entry-point=audio_generator \
     --trigger-http \
     --allow-unauthenticated \
-    --set-env-vars=GCP_PROJECT_ID=$GCP_PROJECT_ID,STORAGE_BUCKET_NAME=$STORAGE_BUCKET_NAME \
+    --set-env-vars=GCP_PROJECT_ID=$GCP_PROJECT_ID,STORAGE_BUCKET_NAME=$STORAGE_BUCKET_NAME,CACHE_ADMIN_TOKEN=$CACHE_ADMIN_TOKEN \
     --timeout=540s \
     --memory=512MB \
     --max-instances=10
@@ -51,3 +51,8 @@ echo "테스트 요청:"
 echo "curl -X POST $FUNCTION_URL/generate \\"
 echo "  -H 'Content-Type: application/json' \\"
 echo "  -d '{\"script_text\": \"테스트 음성입니다.\", \"video_id\": \"test_video\"}'"
+echo ""
+echo "TTS 캐시 정리 (Cloud Scheduler 등록 예시, 매일 04:00 - CACHE_ADMIN_TOKEN 설정 필요):"
+echo "gcloud scheduler jobs create http audio-cache-evict --schedule='0 4 * * *' \\"
+echo "  --uri=$FUNCTION_URL/evict-cache --http-method=POST --location=asia-northeast3 \\"
+echo "  --headers=Content-Type=application/json,X-Admin-Token=\$CACHE_ADMIN_TOKEN --message-body='{\"dry_run\": false}'"
@@ -4,13 +4,24 @@ Phase 3: Google Cloud TTS 음성 생성기
 """
 
 import os
+import hmac
 import json
+import time
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from google.cloud import texttospeech_v1 as texttospeech
 from google.cloud import storage
 from google.cloud import firestore
 import functions_framework
+from duration_model import DurationModel, script_bounds
+from tts_cache import TTSCache, cache_key, normalize_text
+from tts_chunks import (
+    MAX_INPUT_BYTES, split_chunks, split_sentences, decode_linear16, trim_silence, normalize_loudness,
+    stitch, encode_mp3
+)
+from phrase_cache import PhraseIndex
+from mp3_duration import mp3_duration
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,49 +29,115 @@ logger = logging.getLogger(__name__)
 # 환경 변수
 PROJECT_ID = os.environ.get('GCP_PROJECT_ID')
 BUCKET_NAME = os.environ.get('STORAGE_BUCKET_NAME')
+SPEAKING_RATE = float(os.environ.get('TTS_SPEAKING_RATE', '1.05'))  # 5% 빠르게 (숏츠 최적화)
+
+# 음성 설정 (캐시 키에도 그대로 들어감)
+VOICE_NAME = "ko-KR-Neural2-A"  # 여성 목소리 (가장 자연스러움)
+PITCH = 0.0  # 기본 피치
+SAMPLE_RATE_HERTZ = 24000
+EFFECTS_PROFILE_ID = ["small-bluetooth-speaker-class-device"]  # 모바일 최적화
+
+# TTS 캐시 (같은 텍스트 + 음성 설정이면 합성 생략)
+TTS_CACHE_ENABLED = os.environ.get('TTS_CACHE_ENABLED', 'true').lower() == 'true'
+TTS_CACHE_MAX_BYTES = int(os.environ.get('TTS_CACHE_MAX_BYTES', str(2 * 1024 ** 3)))
+TTS_CACHE_MAX_AGE_DAYS = float(os.environ.get('TTS_CACHE_MAX_AGE_DAYS', '30'))
+
+# 문장 단위 분할 합성 (청크 병렬 합성 → 음량 정규화 → 정해진 쉼으로 연결)
+# 기본은 단일 요청 합성 (입력 한도를 넘는 스크립트와 문단 선행 합성된 스크립트만 분할,
+# 반복 문장이 있으면 그 문장만 떼어내고 나머지는 문단 단위로 합성)
+TTS_CHUNKED = os.environ.get('TTS_CHUNKED', 'false').lower() == 'true'
+TTS_CHUNK_MAX_CHARS = int(os.environ.get('TTS_CHUNK_MAX_CHARS', '120'))
+TTS_CHUNK_WORKERS = int(os.environ.get('TTS_CHUNK_WORKERS', '4'))
+TTS_TARGET_DBFS = float(os.environ.get('TTS_TARGET_DBFS', '-18'))
+TTS_MP3_BIT_RATE = 160  # 24kHz(MPEG-2 Layer III) 최대 비트레이트
+PAUSES = {
+    "sentence": float(os.environ.get('TTS_SENTENCE_PAUSE', '0.25')),
+    "paragraph": float(os.environ.get('TTS_PARAGRAPH_PAUSE', '0.45')),
+    "end": float(os.environ.get('TTS_END_PAUSE', '0.3'))
+}
+
+# 반복 문장 캐시 (CTA/인트로 등 여러 영상에 반복되는 문장은 문장 단위 오디오 재사용)
+TTS_PHRASE_CACHE_ENABLED = os.environ.get('TTS_PHRASE_CACHE_ENABLED', 'true').lower() == 'true'
+TTS_PHRASE_MIN_COUNT = int(os.environ.get('TTS_PHRASE_MIN_COUNT', '2'))
+TTS_PHRASE_MAX_CHARS = int(os.environ.get('TTS_PHRASE_MAX_CHARS', '60'))
+TTS_PHRASE_CACHE_MAX_BYTES = int(os.environ.get('TTS_PHRASE_CACHE_MAX_BYTES', str(512 * 1024 ** 2)))
+# 첫 등장부터 캐시할 고정 문구 ('|'로 구분, 요청의 phrases에도 추가 가능)
+TTS_PINNED_PHRASES = [phrase for phrase in os.environ.get('TTS_PINNED_PHRASES', '').split('|') if phrase.strip()]
+
+# 관리 엔드포인트(/evict-cache) 인증 토큰 (X-Admin-Token 헤더, 비어 있으면 엔드포인트 비활성화)
+CACHE_ADMIN_TOKEN = os.environ.get('CACHE_ADMIN_TOKEN', '')
 
 # Google Cloud 클라이언트
 tts_client = texttospeech.TextToSpeechClient()
 storage_client = storage.Client()
 db = firestore.Client()
 
+# 발화 길이 모델 (보정 계수는 calibrate_duration.py가 config/duration_model에 저장)
+duration_model = DurationModel(speaking_rate=SPEAKING_RATE).load(db.collection('config').document('duration_model'))
 
-def generate_audio(script_text: str, output_filename: str) -> Dict[str, Any]:
-    """
-    Google Cloud TTS로 음성 생성
-    
-    Args:
-        script_text: 스크립트 텍스트
-        output_filename: 출력 파일명 (예: "audio_20240101_120000.mp3")
-    
-    Returns:
-        {
-            "audio_url": "gs://bucket/audios/audio_xxx.mp3",
-            "duration_seconds": 45.2,
-            "character_count": 350,
-            "cost": 0.016
+tts_cache = TTSCache(
+    storage_client.bucket(BUCKET_NAME),
+    max_bytes=TTS_CACHE_MAX_BYTES,
+    max_age_days=TTS_CACHE_MAX_AGE_DAYS
+)
+
+# 문장 단위 캐시는 가공 전 LINEAR16(WAV)을 저장 (음량/쉼 설정이 바뀌어도 재사용 가능)
+phrase_audio_cache = TTSCache(
+    storage_client.bucket(BUCKET_NAME),
+    prefix="audios/phrases",
+    extension=".wav",
+    max_bytes=TTS_PHRASE_CACHE_MAX_BYTES,
+    max_age_days=TTS_CACHE_MAX_AGE_DAYS
+)
+phrase_index = PhraseIndex(
+    db,
+    min_count=TTS_PHRASE_MIN_COUNT,
+    max_chars=TTS_PHRASE_MAX_CHARS,
+    pinned=TTS_PINNED_PHRASES
+)
+
+
+def voice_settings(chunked: bool = False, audio_encoding: str = "MP3", max_chars: int = TTS_CHUNK_MAX_CHARS) -> Dict[str, Any]:
+    """캐시 키에 들어가는 음성 설정 (합성 결과에 영향을 주는 값 전부)"""
+    settings = {
+        "language_code": "ko-KR",
+        "voice_name": VOICE_NAME,
+        "audio_encoding": audio_encoding,
+        "speaking_rate": SPEAKING_RATE,
+        "pitch": PITCH,
+        "sample_rate_hertz": SAMPLE_RATE_HERTZ,
+        "effects_profile_id": EFFECTS_PROFILE_ID
+    }
+    if chunked:
+        settings["chunking"] = {
+            "max_chars": max_chars,
+            "target_dbfs": TTS_TARGET_DBFS,
+            "bit_rate": TTS_MP3_BIT_RATE,
+            "pauses": PAUSES
         }
-    """
-    logger.info(f"음성 생성 시작: {len(script_text)} 글자")
-    
+    return settings
+
+
+def synthesize(text: str, audio_encoding=texttospeech.AudioEncoding.MP3) -> bytes:
+    """TTS API 호출 (기본 MP3, 분할 합성은 LINEAR16)"""
     # 1. TTS 요청 구성
-    synthesis_input = texttospeech.SynthesisInput(text=script_text)
+    synthesis_input = texttospeech.SynthesisInput(text=text)
     
     # 2. 음성 설정: 한국어 Neural2 (최고 품질)
     voice = texttospeech.VoiceSelectionParams(
         language_code="ko-KR",
-        name="ko-KR-Neural2-A",  # 여성 목소리 (가장 자연스러움)
+        name=VOICE_NAME,
         ssml_gender=texttospeech.SsmlVoiceGender.FEMALE
     )
     
     # 3. 오디오 설정: MP3, 192kbps (고품질)
     audio_config = texttospeech.AudioConfig(
-        audio_encoding=texttospeech.AudioEncoding.MP3,
-        speaking_rate=1.05,  # 5% 빠르게 (숏츠 최적화)
-        pitch=0.0,           # 기본 피치
+        audio_encoding=audio_encoding,
+        speaking_rate=SPEAKING_RATE,
+        pitch=PITCH,
         volume_gain_db=0.0,  # 볼륨 기본
-        sample_rate_hertz=24000,
-        effects_profile_id=["small-bluetooth-speaker-class-device"]  # 모바일 최적화
+        sample_rate_hertz=SAMPLE_RATE_HERTZ,
+        effects_profile_id=EFFECTS_PROFILE_ID
     )
     
     # 4. TTS API 호출
@@ -75,35 +152,288 @@ def generate_audio(script_text: str, output_filename: str) -> Dict[str, Any]:
         logger.error(f"TTS API 오류: {str(e)}")
         raise
     
-    # 5. Cloud Storage에 업로드
-    bucket = storage_client.bucket(BUCKET_NAME)
-    blob = bucket.blob(f"audios/{output_filename}")
-    blob.upload_from_string(
-        response.audio_content,
-        content_type="audio/mpeg"
+    return response.audio_content
+
+
+def phrase_audio(text: str, store: bool) -> Tuple[bytes, bool]:
+    """
+    청크 1개의 LINEAR16 오디오 (문장 단위 캐시 조회 → 없으면 합성, store면 합성 결과 저장)
+    
+    반복 문장과 스트리밍 중 미리 요청된 문단(segment 요청)의 청크가 캐시에 저장됩니다.
+    
+    Returns:
+        (LINEAR16 바이트, 캐시 적중 여부)
+    """
+    key = cache_key(text, voice_settings(audio_encoding="LINEAR16"))
+    cached = phrase_audio_cache.get(key)
+    if cached is not None:
+        try:
+            return cached.download_as_bytes(), True
+        except Exception as e:
+            logger.warning(f"문장 캐시 다운로드 실패 (합성으로 진행): {e}")
+    
+    audio_content = synthesize(text, texttospeech.AudioEncoding.LINEAR16)
+    if not store:
+        return audio_content, False
+    try:
+        phrase_audio_cache.put(key, audio_content, {"text_length": len(text)}, content_type="audio/wav")
+    except Exception as e:
+        logger.warning(f"문장 캐시 저장 실패: {e}")
+    return audio_content, False
+
+
+def synthesize_chunked(chunks, recurring=frozenset()) -> Tuple[bytes, List[Dict]]:
+    """
+    청크 병렬 합성 후 하나의 MP3로 연결
+    
+    Args:
+        chunks: split_chunks() 결과
+        recurring: 반복 문장 (단독 청크로 분리, 합성 시 문장 단위 캐시에 저장)
+    
+    Returns:
+        (MP3 바이트, 청크별 [{"index", "text", "start", "end", "cached"}]) - 시각은 연결한 PCM의 샘플 수 기준
+    """
+    started = time.monotonic()
+    
+    # 1. LINEAR16으로 병렬 합성 (동시 요청 수 제한, 순서는 입력 순서 유지)
+    with ThreadPoolExecutor(max_workers=max(1, min(TTS_CHUNK_WORKERS, len(chunks)))) as pool:
+        results = list(pool.map(lambda chunk: phrase_audio(chunk.text, chunk.text in recurring), chunks))
+    
+    # 2. 청크별 앞뒤 무음 제거 + 음량 정규화
+    pieces = []
+    for content, _ in results:
+        samples, sample_rate = decode_linear16(content, SAMPLE_RATE_HERTZ)
+        if sample_rate != SAMPLE_RATE_HERTZ:
+            raise ValueError(f"예상과 다른 샘플레이트: {sample_rate}Hz")
+        pieces.append(normalize_loudness(trim_silence(samples, sample_rate), sample_rate, TTS_TARGET_DBFS))
+    
+    # 3. 정해진 쉼으로 연결 → MP3 인코딩
+    pcm, segments = stitch(pieces, chunks, SAMPLE_RATE_HERTZ, PAUSES)
+    audio_content = encode_mp3(pcm, SAMPLE_RATE_HERTZ, TTS_MP3_BIT_RATE)
+    for segment, (_, cached) in zip(segments, results):
+        segment["cached"] = cached
+    
+    logger.info(
+        f"분할 합성 완료: 청크 {len(chunks)}개 (문장 캐시 {sum(cached for _, cached in results)}개), "
+        f"{len(pcm) / SAMPLE_RATE_HERTZ:.2f}초, {time.monotonic() - started:.2f}초 소요"
     )
+    return audio_content, segments
+
+
+def prefetch_chunks(text: str) -> Dict[str, Any]:
+    """
+    스크립트 일부(문단)의 청크를 미리 합성해 문장 단위 캐시에 저장 (스트리밍 생성 중 TTS 선행 시작)
+    
+    전체 스크립트를 분할 합성할 때와 같은 split_chunks() 분할/키를 쓰므로,
+    나중에 전체 스크립트 요청이 오면 이 청크들은 합성 없이 캐시에서 연결됩니다.
+    (문단 경계에서는 항상 청크를 끊으므로 문단 단독 분할 = 전체 분할의 해당 문단 부분)
+    """
+    text = normalize_text(text)
+    sentences = split_sentences(text)
+    recurring = phrase_index.recurring(sentences) if TTS_PHRASE_CACHE_ENABLED else set()
+    chunks = split_chunks(text, TTS_CHUNK_MAX_CHARS, isolate=recurring.__contains__)
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(TTS_CHUNK_WORKERS, len(chunks)))) as pool:
+        results = list(pool.map(lambda chunk: phrase_audio(chunk.text, True), chunks))
+    
+    synthesized_characters = sum(len(chunk.text) for chunk, (_, cached) in zip(chunks, results) if not cached)
+    logger.info(f"문단 선행 합성: 청크 {len(chunks)}개 (캐시 {sum(cached for _, cached in results)}개)")
+    return {
+        "chunks": len(chunks),
+        "cached_chunks": sum(cached for _, cached in results),
+        "synthesized_characters": synthesized_characters,
+        "cost": round(synthesized_characters * 0.000016, 4)
+    }
+
+
+def round_segments(segments: List[Dict]) -> List[Dict]:
+    return [{**segment, "start": round(segment["start"], 3), "end": round(segment["end"], 3)} for segment in segments]
+
+
+def segment_metadata(segments: List[Dict]) -> str:
+    """캐시 메타데이터용 청크 경계 [[시작, 끝, 문장 수], ...] (텍스트는 문장 분할로 복원)"""
+    return json.dumps([
+        [segment["start"], segment["end"], len(split_sentences(segment["text"]))]
+        for segment in segments
+    ])
+
+
+def cached_segments(blob, text: str) -> List[Dict]:
+    """캐시 메타데이터의 청크 경계 + 청크 텍스트 (당시 청크 구성대로 문장을 다시 묶음)"""
+    bounds = json.loads((blob.metadata or {}).get("segment_bounds") or "[]")
+    sentences = split_sentences(text)
+    if not bounds or sum(count for _, _, count in bounds) != len(sentences):
+        return []
+    segments, position = [], 0
+    for index, (start, end, count) in enumerate(bounds):
+        segments.append({
+            "index": index,
+            "text": " ".join(sentences[position:position + count]),
+            "start": start,
+            "end": end,
+            "cached": True
+        })
+        position += count
+    return segments
+
+
+def measured_duration(audio_content: bytes) -> Optional[float]:
+    """MP3 프레임 헤더로 실제 재생 길이 측정 (실패 시 None)"""
+    try:
+        return mp3_duration(audio_content)
+    except ValueError as e:
+        logger.warning(f"음성 길이 측정 실패 (추정값 사용): {e}")
+        return None
+
+
+def cached_duration(blob) -> Optional[float]:
+    """캐시 메타데이터의 실측 길이 (없는 예전 항목은 내려받아 측정)"""
+    value = (blob.metadata or {}).get("duration_seconds")
+    if value:
+        return float(value)
+    try:
+        return measured_duration(blob.download_as_bytes())
+    except Exception as e:
+        logger.warning(f"캐시 오디오 다운로드 실패 (추정값 사용): {e}")
+        return None
+
+
+def generate_audio(
+    script_text: str,
+    output_filename: str,
+    use_cache: bool = True,
+    chunked: bool = None,
+    phrases: List[str] = ()
+) -> Dict[str, Any]:
+    """
+    Google Cloud TTS로 음성 생성 (캐시 적중 시 합성 생략)
+    
+    Args:
+        script_text: 스크립트 텍스트
+        output_filename: 출력 파일명 (예: "audio_20240101_120000.mp3")
+        use_cache: False면 캐시를 조회하지 않고 다시 합성 (결과는 캐시에 저장)
+        chunked: 문장 단위 분할 합성 여부 (None이면 TTS_CHUNKED, 입력 한도를 넘으면 항상 분할)
+            분할하지 않아도 반복 문장/고정 문구가 있으면 그 문장만 떼어내 문장 캐시에서 재사용하고
+            나머지는 문단 단위로 합성해 연결
+        phrases: 첫 등장부터 문장 단위로 캐시할 고정 문구 (예: 제품 CTA)
+    
+    Returns:
+        {
+            "audio_url": "gs://bucket/audios/audio_xxx.mp3",
+            "duration_seconds": 45.216,
+            "duration_exact": true,
+            "estimated_duration": 44.8,
+            "character_count": 350,
+            "cost": 0.016,
+            "synthesized_characters": 350,
+            "cache_hit": false,
+            "segments": [{"index": 0, "text": "...", "start": 0.0, "end": 2.41, "cached": false}, ...]
+        }
+    """
+    text = normalize_text(script_text)
+    logger.info(f"음성 생성 시작: {len(text)} 글자")
+    
+    # 입력 한도를 넘으면 단일 요청이 불가능하므로 항상 분할, 문장이 1개면 분할 이득이 없음
+    sentences = split_sentences(text)
+    if chunked is None:
+        chunked = TTS_CHUNKED
+    chunked = len(text.encode("utf-8")) > MAX_INPUT_BYTES or (chunked and len(sentences) > 1)
+    
+    # 반복 문장(CTA 등)은 분할 여부와 관계없이 단독 청크로 떼어내 문장 단위 캐시에서 재사용
+    recurring = phrase_index.recurring(sentences, phrases) if TTS_PHRASE_CACHE_ENABLED else set()
+    stitched = chunked or bool(recurring)
+    # 분할하지 않는 요청은 반복 문장 사이 구간을 문단 단위로 묶어 합성 (입력 한도까지)
+    max_chars = TTS_CHUNK_MAX_CHARS if chunked else MAX_INPUT_BYTES
+    
+    bucket = storage_client.bucket(BUCKET_NAME)
+    output_name = f"audios/{output_filename}"
+    key = cache_key(text, voice_settings(stitched, max_chars=max_chars))
+    segments = []
+    
+    # 1. 캐시 조회: 있으면 서버 측 복사만 하고 합성 생략
+    cached = tts_cache.get(key) if TTS_CACHE_ENABLED and use_cache else None
+    cache_hit = cached is not None
+    if cache_hit:
+        blob = tts_cache.copy_to(cached, output_name)
+        file_size = cached.size
+        cost = 0.0
+        synthesized_characters = 0
+        segments = cached_segments(cached, text) if stitched else []
+        measured = cached_duration(cached)
+        logger.info(f"TTS 캐시 적중: {key[:12]}")
+    else:
+        # 2. 합성 (분할 또는 단일 요청) → 캐시에 저장 후 출력 경로로 복사 (업로드 1회)
+        if stitched:
+            # 반복 문장은 단독 청크로 떼어내 문장 단위 캐시에서 재사용, 나머지만 합성
+            chunks = split_chunks(text, max_chars, isolate=recurring.__contains__)
+            audio_content, segments = synthesize_chunked(chunks, recurring)
+            segments = round_segments(segments)
+            synthesized_characters = sum(len(segment["text"]) for segment in segments if not segment["cached"])
+        else:
+            audio_content = synthesize(text)
+            synthesized_characters = len(text)
+        if TTS_PHRASE_CACHE_ENABLED:
+            reused = {}
+            for segment in segments:
+                if segment["cached"]:
+                    reused[segment["text"]] = reused.get(segment["text"], 0) + 1
+            phrase_index.record(sentences, reused)
+        file_size = len(audio_content)
+        measured = measured_duration(audio_content)
+        if TTS_CACHE_ENABLED:
+            try:
+                metadata = {
+                    "voice_name": VOICE_NAME,
+                    "speaking_rate": SPEAKING_RATE,
+                    "character_count": len(text)
+                }
+                if measured is not None:
+                    metadata["duration_seconds"] = round(measured, 3)
+                if segments:
+                    metadata["segment_bounds"] = segment_metadata(segments)
+                cached = tts_cache.put(key, audio_content, metadata)
+                blob = tts_cache.copy_to(cached, output_name)
+            except Exception as e:
+                logger.warning(f"TTS 캐시 저장 실패 (직접 업로드): {e}")
+                cached = None
+        if cached is None:
+            blob = bucket.blob(output_name)
+            blob.upload_from_string(audio_content, content_type="audio/mpeg")
+        
+        # Google Cloud TTS 비용: $16/1백만 글자 = $0.000016/글자 (캐시에서 가져온 문장은 제외)
+        cost = synthesized_characters * 0.000016
     
     # Public URL 생성 (임시, 나중에 Signed URL로 변경 가능)
-    audio_url = f"gs://{BUCKET_NAME}/audios/{output_filename}"
+    audio_url = f"gs://{BUCKET_NAME}/{output_name}"
     public_url = blob.public_url
     
-    # 6. 음성 길이 계산 (대략 1초당 6자 기준)
-    duration_seconds = len(script_text) / 6.0
-    
-    # 7. 비용 계산
-    # Google Cloud TTS 비용: $16/1백만 글자 = $0.000016/글자
-    cost = len(script_text) * 0.000016
+    # 3. 음성 길이: MP3 프레임 기준 실측값 (측정 실패 시에만 발화 길이 모델 추정값)
+    estimated_duration = duration_model.estimate(text)
+    duration_exact = measured is not None
+    duration_seconds = round(measured, 3) if duration_exact else round(estimated_duration, 1)
     
-    logger.info(f"음성 생성 완료: {audio_url}, {duration_seconds:.1f}초, ${cost:.4f}")
+    logger.info(
+        f"음성 생성 완료: {audio_url}, {duration_seconds:.2f}초"
+        f"{'' if duration_exact else ' (추정)'} / 예상 {estimated_duration:.1f}초, ${cost:.4f}"
+    )
     
     return {
         "audio_url": audio_url,
         "public_url": public_url,
-        "duration_seconds": round(duration_seconds, 1),
-        "character_count": len(script_text),
+        "duration_seconds": duration_seconds,
+        "duration_exact": duration_exact,
+        "estimated_duration": round(estimated_duration, 1),
+        "character_count": len(text),
         "cost": round(cost, 4),
-        "voice_name": "ko-KR-Neural2-A",
-        "file_size_bytes": len(response.audio_content)
+        "synthesized_characters": synthesized_characters,
+        "voice_name": VOICE_NAME,
+        "speaking_rate": SPEAKING_RATE,
+        "file_size_bytes": file_size,
+        "cache_hit": cache_hit,
+        "cache_key": key,
+        "chunked": chunked,
+        "phrase_isolated": stitched and not chunked,
+        "segments": segments
     }
 
 
@@ -116,22 +446,52 @@ def audio_generator(request):
     {
         "script_id": "script_20240101_120000",
         "script_text": "오늘은 AI 기술에 대해...",
-        "video_id": "video_20240101_120000"
+        "video_id": "video_20240101_120000",
+        "force": false,  (선택, true면 길이 범위 검사 생략)
+        "segment": false,  (선택, 스크립트 일부(문단) 선행 합성 - 길이 검사 없이 청크 캐시만 채움)
+        "no_cache": false,  (선택, true면 캐시를 무시하고 다시 합성)
+        "chunked": true,  (선택, 문장 단위 분할 합성 여부 - 기본은 TTS_CHUNKED)
+        "phrases": ["지금 바로 고정 댓글에서..."]  (선택, 첫 등장부터 문장 단위로 캐시할 문구 - 예: product_info의 cta, 분할 여부와 무관하게 적용)
     }
     
     출력:
     {
         "status": "success",
         "audio_url": "gs://bucket/audios/audio_xxx.mp3",
-        "duration_seconds": 45.2,
-        "cost": 0.016
+        "duration_seconds": 45.216,  (MP3 프레임 기준 실측)
+        "duration_exact": true,
+        "cost": 0.016,
+        "cache_hit": false
     }
+    
+    POST /evict-cache {"dry_run": false}: 오래된 TTS 캐시(스크립트/문장) 정리
+        - X-Admin-Token 헤더가 CACHE_ADMIN_TOKEN과 일치해야 함
+        - dry_run 기본값은 true (삭제 대상만 집계)
     """
     
     # Health Check
     if request.path == '/health':
         return json.dumps({'status': 'healthy', 'service': 'audio-generator'})
     
+    # TTS 캐시 정리 (Cloud Scheduler에서 주기적으로 호출)
+    if request.path == '/evict-cache':
+        if request.method != 'POST':
+            return json.dumps({'error': 'Method not allowed'}), 405
+        token = request.headers.get('X-Admin-Token', '')
+        if not CACHE_ADMIN_TOKEN or not hmac.compare_digest(token, CACHE_ADMIN_TOKEN):
+            logger.warning("TTS 캐시 정리 요청 거부: 인증 실패")
+            return json.dumps({'error': 'Forbidden'}), 403
+        try:
+            dry_run = (request.get_json(silent=True) or {}).get('dry_run', True) is not False
+            return json.dumps({
+                'status': 'success',
+                'scripts': tts_cache.evict(dry_run=dry_run),
+                'phrases': phrase_audio_cache.evict(dry_run=dry_run)
+            }), 200
+        except Exception as e:
+            logger.error(f"TTS 캐시 정리 실패: {str(e)}", exc_info=True)
+            return json.dumps({'status': 'error', 'error': str(e)}), 500
+    
     # CORS 처리
     if request.method == 'OPTIONS':
         headers = {
@@ -158,6 +518,23 @@ def audio_generator(request):
         if not script_text:
             return json.dumps({'error': 'Missing script_text'}), 400
         
+        # TTS 호출 전 길이 범위 검사 (전체 스크립트만, force=true 또는 문단 단위 요청이면 건너뜀)
+        is_segment = bool(request_json.get('segment'))
+        duration_status, estimated_duration = duration_model.check_bounds(script_text, *script_bounds())
+        if duration_status != 'ok' and not (request_json.get('force') or is_segment):
+            logger.warning(f"길이 범위 밖 스크립트 거부: {duration_status}, 예상 {estimated_duration:.1f}초")
+            return json.dumps({
+                'status': 'rejected',
+                'error': f'스크립트 길이 범위 밖 ({duration_status})',
+                'duration_status': duration_status,
+                'estimated_duration': round(estimated_duration, 1)
+            }, ensure_ascii=False), 422
+        
+        # 문단 단위 선행 요청: 청크 캐시만 채우고 MP3/Firestore는 쓰지 않음
+        if is_segment:
+            result = prefetch_chunks(script_text)
+            return json.dumps({'status': 'success', 'segment': True, **result}, ensure_ascii=False), 200
+        
         logger.info(f"음성 생성 요청: script_id={script_id}, 길이={len(script_text)}")
         
         # 2. 출력 파일명 생성
@@ -167,8 +544,21 @@ def audio_generator(request):
         
         output_filename = f"{video_id}.mp3"
         
+        # 스트리밍 생성 중 문단을 미리 합성해 둔 스크립트는 분할 합성으로 캐시된 청크를 이어 붙임
+        chunked = request_json.get('chunked')
+        if chunked is None and script_id:
+            script_doc = db.collection('scripts').document(script_id).get()
+            if script_doc.exists and script_doc.to_dict().get('audio_prefetched'):
+                chunked = True
+        
         # 3. 음성 생성
-        result = generate_audio(script_text, output_filename)
+        result = generate_audio(
+            script_text,
+            output_filename,
+            use_cache=not request_json.get('no_cache'),
+            chunked=chunked,
+            phrases=request_json.get('phrases') or ()
+        )
         
         # 4. Firestore에 메타데이터 저장
         if script_id:
@@ -176,6 +566,11 @@ def audio_generator(request):
             script_ref.update({
                 'audio_url': result['audio_url'],
                 'audio_duration': result['duration_seconds'],
+                'audio_duration_exact': result['duration_exact'],
+                'audio_duration_estimate': result['estimated_duration'],
+                'speaking_rate': result['speaking_rate'],
+                'audio_cache_hit': result['cache_hit'],
+                'audio_segments': result['segments'],
                 'audio_generated_at': firestore.SERVER_TIMESTAMP,
                 'phase3_status': 'completed'
             })
@@ -188,8 +583,12 @@ def audio_generator(request):
             'audio_url': result['audio_url'],
             'public_url': result['public_url'],
             'duration_seconds': result['duration_seconds'],
+            'duration_exact': result['duration_exact'],
             'character_count': result['character_count'],
-            'cost': result['cost']
+            'cost': result['cost'],
+            'synthesized_characters': result['synthesized_characters'],
+            'cache_hit': result['cache_hit'],
+            'segments': result['segments']
         }
         
         headers = {'Access-Control-Allow-Origin': '*'}
@@ -0,0 +1,149 @@
+"""
+MP3 길이 측정 (프레임 헤더 파싱, 외부 도구 불필요)
+- ID3v2 태그를 건너뛰고 MPEG 오디오 프레임 헤더를 끝까지 따라가며 프레임 수를 셈
+- 길이 = 프레임 수 × 프레임당 샘플 수 / 샘플레이트 (가변 비트레이트도 정확)
+- 첫 프레임이 Xing/Info 태그 프레임이면 오디오가 아니므로 제외
+- size_estimate: 파일 크기 ÷ 첫 프레임 비트레이트 (저장된 길이 교차 검증용, 인코더 지연/패딩 미반영)
+
+※ 3-audio-generator와 4-video-editor에 같은 파일을 둡니다 (서비스별 독립 배포).
+"""
+
+from typing import Dict, Optional, Tuple
+
+# 비트레이트 (kbps) - Layer III
+_BITRATES = {
+    "mpeg1": (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    "mpeg2": (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+}
+
+# 샘플레이트 (Hz) - 버전 비트별
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),  # MPEG-1
+    2: (22050, 24000, 16000),  # MPEG-2
+    0: (11025, 12000, 8000)    # MPEG-2.5
+}
+
+
+def _id3v2_size(data: bytes) -> int:
+    """파일 앞 ID3v2 태그 크기 (없으면 0)"""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def parse_frame_header(data: bytes, offset: int) -> Optional[Dict]:
+    """
+    offset 위치의 Layer III 프레임 헤더 파싱
+
+    Returns:
+        {"length": 프레임 바이트 수, "samples": 프레임당 샘플 수, "sample_rate": Hz, "bitrate": bps, "mono": bool}
+        유효한 헤더가 아니면 None
+    """
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _BITRATES["mpeg1" if mpeg1 else "mpeg2"][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    return {
+        "length": (144 if mpeg1 else 72) * bitrate // sample_rate + padding,
+        "samples": 1152 if mpeg1 else 576,
+        "sample_rate": sample_rate,
+        "bitrate": bitrate,
+        "mono": (b3 >> 6) == 3,
+        "mpeg1": mpeg1
+    }
+
+
+def _info_tag_offset(offset: int, header: Dict) -> int:
+    """Xing/Info 태그 위치 (프레임 헤더 + 사이드 정보 뒤)"""
+    if header["mpeg1"]:
+        side_info = 17 if header["mono"] else 32
+    else:
+        side_info = 9 if header["mono"] else 17
+    return offset + 4 + side_info
+
+
+def _is_info_frame(data: bytes, offset: int, header: Dict) -> bool:
+    """Xing/Info 태그 프레임 여부 (사이드 정보 뒤에 태그가 위치)"""
+    tag_offset = _info_tag_offset(offset, header)
+    return data[tag_offset:tag_offset + 4] in (b"Xing", b"Info")
+
+
+def frame_stats(data: bytes) -> Tuple[int, int, int]:
+    """
+    오디오 프레임 수 / 프레임당 샘플 수 / 샘플레이트
+
+    Raises:
+        ValueError: MP3 프레임을 찾지 못한 경우
+    """
+    offset = _id3v2_size(data)
+    frames, samples, sample_rate = 0, 0, 0
+    first = True
+    while offset + 4 <= len(data):
+        header = parse_frame_header(data, offset)
+        if header is None or offset + header["length"] > len(data):
+            if frames:
+                # 끝의 ID3v1("TAG")/잘린 프레임 등은 무시
+                break
+            offset += 1  # 첫 프레임 동기 찾기
+            continue
+        if not (first and _is_info_frame(data, offset, header)):
+            frames += 1
+            samples, sample_rate = header["samples"], header["sample_rate"]
+        first = False
+        offset += header["length"]
+
+    if not frames:
+        raise ValueError("MP3 프레임을 찾을 수 없습니다")
+    return frames, samples, sample_rate
+
+
+def mp3_duration(data: bytes) -> float:
+    """MP3 바이트의 재생 길이 (초)"""
+    frames, samples, sample_rate = frame_stats(data)
+    return frames * samples / sample_rate
+
+
+def size_estimate(data: bytes) -> float:
+    """
+    파일 크기 기반 재생 길이 추정 (초)
+    - 고정 비트레이트: (오디오 바이트 수 × 8) / 첫 프레임 비트레이트
+    - Xing/Info 태그에 프레임 수가 있으면 그 값 사용 (가변 비트레이트)
+    - 프레임을 끝까지 따라가지 않으므로 잘린 파일/다른 파일과 저장값의 불일치 확인에 사용
+
+    Raises:
+        ValueError: MP3 프레임을 찾지 못한 경우
+    """
+    offset = _id3v2_size(data)
+    while offset + 4 <= len(data) and parse_frame_header(data, offset) is None:
+        offset += 1
+    header = parse_frame_header(data, offset)
+    if header is None:
+        raise ValueError("MP3 프레임을 찾을 수 없습니다")
+
+    if _is_info_frame(data, offset, header):
+        tag_offset = _info_tag_offset(offset, header)
+        flags = int.from_bytes(data[tag_offset + 4:tag_offset + 8], "big")
+        if flags & 0x01:
+            frames = int.from_bytes(data[tag_offset + 8:tag_offset + 12], "big")
+            return frames * header["samples"] / header["sample_rate"]
+        offset += header["length"]
+
+    audio_bytes = len(data) - offset
+    if data[-128:-125] == b"TAG":
+        audio_bytes -= 128  # ID3v1
+    return audio_bytes * 8 / header["bitrate"]
@@ -0,0 +1,111 @@
+"""
+반복 문장(phrase) 감지
+- 짧은 문장(CTA, 인트로 등)의 등장 횟수를 Firestore tts_phrases/{문장 해시}에 Increment로 누적
+- 누적 횟수가 min_count 이상이거나 고정 문구(pinned)면 반복 문장으로 판정
+  → 분할 합성 시 독립 청크로 떼어내 문장 단위 오디오 캐시에서 재사용
+- 조회는 get_all 1회, 기록은 WriteBatch 1회 (요청당)
+"""
+
+import hashlib
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+from google.cloud import firestore
+
+from tts_cache import normalize_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def phrase_id(text: str) -> str:
+    """문장 문서 ID (음성 설정과 무관한 텍스트 해시)"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class PhraseIndex:
+    """문장 등장 횟수 기반 반복 문장 판정"""
+
+    def __init__(
+        self,
+        db,
+        min_count: int = 2,
+        max_chars: int = 60,
+        pinned: Iterable[str] = (),
+        collection: str = "tts_phrases"
+    ):
+        """
+        Args:
+            db: Firestore 클라이언트
+            min_count: 반복 문장으로 볼 최소 등장 횟수 (이번 요청 포함)
+            max_chars: 집계 대상 문장 최대 길이 (긴 본문 문장은 거의 반복되지 않으므로 제외)
+            pinned: 첫 등장부터 캐시할 고정 문구 (예: 제품 CTA)
+            collection: 집계 컬렉션 이름
+        """
+        self.db = db
+        self.min_count = min_count
+        self.max_chars = max_chars
+        self.pinned = {normalize_text(text) for text in pinned if text and text.strip()}
+        self.collection = db.collection(collection)
+
+    def candidates(self, sentences: List[str]) -> Counter:
+        """집계 대상 문장별 이번 요청 내 등장 횟수"""
+        return Counter(sentence for sentence in sentences if len(sentence) <= self.max_chars)
+
+    def recurring(self, sentences: List[str], pinned: Iterable[str] = ()) -> Set[str]:
+        """
+        반복 문장 판정 (조회 실패 시 고정 문구만 반환)
+
+        Args:
+            sentences: 스크립트 문장 목록
+            pinned: 이번 요청에만 적용할 고정 문구
+        """
+        counts = self.candidates(sentences)
+        pinned = self.pinned | {normalize_text(text) for text in pinned if text and text.strip()}
+        recurring = {sentence for sentence in sentences if sentence in pinned}
+        if not counts:
+            return recurring
+
+        try:
+            refs = [self.collection.document(phrase_id(sentence)) for sentence in counts]
+            previous = {
+                snapshot.id: (snapshot.to_dict() or {}).get("count", 0)
+                for snapshot in self.db.get_all(refs)
+                if snapshot.exists
+            }
+        except Exception as e:
+            logger.warning(f"반복 문장 조회 실패 (고정 문구만 사용): {e}")
+            return recurring
+
+        for sentence, occurrences in counts.items():
+            if previous.get(phrase_id(sentence), 0) + occurrences >= self.min_count:
+                recurring.add(sentence)
+        return recurring
+
+    def record(self, sentences: List[str], cached: Dict[str, int] = None):
+        """
+        등장 횟수/캐시 적중 횟수 누적
+
+        Args:
+            sentences: 스크립트 문장 목록
+            cached: {문장: 캐시에서 가져온 횟수}
+        """
+        counts = self.candidates(sentences)
+        if not counts:
+            return
+        cached = cached or {}
+        try:
+            batch = self.db.batch()
+            for sentence, occurrences in counts.items():
+                hits = cached.get(sentence, 0)
+                batch.set(self.collection.document(phrase_id(sentence)), {
+                    "text": sentence,
+                    "count": firestore.Increment(occurrences),
+                    "cache_hits": firestore.Increment(hits),
+                    "characters_saved": firestore.Increment(hits * len(sentence)),
+                    "last_seen_at": firestore.SERVER_TIMESTAMP
+                }, merge=True)
+            batch.commit()
+        except Exception as e:
+            logger.warning(f"반복 문장 집계 실패: {e}")
@@ -0,0 +1,180 @@
+"""
+TTS 오디오 캐시 (콘텐츠 주소 방식)
+- 키: 정규화한 텍스트 + 음성 이름 + speaking_rate + pitch + 샘플레이트 + 효과 프로필의 SHA-256
+- 저장 위치: gs://{bucket}/audios/cache/{키}.mp3
+- 적중 시 합성 없이 서버 측 복사(copy_blob)로 audios/{파일명}에 배치 (다운로드/업로드 없음)
+- 마지막 사용 시각(last_used_at 메타데이터) 기준 오래된 항목 삭제 + 전체 용량 상한 초과 시 오래된 순으로 삭제
+"""
+
+import re
+import json
+import hashlib
+import logging
+import unicodedata
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_SPACES = re.compile(r"[ \t\u00a0\u3000]+")
+_BLANK_LINES = re.compile(r"\n\s*\n")
+
+
+def normalize_text(text: str) -> str:
+    """
+    캐시 키/합성용 텍스트 정규화
+    - 유니코드 NFC (조합형 한글 통일)
+    - 줄 앞뒤 공백 제거, 연속 공백 1개로
+    - 연속 빈 줄은 빈 줄 1개로 (문단 경계는 쉼 길이에 영향이 있으므로 유지)
+    """
+    text = unicodedata.normalize("NFC", text or "")
+    lines = [_SPACES.sub(" ", line).strip() for line in text.replace("\r\n", "\n").split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def cache_key(text: str, voice: Dict) -> str:
+    """
+    캐시 키 (같은 텍스트라도 음성 설정이 다르면 다른 키)
+
+    Args:
+        text: normalize_text()를 거친 텍스트
+        voice: 음성 설정 (voice_name, speaking_rate, pitch, sample_rate_hertz, effects_profile_id 등)
+    """
+    payload = json.dumps({"text": text, "voice": voice}, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Cloud Storage 기반 TTS 결과 캐시"""
+
+    def __init__(
+        self,
+        bucket,
+        prefix: str = "audios/cache",
+        extension: str = ".mp3",
+        max_bytes: int = 2 * 1024 ** 3,
+        max_age_days: float = 30,
+        touch_interval_seconds: float = 3600,
+        clock: Callable[[], datetime] = None
+    ):
+        """
+        Args:
+            bucket: Cloud Storage 버킷
+            prefix: 캐시 경로 접두사
+            extension: 파일 확장자
+            max_bytes: 캐시 전체 용량 상한 (0이면 무제한)
+            max_age_days: 마지막 사용 후 보관 기간 (0이면 무제한)
+            touch_interval_seconds: 적중 시 last_used_at 갱신 최소 간격 (메타데이터 쓰기 횟수 절감)
+            clock: 현재 시각 함수 (UTC, 테스트용)
+        """
+        self.bucket = bucket
+        self.prefix = prefix.rstrip("/")
+        self.extension = extension
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.touch_interval_seconds = touch_interval_seconds
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+
+    def blob_name(self, key: str) -> str:
+        return f"{self.prefix}/{key}{self.extension}"
+
+    def _last_used(self, blob) -> datetime:
+        """마지막 사용 시각 (메타데이터가 없으면 업로드/수정 시각)"""
+        value = (blob.metadata or {}).get("last_used_at")
+        if value:
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                pass
+        return blob.updated or blob.time_created or self.clock()
+
+    def get(self, key: str):
+        """
+        캐시 조회
+
+        Returns:
+            캐시 blob (없으면 None)
+        """
+        try:
+            blob = self.bucket.get_blob(self.blob_name(key))
+        except Exception as e:
+            logger.warning(f"TTS 캐시 조회 실패 (합성으로 진행): {e}")
+            return None
+        if blob is None:
+            return None
+
+        now = self.clock()
+        if (now - self._last_used(blob)).total_seconds() >= self.touch_interval_seconds:
+            try:
+                blob.metadata = {**(blob.metadata or {}), "last_used_at": now.isoformat()}
+                blob.patch()
+            except Exception as e:
+                logger.warning(f"TTS 캐시 사용 시각 갱신 실패: {e}")
+        return blob
+
+    def put(self, key: str, audio_content: bytes, metadata: Dict = None, content_type: str = "audio/mpeg"):
+        """합성 결과 저장 (메타데이터 값은 문자열로 저장됨)"""
+        blob = self.bucket.blob(self.blob_name(key))
+        blob.metadata = {
+            **{name: str(value) for name, value in (metadata or {}).items()},
+            "last_used_at": self.clock().isoformat()
+        }
+        blob.upload_from_string(audio_content, content_type=content_type)
+        return blob
+
+    def copy_to(self, blob, destination_name: str):
+        """캐시 blob을 출력 경로로 서버 측 복사"""
+        return self.bucket.copy_blob(blob, self.bucket, destination_name)
+
+    def evict(self, dry_run: bool = False) -> Dict:
+        """
+        오래된 항목 정리
+        1. 마지막 사용 후 max_age_days가 지난 항목 삭제
+        2. 남은 용량이 max_bytes를 넘으면 마지막 사용이 오래된 순으로 삭제
+
+        Returns:
+            {"scanned": n, "deleted": n, "freed_bytes": n, "remaining_bytes": n}
+        """
+        now = self.clock()
+        blobs = sorted(self.bucket.list_blobs(prefix=f"{self.prefix}/"), key=self._last_used)
+
+        expired: List = []
+        kept: List = []
+        for blob in blobs:
+            age_days = (now - self._last_used(blob)).total_seconds() / 86400
+            (expired if self.max_age_days and age_days > self.max_age_days else kept).append(blob)
+
+        remaining = sum(blob.size or 0 for blob in kept)
+        over_size: List = []
+        while self.max_bytes and remaining > self.max_bytes and kept:
+            blob = kept.pop(0)
+            over_size.append(blob)
+            remaining -= blob.size or 0
+
+        deleted = 0
+        freed = 0
+        for blob in expired + over_size:
+            if not dry_run:
+                try:
+                    blob.delete()
+                except Exception as e:
+                    # 다른 인스턴스가 먼저 지운 경우 등
+                    logger.warning(f"TTS 캐시 삭제 실패 ({blob.name}): {e}")
+                    continue
+            deleted += 1
+            freed += blob.size or 0
+
+        logger.info(
+            f"TTS 캐시 정리{' (dry run)' if dry_run else ''}: {len(blobs)}개 중 {deleted}개 삭제 "
+            f"(만료 {len(expired)}, 용량 초과 {len(over_size)}), {freed} bytes 확보"
+        )
+        return {
+            "scanned": len(blobs),
+            "deleted": deleted,
+            "expired": len(expired),
+            "over_size": len(over_size),
+            "freed_bytes": freed,
+            "remaining_bytes": remaining
+        }
+
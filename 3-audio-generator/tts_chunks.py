@@ -0,0 +1,223 @@
+"""
+문장 단위 분할 합성 + 이음새 없는 연결
+- 스크립트를 문장 경계에서 청크로 분할 (문단 경계에서는 항상 끊고, 짧은 문장은 max_chars까지 묶음)
+- 반복 문장(CTA 등)은 문장 단위 캐시에서 재사용할 수 있도록 독립 청크로 분리
+- 청크는 LINEAR16(PCM)으로 합성해 앞뒤 무음을 잘라내고 음량을 목표 레벨로 맞춤
+- 청크 사이에 정해진 길이의 쉼(문장/문단)을 넣어 하나의 PCM으로 연결 → MP3 인코딩 (lameenc)
+- 청크별 시작/끝 시각은 연결한 PCM의 샘플 수로 계산
+  (MP3 인코더/디코더 지연(약 50ms)은 반영하지 않으므로 재생 시각과는 그만큼 차이가 날 수 있음)
+"""
+
+import io
+import re
+import wave
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import lameenc
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cloud TTS 요청 1회 입력 한도 (bytes)
+MAX_INPUT_BYTES = 5000
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_SOFT_BREAK = re.compile(r"(?<=[,·:;])\s+|\s+")
+
+
+@dataclass
+class Chunk:
+    """합성 단위 (pause_after: 이 청크 뒤에 넣을 쉼 종류)"""
+    text: str
+    pause_after: str = "sentence"
+
+
+def _fit_bytes(sentence: str, max_bytes: int) -> List[str]:
+    """입력 한도를 넘는 문장은 쉼표 → 공백 순으로 나눔"""
+    if len(sentence.encode("utf-8")) <= max_bytes:
+        return [sentence]
+    parts, current = [], ""
+    for piece in _SOFT_BREAK.split(sentence):
+        candidate = f"{current} {piece}".strip()
+        if current and len(candidate.encode("utf-8")) > max_bytes:
+            parts.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        parts.append(current)
+    # 공백 없이 한도를 넘는 조각은 바이트 기준으로 자름 (문자 경계 유지)
+    fitted = []
+    for part in parts:
+        while len(part.encode("utf-8")) > max_bytes:
+            cut = len(part.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore"))
+            fitted.append(part[:cut])
+            part = part[cut:]
+        fitted.append(part)
+    return fitted
+
+
+def split_paragraphs(text: str, max_bytes: int = MAX_INPUT_BYTES) -> List[List[str]]:
+    """문단별 문장 목록 (입력 한도를 넘는 문장은 나눔)"""
+    return [
+        [
+            part
+            for sentence in _SENTENCE_END.split(" ".join(paragraph.split()))
+            if sentence
+            for part in _fit_bytes(sentence, max_bytes)
+        ]
+        for paragraph in _PARAGRAPH.split(text.strip())
+        if paragraph.strip()
+    ]
+
+
+def split_sentences(text: str, max_bytes: int = MAX_INPUT_BYTES) -> List[str]:
+    return [sentence for paragraph in split_paragraphs(text, max_bytes) for sentence in paragraph]
+
+
+def split_chunks(
+    text: str,
+    max_chars: int = 120,
+    max_bytes: int = MAX_INPUT_BYTES,
+    isolate: Callable[[str], bool] = None
+) -> List[Chunk]:
+    """
+    문장 경계 기준 청크 분할
+
+    Args:
+        text: normalize_text()를 거친 스크립트
+        max_chars: 청크 1개에 묶을 최대 글자 수 (0이면 문장마다 청크 1개)
+        max_bytes: 청크 1개의 최대 바이트 (TTS 입력 한도)
+        isolate: True를 반환하는 문장은 앞뒤 문장과 묶지 않고 단독 청크로 (문장 단위 캐시용)
+    """
+    chunks: List[Chunk] = []
+    for sentences in split_paragraphs(text, max_bytes):
+        current = ""
+        for sentence in sentences:
+            if isolate and isolate(sentence):
+                if current:
+                    chunks.append(Chunk(current))
+                chunks.append(Chunk(sentence))
+                current = ""
+                continue
+            candidate = f"{current} {sentence}".strip()
+            if current and (len(candidate) > max_chars or len(candidate.encode("utf-8")) > max_bytes):
+                chunks.append(Chunk(current))
+                current = sentence
+            else:
+                current = candidate
+        if current:
+            chunks.append(Chunk(current))
+        if chunks:
+            chunks[-1].pause_after = "paragraph"
+    if chunks:
+        chunks[-1].pause_after = "end"
+    return chunks
+
+
+def decode_linear16(audio_content: bytes, sample_rate: int) -> Tuple[np.ndarray, int]:
+    """LINEAR16 응답 → float32 PCM (-1~1), 샘플레이트 (WAV 헤더가 있으면 헤더 값 사용)"""
+    if audio_content[:4] == b"RIFF":
+        with wave.open(io.BytesIO(audio_content)) as wav:
+            sample_rate = wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+            channels = wav.getnchannels()
+    else:
+        frames, channels = audio_content, 1
+    samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, threshold_db: float = -45.0, margin_ms: float = 30.0) -> np.ndarray:
+    """앞뒤 무음 제거 (자음이 잘리지 않도록 margin_ms만큼 남김)"""
+    if not len(samples):
+        return samples
+    window = max(1, sample_rate // 100)  # 10ms
+    usable = len(samples) // window * window
+    if not usable:
+        return samples
+    rms = np.sqrt(np.mean(samples[:usable].reshape(-1, window) ** 2, axis=1))
+    active = np.flatnonzero(rms > 10 ** (threshold_db / 20))
+    if not len(active):
+        return samples[:0]
+    margin = int(sample_rate * margin_ms / 1000)
+    start = max(0, active[0] * window - margin)
+    end = min(len(samples), (active[-1] + 1) * window + margin)
+    return samples[start:end]
+
+
+def loudness_db(samples: np.ndarray, sample_rate: int, gate_db: float = -45.0) -> float:
+    """발화 구간(게이트 이상 10ms 창)의 RMS 레벨 (dBFS)"""
+    window = max(1, sample_rate // 100)
+    usable = len(samples) // window * window
+    if not usable:
+        return float("-inf")
+    power = np.mean(samples[:usable].reshape(-1, window) ** 2, axis=1)
+    gated = power[power > 10 ** (gate_db / 10)]
+    if not len(gated):
+        return float("-inf")
+    return float(10 * np.log10(np.mean(gated)))
+
+
+def normalize_loudness(samples: np.ndarray, sample_rate: int, target_db: float = -18.0, peak: float = 0.98) -> np.ndarray:
+    """목표 레벨로 이득 조정 (피크가 peak를 넘지 않도록 제한)"""
+    level = loudness_db(samples, sample_rate)
+    if not np.isfinite(level):
+        return samples
+    gain = 10 ** ((target_db - level) / 20)
+    max_abs = float(np.max(np.abs(samples))) if len(samples) else 0.0
+    if max_abs * gain > peak:
+        gain = peak / max_abs
+    return samples * gain
+
+
+def stitch(
+    pieces: List[np.ndarray],
+    chunks: List[Chunk],
+    sample_rate: int,
+    pauses: Dict[str, float]
+) -> Tuple[np.ndarray, List[Dict]]:
+    """
+    청크 PCM 연결
+
+    Args:
+        pieces: 청크별 PCM (trim/normalize 완료)
+        chunks: split_chunks() 결과 (pause_after 참조)
+        pauses: {"sentence": 초, "paragraph": 초, "end": 초}
+
+    Returns:
+        (연결된 PCM, [{"index", "text", "start", "end"}, ...]) - 시각은 초 (PCM 샘플 수 기준, MP3 인코더 지연 미포함)
+    """
+    parts, segments, position = [], [], 0
+    for index, (samples, chunk) in enumerate(zip(pieces, chunks)):
+        segments.append({
+            "index": index,
+            "text": chunk.text,
+            "start": position / sample_rate,
+            "end": (position + len(samples)) / sample_rate
+        })
+        parts.append(samples)
+        position += len(samples)
+        gap = int(round(pauses.get(chunk.pause_after, 0.0) * sample_rate))
+        if gap:
+            parts.append(np.zeros(gap, dtype=np.float32))
+            position += gap
+    pcm = np.concatenate(parts).astype(np.float32) if parts else np.zeros(0, dtype=np.float32)
+    return pcm, segments
+
+
+def encode_mp3(samples: np.ndarray, sample_rate: int, bit_rate: int = 160) -> bytes:
+    """float PCM → MP3 (모노)"""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(bit_rate)
+    encoder.set_in_sample_rate(sample_rate)
+    encoder.set_channels(1)
+    encoder.set_quality(2)  # 2: 고품질
+    return bytes(encoder.encode(pcm) + encoder.flush())
@@ -0,0 +1,81 @@
+"""
+프로세스 전역 클라이언트 레지스트리
+- 이름별 keep-alive requests.Session 재사용 (TCP/TLS 핸드셰이크 1회)
+- OpenAI 클라이언트 재사용 (내부 httpx 커넥션 풀 공유)
+- LLM 백엔드 재사용 (openai 백엔드는 위 OpenAI 클라이언트의 커넥션 풀 공유)
+- 웜 인스턴스에서는 첫 요청 이후 연결 비용이 사라짐
+- get_session()은 서비스별 client_registry.py 사본(1/4/5/6) 모두 같은 시그니처/재시도 규칙
+  (서비스는 독립 배포되므로 파일을 복사해 두며, 나머지 함수만 서비스별로 다름)
+"""
+
+import os
+import logging
+import threading
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from openai import OpenAI
+from llm_backend import create_backend
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_sessions: Dict[str, requests.Session] = {}
+_clients: Dict[str, object] = {}
+
+
+def get_session(name: str = "default", pool_size: int = 16, retries: int = 2) -> requests.Session:
+    """
+    이름별 공유 세션
+
+    Args:
+        name: 세션 이름 (대상 서비스별로 구분)
+        pool_size: 호스트당 유지할 keep-alive 커넥션 수
+        retries: 연결 오류/5xx GET 재시도 횟수
+    """
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            retry = Retry(
+                total=retries,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD"})
+            )
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[name] = session
+            logger.info(f"HTTP 세션 생성: {name} (pool={pool_size})")
+        return session
+
+
+def get_openai_client() -> OpenAI:
+    """공유 OpenAI 클라이언트"""
+    with _lock:
+        client = _clients.get("openai")
+        if client is None:
+            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            _clients["openai"] = client
+            logger.info("OpenAI 클라이언트 생성")
+        return client
+
+
+def get_llm_backend(render=None):
+    """
+    공유 LLM 백엔드 (LLM_BACKEND=openai | template)
+
+    Args:
+        render: template 백엔드의 응답 생성 함수 (첫 호출에서만 사용)
+    """
+    with _lock:
+        backend = _clients.get("llm")
+        if backend is None:
+            client = get_openai_client() if os.getenv("LLM_BACKEND", "openai") == "openai" else None
+            backend = create_backend(render=render, client=client)
+            _clients["llm"] = backend
+        return backend
@@ -15,6 +15,7 @@ from google.cloud import firestore, storage
 import logging
 from pexels_downloader import PexelsDownloader
 from subtitle_generator import SubtitleGenerator
+from mp3_duration import size_estimate
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,6 +26,8 @@ app = Flask(__name__)
 GCP_PROJECT = os.getenv("GCP_PROJECT_ID")
 STORAGE_BUCKET = os.getenv("STORAGE_BUCKET_NAME")
 PEXELS_API_KEY = os.getenv("PEXELS_API_KEY")
+# 저장된 음성 길이와 다운로드한 파일의 크기 기반 추정값이 이만큼(초) 넘게 다르면 ffprobe로 다시 측정
+AUDIO_DURATION_TOLERANCE = float(os.getenv("AUDIO_DURATION_TOLERANCE", "0.5"))
 
 # 클라이언트 초기화
 db = firestore.Client(project=GCP_PROJECT)
@@ -96,6 +99,29 @@ def get_audio_duration(audio_path: str) -> float:
         return 0.0
 
 
+def stored_audio_duration(script_data: dict, audio_path: str):
+    """
+    Firestore에 저장된 실측 음성 길이 확인
+    - 다운로드한 MP3의 크기 기반 추정값과 AUDIO_DURATION_TOLERANCE 이내로 맞을 때만 사용
+    - 저장값이 없거나 어긋나면 None (호출부에서 ffprobe로 측정)
+    """
+    if not (script_data.get("audio_duration_exact") and script_data.get("audio_duration")):
+        return None
+    stored = float(script_data["audio_duration"])
+    try:
+        with open(audio_path, "rb") as f:
+            estimated = size_estimate(f.read())
+    except (OSError, ValueError) as e:
+        logger.warning(f"음성 크기 기반 길이 추정 실패, ffprobe 사용: {e}")
+        return None
+    
+    if abs(stored - estimated) > AUDIO_DURATION_TOLERANCE:
+        logger.warning(f"저장된 음성 길이 {stored:.2f}초 ≠ 파일 추정 {estimated:.2f}초, ffprobe로 다시 측정")
+        return None
+    logger.info(f"음성 길이 (저장된 실측값): {stored:.2f}초 / 파일 추정 {estimated:.2f}초")
+    return stored
+
+
 def combine_video_clips(clip_paths: list, target_duration: float, output_path: str) -> bool:
     """
     여러 Pexels 클립을 연결하여 목표 길이에 맞춤
@@ -273,8 +299,10 @@ def edit_video():
         if not download_audio(audio_url, audio_path):
             return jsonify({"error": "음성 다운로드 실패"}), 500
         
-        # 2. 음성 길이 측정
-        audio_duration = get_audio_duration(audio_path)
+        # 2. 음성 길이: 음성 생성기가 MP3 프레임으로 실측해 저장했으면 사용, 아니면 ffprobe
+        audio_duration = stored_audio_duration(script_data, audio_path)
+        if audio_duration is None:
+            audio_duration = get_audio_duration(audio_path)
         
         if audio_duration == 0:
             return jsonify({"error": "음성 길이 측정 실패"}), 500
@@ -298,8 +326,10 @@ def edit_video():
         # Whisper API 우선 시도
         if not subtitle_gen.generate_from_audio(audio_path, subtitle_path):
             logger.warning("Whisper API 실패, Fallback으로 전환")
-            # Fallback: 스크립트 기반 자막 생성
-            subtitle_gen.generate_from_script(script_text, audio_duration, subtitle_path)
+            # Fallback: 음성 생성기의 청크 구간(정확한 시각) → 없으면 스크립트 기반 자막 생성
+            audio_segments = script_data.get("audio_segments")
+            if not (audio_segments and subtitle_gen.generate_from_segments(audio_segments, subtitle_path)):
+                subtitle_gen.generate_from_script(script_text, audio_duration, subtitle_path)
         
         # 6. 최종 영상 합성 (한글 폰트 적용 ⭐)
         final_video_path = f"/tmp/final_{script_id}.mp4"
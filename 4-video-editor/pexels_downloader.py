@@ -6,15 +6,17 @@ Pexels API를 활용한 배경 영상 자동 다운로드
 """
 
 import os
-import requests
 from typing import List, Dict, Optional
 import logging
 from dataclasses import dataclass
-from openai import OpenAI
+from client_registry import get_session, get_llm_backend
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 키워드 추출 모델 (비용 절약용 소형 모델)
+KEYWORD_MODEL = os.getenv("KEYWORD_MODEL", "gpt-4o-mini")
+
 @dataclass
 class VideoClip:
     """Pexels 비디오 클립 정보"""
@@ -33,7 +35,10 @@ class PexelsDownloader:
         self.api_key = api_key
         self.base_url = "https://api.pexels.com/videos"
         self.headers = {"Authorization": api_key}
-        self.openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # 프로세스 전역 클라이언트 재사용 (요청마다 새 연결/클라이언트 생성 방지)
+        self.session = get_session("pexels-api")
+        self.media_session = get_session("pexels-media", pool_size=4)
+        self.llm = get_llm_backend(render=_template_keywords)
         
     def extract_keywords(self, script: str) -> List[str]:
         """
@@ -48,9 +53,9 @@ class PexelsDownloader:
         try:
             logger.info("GPT-4o로 키워드 추출 중...")
             
-            # GPT-4o에게 키워드 추출 요청
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",  # 비용 절약
+            # GPT-4o에게 키워드 추출 요청 (재시도/타임아웃은 LLM 백엔드에서 처리)
+            completion = self.llm.complete(
+                model=KEYWORD_MODEL,
                 messages=[
                     {
                         "role": "system",
@@ -71,7 +76,7 @@ class PexelsDownloader:
                 max_tokens=50
             )
             
-            keywords_text = response.choices[0].message.content.strip()
+            keywords_text = completion.text
             keywords = [k.strip() for k in keywords_text.split(',')][:3]
             
             logger.info(f"GPT-4o 키워드 추출 결과: {keywords}")
@@ -87,7 +92,8 @@ class PexelsDownloader:
             logger.error(f"GPT-4o 키워드 추출 실패: {e}")
             return self._fallback_keywords(script)
     
-    def _fallback_keywords(self, script: str) -> List[str]:
+    @staticmethod
+    def _fallback_keywords(script: str) -> List[str]:
         """
         GPT-4o 실패 시 Fallback 키워드 추출
         
@@ -154,7 +160,7 @@ class PexelsDownloader:
                 "per_page": 15  # 충분한 선택지
             }
             
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/search",
                 headers=self.headers,
                 params=params,
@@ -207,7 +213,7 @@ class PexelsDownloader:
         try:
             logger.info(f"영상 다운로드 중: {clip.download_url}")
             
-            response = requests.get(clip.download_url, stream=True, timeout=120)
+            response = self.media_session.get(clip.download_url, stream=True, timeout=120)
             response.raise_for_status()
             
             with open(output_path, 'wb') as f:
@@ -276,6 +282,12 @@ class PexelsDownloader:
         return downloaded_files
 
 
+def _template_keywords(messages: List[Dict], rng) -> str:
+    """LLM_BACKEND=template일 때의 키워드 응답 (정적 매핑 사용, API 호출 없음)"""
+    script = messages[-1]["content"].split("스크립트:\n", 1)[-1]
+    return ", ".join(PexelsDownloader._fallback_keywords(script))
+
+
 def test_pexels_downloader():
     """테스트 함수"""
     api_key = os.getenv("PEXELS_API_KEY")
@@ -311,3 +323,4 @@ def test_pexels_downloader():
 
 if __name__ == "__main__":
     test_pexels_downloader()
+
@@ -4,8 +4,8 @@
 
 import os
 import logging
-from openai import OpenAI
 from typing import List, Dict
+from client_registry import get_openai_client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,7 +15,7 @@ class SubtitleGenerator:
     """Whisper API 기반 자막 생성기"""
     
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_openai_client()
     
     def generate_from_audio(self, audio_path: str, output_srt_path: str) -> bool:
         """
@@ -101,6 +101,29 @@ class SubtitleGenerator:
         
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
     
+    def generate_from_segments(self, segments: List[Dict], output_srt_path: str) -> bool:
+        """
+        음성 생성기가 저장한 청크 구간(audio_segments)으로 자막 생성
+        
+        Note: 구간 시각은 합성 샘플 수 기준 (MP3 인코더 지연 약 50ms 오차, Whisper 실패 시 스크립트 균등 분할보다 우선)
+        
+        Args:
+            segments: [{"text", "start", "end"}, ...]
+            output_srt_path: 출력 SRT 파일 경로
+        """
+        try:
+            srt_content = self._convert_to_srt(segments)
+            
+            with open(output_srt_path, 'w', encoding='utf-8') as f:
+                f.write(srt_content)
+            
+            logger.info(f"구간 기반 자막 생성 완료: {output_srt_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"구간 기반 자막 생성 실패: {e}")
+            return False
+    
     def generate_from_script(self, script: str, audio_duration: float, output_srt_path: str) -> bool:
         """
         스크립트 텍스트와 음성 길이로 자막 생성 (Fallback용)
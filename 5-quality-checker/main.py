@@ -11,12 +11,10 @@ from datetime import datetime, timedelta
 import base64
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 from google.cloud import firestore
 from google.cloud import storage
 import functions_framework
+import client_registry
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,20 +35,8 @@ storage_client = storage.Client()
 
 
 def get_gmail_service():
-    """Gmail API 서비스 생성"""
-    creds = Credentials(
-        token=None,
-        refresh_token=GMAIL_REFRESH_TOKEN,
-        token_uri='https://oauth2.googleapis.com/token',
-        client_id=GMAIL_CLIENT_ID,
-        client_secret=GMAIL_CLIENT_SECRET
-    )
-    
-    # 토큰 갱신
-    if creds.expired:
-        creds.refresh(Request())
-    
-    return build('gmail', 'v1', credentials=creds)
+    """Gmail API 서비스 (스레드별 캐시, 토큰은 프로세스 공유 + 만료 임박 시에만 갱신)"""
+    return client_registry.get_gmail_service()
 
 
 def create_approval_email(video_data: Dict[str, Any]) -> MIMEMultipart:
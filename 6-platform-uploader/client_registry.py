@@ -0,0 +1,119 @@
+"""
+프로세스 전역 클라이언트 레지스트리
+- 이름별 keep-alive requests.Session 재사용 (TCP/TLS 핸드셰이크 1회)
+- Google OAuth 자격 증명 캐시 + 만료 전 선제 갱신
+- YouTube API 서비스 객체는 스레드별로 재사용 (httplib2가 스레드 안전하지 않음)
+- get_session()은 서비스별 client_registry.py 사본(1/4/5/6) 모두 같은 시그니처/재시도 규칙
+  (서비스는 독립 배포되므로 파일을 복사해 두며, 나머지 함수만 서비스별로 다름)
+"""
+
+import os
+import datetime
+import logging
+import threading
+from typing import Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from google.oauth2.credentials import Credentials
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_sessions: Dict[str, requests.Session] = {}
+_clients: Dict[str, object] = {}
+_local = threading.local()
+
+# OAuth 토큰 만료 이 시간(초) 전에 미리 갱신
+TOKEN_REFRESH_MARGIN = float(os.getenv("TOKEN_REFRESH_MARGIN", 300))
+
+
+def get_session(name: str = "default", pool_size: int = 16, retries: int = 2) -> requests.Session:
+    """
+    이름별 공유 세션
+
+    Args:
+        name: 세션 이름 (대상 서비스별로 구분)
+        pool_size: 호스트당 유지할 keep-alive 커넥션 수
+        retries: 연결 오류/5xx GET 재시도 횟수
+    """
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            retry = Retry(
+                total=retries,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"GET", "HEAD"})
+            )
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[name] = session
+            logger.info(f"HTTP 세션 생성: {name} (pool={pool_size})")
+        return session
+
+
+def get_google_credentials(
+    name: str,
+    client_id: str,
+    client_secret: str,
+    refresh_token: str,
+    scopes: List[str] = None
+) -> Credentials:
+    """
+    캐시된 Google OAuth 자격 증명 (만료 TOKEN_REFRESH_MARGIN초 전이면 갱신)
+
+    Args:
+        name: 자격 증명 이름 (예: "youtube")
+    """
+    with _lock:
+        credentials = _clients.get(f"credentials:{name}")
+        if credentials is None:
+            credentials = Credentials(
+                token=None,
+                refresh_token=refresh_token,
+                token_uri="https://oauth2.googleapis.com/token",
+                client_id=client_id,
+                client_secret=client_secret,
+                scopes=scopes
+            )
+            _clients[f"credentials:{name}"] = credentials
+
+        if _needs_refresh(credentials):
+            credentials.refresh(Request(session=get_session("google-oauth", pool_size=2)))
+            logger.info(f"{name} OAuth 토큰 갱신 (만료: {credentials.expiry})")
+
+        return credentials
+
+
+def _needs_refresh(credentials: Credentials) -> bool:
+    if not credentials.token or not credentials.expiry:
+        return True
+    # google-auth의 expiry는 naive UTC
+    remaining = credentials.expiry - datetime.datetime.utcnow()
+    return remaining.total_seconds() < TOKEN_REFRESH_MARGIN
+
+
+def get_youtube_service():
+    """스레드별 YouTube Data API v3 서비스 (자격 증명은 프로세스 공유, 호출 시마다 만료 여부 확인)"""
+    credentials = get_google_credentials(
+        "youtube",
+        os.getenv("YOUTUBE_CLIENT_ID"),
+        os.getenv("YOUTUBE_CLIENT_SECRET"),
+        os.getenv("YOUTUBE_REFRESH_TOKEN"),
+        scopes=["https://www.googleapis.com/auth/youtube.upload"]
+    )
+
+    # httplib2 전송 계층은 스레드 안전하지 않으므로 서비스 객체는 스레드별로 1개
+    service = getattr(_local, "youtube", None)
+    if service is None:
+        service = build("youtube", "v3", credentials=credentials)
+        setattr(_local, "youtube", service)
+        logger.info(f"YouTube API 서비스 생성 (스레드: {threading.current_thread().name})")
+    return service
@@ -4,7 +4,7 @@ Instagram Graph API 사용
 """
 
 import os
-import requests
+from client_registry import get_session
 import time
 import logging
 
@@ -20,6 +20,9 @@ class InstagramUploader:
         self.instagram_account_id = os.getenv("INSTAGRAM_ACCOUNT_ID")
         self.api_base = "https://graph.facebook.com/v19.0"
         
+        # 프로세스 전역 keep-alive 세션
+        self.session = get_session("instagram", pool_size=4)
+        
         if not self.access_token or not self.instagram_account_id:
             raise ValueError("INSTAGRAM_ACCESS_TOKEN 또는 INSTAGRAM_ACCOUNT_ID가 설정되지 않았습니다")
     
@@ -69,7 +72,7 @@ class InstagramUploader:
             
             logger.info("Instagram 미디어 컨테이너 생성 중...")
             
-            container_response = requests.post(container_url, params=container_params, timeout=60)
+            container_response = self.session.post(container_url, params=container_params, timeout=60)
             container_response.raise_for_status()
             
             container_result = container_response.json()
@@ -87,7 +90,7 @@ class InstagramUploader:
             for attempt in range(30):  # 30회 시도 (2초 간격)
                 time.sleep(2)
                 
-                status_response = requests.get(
+                status_response = self.session.get(
                     status_url,
                     params={"fields": "status_code", "access_token": self.access_token},
                     timeout=30
@@ -117,7 +120,7 @@ class InstagramUploader:
             
             logger.info("Instagram Reels 게시 중...")
             
-            publish_response = requests.post(publish_url, params=publish_params, timeout=30)
+            publish_response = self.session.post(publish_url, params=publish_params, timeout=30)
             publish_response.raise_for_status()
             
             publish_result = publish_response.json()
@@ -8,13 +8,13 @@ Phase 6: 멀티 플랫폼 자동 업로더
 
 import os
 import json
-import requests
 import logging
 from flask import Flask, request, jsonify
 from google.cloud import firestore, storage
 from youtube_uploader import YouTubeUploader
 from tiktok_uploader import TikTokUploader
 from instagram_uploader import InstagramUploader
+from client_registry import get_session
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -48,7 +48,7 @@ def download_video_from_url(video_url: str, output_path: str) -> bool:
             
         else:
             # HTTP URL에서 다운로드
-            response = requests.get(video_url, stream=True, timeout=120)
+            response = get_session("media-download", pool_size=4).get(video_url, stream=True, timeout=120)
             response.raise_for_status()
             
             with open(output_path, 'wb') as f:
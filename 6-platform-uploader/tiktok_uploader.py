@@ -4,7 +4,7 @@ TikTok Content Posting API 사용
 """
 
 import os
-import requests
+from client_registry import get_session
 import logging
 from typing import List
 
@@ -19,6 +19,9 @@ class TikTokUploader:
         self.access_token = os.getenv("TIKTOK_ACCESS_TOKEN")
         self.api_base = "https://open.tiktokapis.com/v2"
         
+        # 프로세스 전역 keep-alive 세션
+        self.session = get_session("tiktok", pool_size=4)
+        
         if not self.access_token:
             raise ValueError("TIKTOK_ACCESS_TOKEN 환경 변수가 설정되지 않았습니다")
     
@@ -72,7 +75,7 @@ class TikTokUploader:
             
             logger.info("TikTok 업로드 초기화 중...")
             
-            init_response = requests.post(init_url, json=init_data, headers=headers, timeout=30)
+            init_response = self.session.post(init_url, json=init_data, headers=headers, timeout=30)
             init_response.raise_for_status()
             
             init_result = init_response.json()
@@ -94,7 +97,7 @@ class TikTokUploader:
                 
                 logger.info("TikTok 영상 업로드 중...")
                 
-                upload_response = requests.put(
+                upload_response = self.session.put(
                     upload_url,
                     data=video_file,
                     headers=upload_headers,
@@ -136,7 +139,7 @@ class TikTokUploader:
                 "Authorization": f"Bearer {self.access_token}"
             }
             
-            response = requests.get(status_url, headers=headers, timeout=30)
+            response = self.session.get(status_url, headers=headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
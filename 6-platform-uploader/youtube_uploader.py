@@ -5,17 +5,12 @@ YouTube Data API v3 사용
 
 import os
 import logging
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
+from client_registry import get_youtube_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
-
 
 class YouTubeUploader:
     """YouTube Shorts 자동 업로더"""
@@ -33,20 +28,8 @@ class YouTubeUploader:
         - YOUTUBE_REFRESH_TOKEN
         """
         try:
-            credentials = Credentials(
-                token=None,
-                refresh_token=os.getenv("YOUTUBE_REFRESH_TOKEN"),
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=os.getenv("YOUTUBE_CLIENT_ID"),
-                client_secret=os.getenv("YOUTUBE_CLIENT_SECRET"),
-                scopes=SCOPES
-            )
-            
-            # 토큰 갱신
-            if credentials.expired:
-                credentials.refresh(Request())
-            
-            youtube = build("youtube", "v3", credentials=credentials)
+            # 프로세스 전역 서비스/토큰 재사용 (만료 임박 시에만 갱신)
+            youtube = get_youtube_service()
             logger.info("YouTube API 인증 성공")
             
             return youtube